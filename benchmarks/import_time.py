@@ -0,0 +1,53 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+"""Measures the time a fresh interpreter takes to import cdp, alone and up to decoding a first packet.
+
+       python benchmarks/import_time.py [--runs 20] [--path /other/checkout]
+
+   Each case runs in a new process, as a short lived worker or command line tool would, and is timed
+   from within it, leaving out the start of the interpreter."""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from os.path import abspath, dirname
+
+cases = [
+    ('import cdp', "import cdp"),
+    ('decode first packet', "import cdp; from cdp.cdp import CDP; CDP(packet).data_items[0].x"),
+    ('from cdp import *', "from cdp import *"),
+]
+
+setup = ("import time; start = time.perf_counter()\n"
+         "packet = bytes.fromhex('4c4330320000000043445030303032000100000035011e00"
+         "000000000000000000000000010000000200000003000000000000000000')\n")
+report = "\nprint(time.perf_counter() - start)"
+
+
+def run(code, path, runs):
+    """Returns the median time, in seconds, of code run in runs fresh interpreters importing from path"""
+    env = dict(os.environ, PYTHONPATH=path)
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', setup + code + report], env=env, cwd=path,
+                                check=True, capture_output=True, text=True).stdout
+        times.append(float(output))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20, help="Number of processes per case")
+    parser.add_argument('--path', default=dirname(dirname(abspath(__file__))),
+                        help="Directory holding the cdp package to measure")
+    args = parser.parse_args()
+
+    for name, code in cases:
+        print("{:<22} {:8.2f} ms".format(name, run(code, args.path, args.runs) * 1000))
+
+
+if __name__ == '__main__':
+    main()
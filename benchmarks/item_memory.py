@@ -0,0 +1,89 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+"""Measures the memory, in bytes, each retained PositionV3 data item keeps alive.
+
+       python benchmarks/item_memory.py [--items 60] [--packets 200] [--path /other/checkout]
+
+   Packets of --items PositionV3 data items are decoded and one data item in each is kept, read, detached
+   from its packet or neither, along with every data item of the packet in the fourth case. An undecoded
+   data item keeps its whole packet alive, unless detached. What is still allocated once the packets
+   are dropped is counted, including the buffers kept alive by undecoded data items, and divided by the
+   number of data items kept. Each case runs in a new process importing cdp from --path, to compare
+   checkouts."""
+
+import argparse
+import os
+import subprocess
+import sys
+from os.path import abspath, dirname
+
+cases = [
+    ('undecoded', "keep = packet.data_items[0]"),
+    ('undecoded, detached', "keep = packet.data_items[0].detach()"),
+    ('decoded', "keep = packet.data_items[0]; keep.x"),
+    ('decoded, whole packets', "keep = list(packet.data_items); keep[0].x"),
+    ('constructed', "keep = PositionV3(x=1, y=2, z=3)"),
+]
+
+code = """
+import gc, struct, sys, tracemalloc
+from cdp.cdp import CDP
+from cdp.data_items import PositionV3
+
+def make_packet(sequence, items):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\\x00', 0x01020304)
+    for index in range(items):
+        data += struct.pack('<HH', PositionV3.type, 30) + struct.pack('<IqiiiHBBH', index, 0, 1, 2, 3, 4, 5, 6, 7)
+    return data
+
+CDP(make_packet(0, 1)).data_items[0].x
+# Checkouts from before CDPDataItem.detach cannot run the detached case
+if {needs_detach} and not hasattr(PositionV3, 'detach'):
+    print('n/a')
+    sys.exit()
+gc.collect()
+tracemalloc.start()
+start = tracemalloc.get_traced_memory()[0]
+datagrams = [make_packet(sequence, {items}) for sequence in range({packets})]
+kept = []
+for data in datagrams:
+    packet = CDP(data)
+    {keep}
+    if isinstance(keep, list):
+        kept.extend(keep)
+    else:
+        kept.append(keep)
+del packet, keep
+# Only the buffers of the packets whose data items are still referenced remain counted
+del datagrams, data
+gc.collect()
+print((tracemalloc.get_traced_memory()[0] - start - sys.getsizeof(kept)) / len(kept))
+"""
+
+
+def run(keep, path, items, packets):
+    """Returns the bytes per data item kept by keep, run in a fresh interpreter importing from path, or
+       None when the checkout lacks what the case uses"""
+    env = dict(os.environ, PYTHONPATH=path)
+    source = code.format(keep=keep, items=items, packets=packets, needs_detach='detach' in keep)
+    output = subprocess.run([sys.executable, '-c', source],
+                            env=env, cwd=path, check=True, capture_output=True, text=True).stdout
+    return None if output.strip() == 'n/a' else float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=60, help="Number of data items per packet")
+    parser.add_argument('--packets', type=int, default=200, help="Number of packets decoded per case")
+    parser.add_argument('--path', default=dirname(dirname(abspath(__file__))),
+                        help="Directory holding the cdp package to measure")
+    args = parser.parse_args()
+
+    for name, keep in cases:
+        size = run(keep, args.path, args.items, args.packets)
+        print("{:<24} {:>8} bytes".format(name, 'n/a' if size is None else "{:.1f}".format(size)))
+
+
+if __name__ == '__main__':
+    main()
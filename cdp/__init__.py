@@ -1,36 +1,19 @@
-from cdp import *
-from cdp.data_items import *
+# Data item modules are imported, and their classes registered, the first time one of their names or
+# types is used. The modules and names are listed in the generated cdp.type_registry, see cdp.registry.
+from cdp import type_registry as _type_registry
+from cdp.registry import lazy_getattr as _lazy_getattr
 
-from cdp.device_data_items import *
-
-# Include .so's such that Cythonized cdp-py can still be properly imported
-module_files = glob.glob(dirname(__file__)+"/*.py") + glob.glob(dirname(__file__)+"/*.so")
-for module_file in module_files:
-    if 'device_data_items' in module_file:
-        module_name = ''
-        if module_file.endswith('.py'):
-            module_name = basename(module_file)[:-3]
-        else:
-            # Cython outputs to module_name.cpython-python_version-platform.so
-            module_name = basename(module_file).split(".cpython")[0]
-
-        # Import the module
-        module = importlib.import_module(__package__+'.'+module_name)
-
-        # Emulate from X import *
-        if "__all__" in module.__dict__:
-            names = module.__dict__['__all__']
-        else:
-            names = [x for x in module.__dict__ if not x.startswith('_')]
-        globals().update({k: getattr(module, k) for k in names})
-
-        # Get all data items in current module and register their types
-        for name, obj in inspect.getmembers(module):
-            if inspect.isclass(obj) and issubclass(obj, DeviceDataItem):
-                DeviceData.register_dd_item(obj)
+__getattr__ = _lazy_getattr(__name__)
+__all__ = list(_type_registry.exports.get(__name__, ()))
 
 try:
+    # Bound explicitly, as the names of cdp are loaded lazily and bare names skip the module __getattr__
+    from cdp.data_items import ExecuteDeviceCommandV2, UWBNetworkCommandItem
     from cdp.private_network_commands import *
+    import glob
+    import importlib
+    import inspect
+    from os.path import dirname, basename
     # Include .so's such that Cythonized cdp-py can still be properly imported
     module_files = glob.glob(dirname(__file__)+"/*.py") + glob.glob(dirname(__file__)+"/*.so")
     for module_file in module_files:
@@ -56,6 +39,5 @@ try:
             for name, obj in inspect.getmembers(module):
                 if inspect.isclass(obj) and issubclass(obj, UWBNetworkCommandItem):
                     ExecuteDeviceCommandV2.register_cmd_item(obj)
-except:
+except ImportError:
     pass
-
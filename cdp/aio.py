@@ -0,0 +1,179 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import asyncio
+from collections import deque
+import socket
+import struct
+
+from cdp.cdp import CDP
+
+__all__ = ['DROP_OLDEST', 'DROP_NEWEST', 'CDPReceiver', 'open_receiver', 'open_udp_socket', 'open_send_socket']
+
+DROP_OLDEST = 'drop_oldest'  # Discard the oldest queued datagram to make room for a new one
+DROP_NEWEST = 'drop_newest'  # Discard the new datagram
+
+
+def open_udp_socket(port, group=None, interface='0.0.0.0', receive_buffer_size=None):
+    """Returns a non-blocking UDP socket bound to port. When group is set, the socket joins that
+       multicast group on the interface with the given IPv4 address."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        if receive_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size)
+        if group is None:
+            sock.bind((interface, port))
+        else:
+            sock.bind(('', port))
+            membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(interface))
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def open_send_socket(interface=None, ttl=1, loopback=True):
+    """Returns a UDP socket for sending, whose multicast datagrams leave through the interface with the
+       given IPv4 address (the default route when None), with ttl hops and looped back to this host
+       when loopback is set"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1 if loopback else 0)
+        if interface is not None:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class CDPReceiver(asyncio.DatagramProtocol):
+    """CDP Receiver: Asyncio datagram protocol that queues received CDP packets for async iteration.
+
+       Datagrams are held in a bounded queue and decoded as they are consumed, so packets dropped
+       because the consumers fall behind are never decoded. Packets that fail to decode are counted
+       and skipped. Any number of coroutines may iterate over the same receiver, each packet is
+       handed to one of them."""
+
+    def __init__(self, max_queue=1024, drop_policy=DROP_OLDEST, decode=True, zero_copy=False,
+                 include_types=None, exclude_types=None):
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError("Unknown drop policy: {}".format(drop_policy))
+        self.max_queue = max_queue  # Maximum number of datagrams waiting to be consumed
+        self.drop_policy = drop_policy  # What to discard when the queue is full
+        self.decode = decode  # Yield decoded CDP packets, otherwise (data, address) tuples
+        self.decode_kwargs = dict(zero_copy=zero_copy, include_types=include_types, exclude_types=exclude_types)  # Passed to CDP.decode
+        self.transport = None
+        self.closed = False
+        self.exception = None  # Error that closed the receiver, if any
+        self.queue = deque()
+        self.waiters = deque()  # Futures of consumers waiting for a datagram
+        self.received = 0  # Number of datagrams received
+        self.dropped = 0  # Number of datagrams discarded because the queue was full
+        self.invalid = 0  # Number of datagrams that failed to decode
+
+    @property
+    def stats(self):
+        return dict(received=self.received, dropped=self.dropped, invalid=self.invalid, queued=len(self.queue))
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received += 1
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            if self.drop_policy == DROP_NEWEST:
+                return
+            self.queue.popleft()
+        self.queue.append((data, addr))
+        self._wake_one()
+
+    def error_received(self, exc):
+        # ICMP errors on a receiving socket do not affect the datagrams already queued
+        pass
+
+    def connection_lost(self, exc):
+        self.exception = exc
+        self._close()
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        self._close()
+
+    def _close(self):
+        self.closed = True
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _wake_one(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def receive(self):
+        """Returns the next datagram as a (data, address) tuple. Raises EOFError once the receiver
+           is closed and every queued datagram has been consumed."""
+        while not self.queue:
+            if self.closed:
+                raise EOFError("CDP receiver closed") from self.exception
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass the wakeup on to another consumer when it was already taken
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_one()
+                raise
+        return self.queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            try:
+                data, addr = await self.receive()
+            except EOFError:
+                raise StopAsyncIteration from None
+            if not self.decode:
+                return data, addr
+            try:
+                return CDP(data, **self.decode_kwargs)
+            except (ValueError, struct.error):
+                self.invalid += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+async def open_receiver(port, group=None, interface='0.0.0.0', receive_buffer_size=None, sock=None, **kwargs):
+    """Returns a started CDPReceiver listening on port, joined to the multicast group on the interface
+       with the given IPv4 address when group is set. An already bound socket may be passed instead.
+       Other keyword arguments are passed to CDPReceiver.
+
+           async with await open_receiver(7667, '239.255.76.67') as receiver:
+               async for packet in receiver:
+                   ...
+    """
+    if sock is None:
+        sock = open_udp_socket(port, group, interface, receive_buffer_size)
+    loop = asyncio.get_running_loop()
+    _transport, receiver = await loop.create_datagram_endpoint(lambda: CDPReceiver(**kwargs), sock=sock)
+    return receiver
@@ -0,0 +1,146 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import select
+import socket
+import struct
+import sys
+
+from cdp.cdp import CDP
+from cdp.aio import open_udp_socket
+
+__all__ = ['BatchReader']
+
+# Linux socket option reporting the kernel drop count, None where the option number is not Linux's
+SO_RXQ_OVFL = getattr(socket, 'SO_RXQ_OVFL', 40) if sys.platform.startswith('linux') else None
+MSG_TRUNC = getattr(socket, 'MSG_TRUNC', 0)
+
+
+class BatchReader():
+    """Batch Reader: Reads datagrams in batches into a preallocated ring of receive buffers.
+
+       Each batch waits for the socket to become readable once, then drains it without blocking into
+       consecutive slots of the ring and returns memoryviews of the received data. No memory is
+       allocated per datagram. A view stays valid until the ring wraps around to its slot, that is
+       until slots more datagrams have been read.
+
+       On Linux the kernel drop count of the socket (SO_RXQ_OVFL) is tracked in kernel_drops."""
+
+    def __init__(self, sock, slots=256, slot_size=9000, receive_buffer_size=8 * 1024 * 1024, track_drops=True):
+        self.sock = sock
+        self.sock.setblocking(False)
+        if receive_buffer_size:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size)
+        self.slots = slots  # Number of receive buffers in the ring
+        self.slot_size = slot_size  # Size of each receive buffer, longer datagrams are truncated
+        self.buffer = bytearray(slots * slot_size)
+        view = memoryview(self.buffer)
+        self.views = [view[index * slot_size:(index + 1) * slot_size] for index in range(slots)]
+        self.next_slot = 0  # Slot the next datagram is read into
+        self.track_drops = False
+        if track_drops and SO_RXQ_OVFL is not None:
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                self.track_drops = True
+            except OSError:
+                pass
+        self.ancillary_size = socket.CMSG_SPACE(4) if hasattr(socket, 'CMSG_SPACE') else 0
+        self.received = 0  # Number of datagrams read
+        self.truncated = 0  # Number of datagrams longer than a slot
+        self.invalid = 0  # Number of datagrams that failed to decode in packets()
+        self.batches = 0  # Number of non-empty batches read
+        self.kernel_drops = 0  # Number of datagrams the kernel dropped because the socket buffer was full
+
+    @classmethod
+    def open(cls, port, group=None, interface='0.0.0.0', **kwargs):
+        """Returns a reader of a UDP socket bound to port, joined to the multicast group on the interface
+           with the given IPv4 address when group is set"""
+        return cls(open_udp_socket(port, group, interface), **kwargs)
+
+    @property
+    def receive_buffer_size(self):
+        """Socket receive buffer size granted by the kernel"""
+        return self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+    @property
+    def stats(self):
+        return dict(received=self.received, truncated=self.truncated, invalid=self.invalid,
+                    batches=self.batches, kernel_drops=self.kernel_drops)
+
+    def read_batch(self, max_count=None, timeout=None):
+        """Waits up to timeout seconds (forever when None) for a datagram, then returns memoryviews of
+           every datagram that can be read without blocking, at most max_count and the number of slots.
+           Returns an empty list on timeout."""
+        limit = self.slots if max_count is None else min(max_count, self.slots)
+        views = []
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if not readable:
+            return views
+
+        while len(views) < limit:
+            slot = self.views[self.next_slot]
+            try:
+                size = self._receive_into(slot)
+            except BlockingIOError:
+                break
+            views.append(slot[:size])
+            self.next_slot = (self.next_slot + 1) % self.slots
+
+        if views:
+            self.received += len(views)
+            self.batches += 1
+        return views
+
+    def _receive_into(self, slot):
+        if self.track_drops:
+            size, ancdata, flags, _address = self.sock.recvmsg_into([slot], self.ancillary_size)
+            for level, kind, data in ancdata:
+                if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL and len(data) >= 4:
+                    self.kernel_drops, = struct.unpack("=I", data[:4])
+            if flags & MSG_TRUNC:
+                self.truncated += 1
+            return size
+        # With MSG_TRUNC, Linux returns the full length of a datagram longer than the slot
+        size = self.sock.recv_into(slot, 0, MSG_TRUNC)
+        if size > self.slot_size:
+            self.truncated += 1
+            size = self.slot_size
+        return size
+
+    def read_packets(self, max_count=None, timeout=None, zero_copy=False):
+        """Reads a batch and returns the CDP packets decoded from it. Invalid datagrams are counted and
+           skipped. Each packet holds a copy of its datagram, unless zero_copy is set, in which case its
+           data items decode from the ring slot itself. Such packets must then be used before slots more
+           datagrams are read, after which their data items silently decode the bytes of later ones."""
+        packets = []
+        for view in self.read_batch(max_count, timeout):
+            try:
+                packets.append(CDP(view, zero_copy=zero_copy))
+            except (ValueError, struct.error):
+                self.invalid += 1
+        return packets
+
+    def packets(self, timeout=None, zero_copy=False):
+        """Yields CDP packets as they are received. Stops when no datagram arrives within timeout seconds,
+           not when a batch only holds invalid datagrams. zero_copy is as for read_packets()."""
+        while True:
+            views = self.read_batch(timeout=timeout)
+            if not views and timeout is not None:
+                return
+            for view in views:
+                try:
+                    packet = CDP(view, zero_copy=zero_copy)
+                except (ValueError, struct.error):
+                    self.invalid += 1
+                    continue
+                yield packet
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
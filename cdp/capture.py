@@ -0,0 +1,309 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+from array import array
+from collections import namedtuple
+import mmap
+import os
+import socket
+import struct
+import sys
+import time
+
+from cdp.cdp import CDP
+
+__all__ = ['CaptureWriter', 'CaptureReader', 'CaptureRecord', 'CaptureChunk']
+
+# File layout, all little-endian:
+#   file header   : magic, version
+#   chunk         : chunk header, index, records
+#   chunk header  : magic, record count, serial count, type count, records size, first and last timestamp
+#   index         : sorted uint32 serial numbers, sorted uint16 data item types present in the chunk
+#   record        : record header, source address, payload
+#   record header : receive timestamp, source port, payload size, source address size (0, 4 or 16)
+file_header = struct.Struct("<8sI")
+chunk_header = struct.Struct("<4sIIIIdd")
+record_header = struct.Struct("<dHHB")
+file_magic = b'CDPCAPTR'
+chunk_magic = b'CHNK'
+version = 1
+
+serial_typecode = 'I' if array('I').itemsize == 4 else 'L'
+unpack_mark_serial_from = struct.Struct("<I12xI").unpack_from  # Mark and serial number of a CDP header
+
+CaptureRecord = namedtuple('CaptureRecord', ['timestamp', 'address', 'data'])
+CaptureChunk = namedtuple('CaptureChunk', ['offset', 'count', 't_min', 't_max', 'serials', 'types',
+                                           'records_offset', 'records_end'])
+
+
+def _pack_address(address):
+    if address is None:
+        return b'', 0
+    host, port = address[:2]
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            return socket.inet_pton(family, host), port
+        except OSError:
+            pass
+    raise ValueError("Invalid source address: {}".format(host))
+
+
+def _header_serial(data, offset, size):
+    # Serial number of the CDP header of the payload at offset, None when it is not a CDP packet
+    if size < CDP.cdp_header_size:
+        return None
+    mark, serial = unpack_mark_serial_from(data, offset)
+    return serial if mark == 0x3230434C else None
+
+
+def _unpack_address(packed, port):
+    if not packed:
+        return None
+    family = socket.AF_INET if len(packed) == 4 else socket.AF_INET6
+    return (socket.inet_ntop(family, packed), port)
+
+
+class CaptureWriter():
+    """Capture Writer: Appends raw CDP datagrams to a chunked capture file.
+
+       Datagrams are buffered and written as one chunk once chunk_size bytes are pending. Each chunk
+       starts with the time range, serial numbers and data item types of its datagrams, so readers
+       can skip it without reading its records. Datagrams that are not valid CDP packets are recorded
+       but not indexed."""
+
+    def __init__(self, path, chunk_size=1024 * 1024):
+        self.chunk_size = chunk_size  # Number of record bytes buffered before a chunk is written
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, 'r+b')
+            try:
+                _check_file_header(self.file.read(file_header.size))
+                # Drop a chunk cut short by an interrupted write before appending
+                end = _complete_size(self.file)
+                self.file.truncate(end)
+                self.file.seek(end)
+            except:
+                self.file.close()
+                raise
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(file_header.pack(file_magic, version))
+        self._reset()
+
+    def _reset(self):
+        self.records = bytearray()
+        self.count = 0
+        self.serials = set()
+        self.types = set()
+        self.t_min = None
+        self.t_max = None
+
+    def write(self, data, timestamp=None, address=None):
+        """Appends a datagram received at timestamp (now by default) from an (host, port) address"""
+        if timestamp is None:
+            timestamp = time.time()
+        packed_address, port = _pack_address(address)
+        self.records += record_header.pack(timestamp, port, len(data), len(packed_address))
+        self.records += packed_address
+        self.records += data
+        self.count += 1
+        if self.t_min is None or timestamp < self.t_min:
+            self.t_min = timestamp
+        if self.t_max is None or timestamp > self.t_max:
+            self.t_max = timestamp
+        try:
+            _sequence, serial, items = CDP.peek(data)
+        except ValueError:
+            pass
+        else:
+            self.serials.add(serial)
+            self.types.update(di_type for di_type, _offset, _size in items)
+        if len(self.records) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered datagrams as a chunk"""
+        if self.count:
+            serials = array(serial_typecode, sorted(self.serials))
+            types = array('H', sorted(self.types))
+            if sys.byteorder != 'little':
+                serials.byteswap()
+                types.byteswap()
+            self.file.write(chunk_header.pack(chunk_magic, self.count, len(serials), len(types),
+                                              len(self.records), self.t_min, self.t_max))
+            self.file.write(serials.tobytes())
+            self.file.write(types.tobytes())
+            self.file.write(self.records)
+            self._reset()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _complete_size(file):
+    """Returns the size of the file up to the end of its last complete chunk"""
+    size = file.seek(0, os.SEEK_END)
+    offset = file_header.size
+    while True:
+        file.seek(offset)
+        header = file.read(chunk_header.size)
+        if len(header) < chunk_header.size:
+            break
+        magic, _count, serial_count, type_count, records_size, _t_min, _t_max = chunk_header.unpack(header)
+        end = offset + chunk_header.size + 4 * serial_count + 2 * type_count + records_size
+        if magic != chunk_magic or end > size:
+            break
+        offset = end
+    return offset
+
+
+def _check_file_header(data):
+    if len(data) < file_header.size:
+        raise ValueError("Incomplete capture file header")
+    magic, file_version = file_header.unpack_from(data)
+    if magic != file_magic:
+        raise ValueError("Not a CDP capture file")
+    if file_version != version:
+        raise ValueError("Unsupported capture file version: {}".format(file_version))
+
+
+class CaptureReader():
+    """Capture Reader: Memory maps a capture file and reads its datagrams, skipping whole chunks by time
+       range, serial number and data item type through the chunk index.
+
+       Payloads are memoryviews of the mapped file and stay valid until the reader is closed. A chunk
+       cut short by an interrupted write ends the capture."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = None
+        self.view = None
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.map)
+            _check_file_header(self.map[:file_header.size])
+            self.chunks = self._read_chunks()  # CaptureChunk of every complete chunk, in file order
+        except:
+            self.close()
+            raise
+
+    def _read_chunks(self):
+        chunks = []
+        offset = file_header.size
+        size = len(self.map)
+        while offset + chunk_header.size <= size:
+            magic, count, serial_count, type_count, records_size, t_min, t_max = chunk_header.unpack_from(self.map, offset)
+            if magic != chunk_magic:
+                raise ValueError("Corrupt capture file: bad chunk header at offset {}".format(offset))
+            index_offset = offset + chunk_header.size
+            records_offset = index_offset + 4 * serial_count + 2 * type_count
+            records_end = records_offset + records_size
+            if records_end > size:
+                break
+            serials = array(serial_typecode)
+            serials.frombytes(self.view[index_offset:index_offset + 4 * serial_count])
+            types = array('H')
+            types.frombytes(self.view[index_offset + 4 * serial_count:records_offset])
+            if sys.byteorder != 'little':
+                serials.byteswap()
+                types.byteswap()
+            chunks.append(CaptureChunk(offset, count, t_min, t_max, frozenset(serials), frozenset(types),
+                                       records_offset, records_end))
+            offset = records_end
+        return chunks
+
+    def __len__(self):
+        return sum(chunk.count for chunk in self.chunks)
+
+    def time_range(self):
+        """Returns the (first, last) receive timestamps in the capture, None when it is empty"""
+        if not self.chunks:
+            return None
+        return (min(chunk.t_min for chunk in self.chunks), max(chunk.t_max for chunk in self.chunks))
+
+    def serials(self):
+        """Returns the serial numbers, as integers, of every packet in the capture"""
+        return frozenset().union(*(chunk.serials for chunk in self.chunks))
+
+    def types(self):
+        """Returns the data item types present in the capture"""
+        return frozenset().union(*(chunk.types for chunk in self.chunks))
+
+    def select_chunks(self, start=None, end=None, serials=None, types=None):
+        """Returns the chunks that may hold datagrams received between start and end, inclusive, from
+           any of the serial numbers and holding any of the data item types"""
+        if serials is not None:
+            serials = {int(serial) for serial in serials}
+        if types is not None:
+            types = set(types)
+        return [chunk for chunk in self.chunks
+                if (start is None or chunk.t_max >= start)
+                and (end is None or chunk.t_min <= end)
+                and (serials is None or not serials.isdisjoint(chunk.serials))
+                and (types is None or not types.isdisjoint(chunk.types))]
+
+    def records(self, start=None, end=None, serials=None, types=None):
+        """Yields the CaptureRecord of every datagram received between start and end, inclusive, from
+           any of the serial numbers and holding any of the data item types, in file order"""
+        if serials is not None:
+            serials = {int(serial) for serial in serials}
+        if types is not None:
+            types = set(types)
+        view = self.view
+        for chunk in self.select_chunks(start, end, serials, types):
+            offset = chunk.records_offset
+            while offset < chunk.records_end:
+                timestamp, port, size, address_size = record_header.unpack_from(view, offset)
+                offset += record_header.size
+                data_offset = offset + address_size
+                offset = data_offset + size
+                if offset > chunk.records_end:
+                    # Record sizes that run past the chunk are corrupt, the rest of the chunk is skipped
+                    break
+                if start is not None and timestamp < start or end is not None and timestamp > end:
+                    continue
+                if serials is not None and _header_serial(view, data_offset, size) not in serials:
+                    continue
+                data = view[data_offset:offset]
+                if types is not None:
+                    try:
+                        if types.isdisjoint(di_type for di_type, _offset, _size in CDP.peek(data)[2]):
+                            continue
+                    except ValueError:
+                        continue
+                yield CaptureRecord(timestamp, _unpack_address(view[data_offset - address_size:data_offset], port), data)
+
+    def packets(self, start=None, end=None, serials=None, types=None):
+        """Yields (timestamp, address, CDP) tuples of the selected datagrams, decoded without copying.
+           When types is set, only data items of those types are decoded. Invalid datagrams are skipped."""
+        for timestamp, address, data in self.records(start, end, serials, types):
+            try:
+                packet = CDP(data, zero_copy=True, include_types=types)
+            except ValueError:
+                continue
+            yield timestamp, address, packet
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+        try:
+            if self.map is not None:
+                self.map.close()
+        except BufferError:
+            # Payloads still referenced keep the mapping alive until they are released
+            pass
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -2,39 +2,182 @@
 # Licensed under: creativecommons.org/licenses/by/4.0
 # pylint: disable=trailing-whitespace, too-few-public-methods
 
-from collections import defaultdict, deque
+from array import array
+from collections import defaultdict, deque, namedtuple
+from operator import attrgetter
 import struct
-from cdp.ciholas_serial_number import CiholasSerialNumber
+import sys
+from cdp.ciholas_serial_number import CiholasSerialNumber, CiholasSerialNumberArray
+from cdp import registry as _registry, type_registry as _type_registry
 from math import log10
 
 unpack_cdp_header  = struct.Struct("<II8sI").unpack
 unpack_data_header = struct.Struct('<HH').unpack
+unpack_cdp_header_from  = struct.Struct("<II8sI").unpack_from
+unpack_data_header_from = struct.Struct('<HH').unpack_from
+pack_cdp_header_into  = struct.Struct("<II8sI").pack_into
+pack_data_header_into = struct.Struct('<HH').pack_into
+
+uint32_typecode = CiholasSerialNumberArray.typecode  # Array type code of an unsigned 32-bit integer
+swap_bytes = sys.byteorder != 'little'  # Arrays hold native byte order integers, CDP is little-endian
+
+def unpack_uint_array(typecode, data):
+    """Returns an array of the little-endian unsigned integers in data"""
+    values = array(typecode)
+    if len(data) % values.itemsize:
+        raise struct.error("unpack requires a buffer of {} bytes".format(values.itemsize))
+    values.frombytes(data)
+    if swap_bytes:
+        values.byteswap()
+    return values
+
+def pack_uint_array_into(typecode, buffer, offset, values):
+    """Writes unsigned integers little-endian into buffer at offset and returns the offset past them"""
+    if swap_bytes or not isinstance(values, array) or values.typecode != typecode:
+        values = array(typecode, values)
+        if swap_bytes:
+            values.byteswap()
+    end = offset + len(values) * values.itemsize
+    buffer[offset:end] = memoryview(values).cast('B')
+    return end
+
+UNKNOWN_KEEP = 'keep'  # Decode data items of an unregistered type to an opaque unknown data item
+UNKNOWN_DROP = 'drop'  # Skip data items of an unregistered type
+UNKNOWN_RAISE = 'raise'  # Raise UnknownDataItemError on data items of an unregistered type
+
+class UnknownDataItemError(ValueError):
+    """Raised on a data item of an unregistered type when the unknown type policy is UNKNOWN_RAISE"""
+
+class UnknownTypes():
+    """Unknown Types: Counts the data items of unregistered types seen while decoding and decides what
+       happens to them, by policy. At most max_types distinct types are counted, the data items of other
+       types only add to overflow, so that unexpected traffic cannot grow memory without bound."""
+
+    def __init__(self, policy=UNKNOWN_KEEP, max_types=256, type_format='0x{:04X}'):
+        self.policy = policy  # UNKNOWN_KEEP, UNKNOWN_DROP or UNKNOWN_RAISE
+        self.max_types = max_types  # Largest number of distinct types counted
+        self.type_format = type_format  # Format of a type in error messages
+        self.counts = {}  # Type to the number of its data items seen
+        self.overflow = 0  # Number of data items of types seen after max_types types were counted
+
+    def seen(self, di_type):
+        """Counts a data item of an unregistered type. Returns whether it is kept, or raises
+           UnknownDataItemError when the policy is UNKNOWN_RAISE."""
+        counts = self.counts
+        if di_type in counts:
+            counts[di_type] += 1
+        elif len(counts) < self.max_types:
+            counts[di_type] = 1
+        else:
+            self.overflow += 1
+        if self.policy == UNKNOWN_KEEP:
+            return True
+        if self.policy == UNKNOWN_RAISE:
+            raise UnknownDataItemError("Unknown data item type: " + self.type_format.format(di_type))
+        return False
+
+    def total(self):
+        """Returns the number of data items of unregistered types seen"""
+        return sum(self.counts.values()) + self.overflow
+
+    def most_common(self, count=None):
+        """Returns the (type, number of data items) of the count most frequent unknown types, most
+           frequent first, or of every counted type when count is None"""
+        ranked = sorted(self.counts.items(), key=lambda entry: entry[1], reverse=True)
+        return ranked if count is None else ranked[:count]
+
+    def reset(self):
+        self.counts.clear()
+        self.overflow = 0
+
+DECODE_OK = 0
+DECODE_BAD_SIZE = 1  # Shorter than a CDP header
+DECODE_BAD_MARK = 2  # Unrecognized mark in the CDP header
+DECODE_BAD_STRING = 3  # Unrecognized string in the CDP header
+DECODE_TRUNCATED_ITEM = 4  # A data item is larger than the rest of the packet
+DECODE_TRAILING_BYTES = 5  # Bytes too few for a data item header are left at the end of the packet
+DECODE_UNKNOWN_TYPE = 6  # A data item of an unregistered type, when the unknown type policy is UNKNOWN_RAISE
+
+# Decode error kinds counted in DecodeErrors, by DECODE_ status first
+decode_error_kinds = {DECODE_BAD_SIZE: 'bad_size', DECODE_BAD_MARK: 'bad_mark', DECODE_BAD_STRING: 'bad_string',
+                      DECODE_TRUNCATED_ITEM: 'truncated_item', DECODE_TRAILING_BYTES: 'trailing_bytes',
+                      DECODE_UNKNOWN_TYPE: 'unknown_type'}
+
+class DecodeErrors():
+    """Decode Errors: Counts the malformed packets and data items met while decoding, by kind. Besides
+       the DECODE_ statuses of whole packets, the lazy attribute decoders count truncated device data
+       and unknown interface rx stats types. They print these errors too while verbose is set."""
+
+    kinds = tuple(decode_error_kinds.values()) + ('truncated_device_data', 'unknown_rx_stats')
+
+    def __init__(self, verbose=True):
+        self.verbose = verbose  # Print the errors met while decoding
+        self.counts = dict.fromkeys(self.kinds, 0)  # Kind to the number of errors
+
+    def error(self, status):
+        """Counts a packet decode error and returns its status"""
+        self.counts[decode_error_kinds[status]] += 1
+        return status
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def reset(self):
+        self.counts = dict.fromkeys(self.kinds, 0)
+
+class PacketContext():
+    """Packet Context: Sequence and serial number of the CDP header a data item came in, shared by every
+       data item of the packet instead of copied into each. Replaced rather than modified once shared."""
+
+    __slots__ = ('sequence', 'serial_number', 'verbose')
+
+    def __init__(self, sequence=0, serial_number=None, verbose=True):
+        self.sequence = sequence  # 4B - unsigned integer sequence number
+        self.serial_number = CiholasSerialNumber() if serial_number is None else serial_number
+        self.verbose = verbose  # Whether the lazy decoders of the data items may print their errors
+
+
+def _decode_quietly(item):
+    # Decodes a data item of a packet from CDP.try_decode without the lazy decoders printing errors
+    errors = CDP.decode_errors
+    verbose = errors.verbose
+    errors.verbose = False
+    try:
+        item._decode()
+    finally:
+        errors.verbose = verbose
+
 
 class CDP():
     """CDP : Ciholas Data Protocol Python Class Definition"""
 
-    data_item_classes = {}
+    data_item_classes = _registry.TypeRegistry(_type_registry.data_item_types)  # Loads the module of a data item type on first use
+    unknown_types = UnknownTypes()  # Counters and policy of the data items of unregistered types
+    decode_errors = DecodeErrors()  # Counters of the malformed packets and data items met while decoding
     cdp_header_size = 20
     di_header_size = 4
 
-    def __init__(self, data=None, serial_number=0):
+    def __init__(self, data=None, serial_number=0, zero_copy=False, include_types=None, exclude_types=None):
         self.sequence = 0  # 4B - unsigned integer sequence number
         self.serial_number = CiholasSerialNumber(serial_number)
         self.data_items = deque([])
         self.data_items_by_type = defaultdict(list)
+        self.packet_context = None  # Context shared by the data items added, made on the first one
+        self.verbose = True  # Whether the lazy decoders of the data items may print errors, not for try_decode
 
         if data is not None:
-            self.decode(data)
+            self.decode(data, zero_copy, include_types, exclude_types)
 
-    def decode(self, data):
+    @classmethod
+    def _unpack_header(cls, data):
+        """Validates the CDP header of a packet and returns its sequence and serial number"""
 
         # Check if the packet is at least large enough to hold a CDP header
-        data_length = len(data)
-        if data_length < self.cdp_header_size:
+        if len(data) < cls.cdp_header_size:
             raise ValueError("Packet Size Error")
 
         # Get CDP header
-        _mark, self.sequence, _string, serial = unpack_cdp_header( data[:self.cdp_header_size])
+        _mark, sequence, _string, serial = unpack_cdp_header_from(data)
 
         if _mark != 0x3230434c:
             raise ValueError("CDP Header - Unrecognized Mark: 0x{:04x}".format(_mark))
@@ -42,51 +185,229 @@ class CDP():
         if _string != b'CDP0002\x00' and _string != b'LCM_SELF' :
             raise ValueError(f"CDP Header - Unrecognized String: {_string}")
 
-        self.serial_number = CiholasSerialNumber(serial)
-        current_idx = self.cdp_header_size
+        return sequence, serial
 
+    def decode(self, data, zero_copy=False, include_types=None, exclude_types=None):
+        """Decodes a CDP packet. Data items keep a reference to the packet and their offset into it
+           instead of a copy of their data, so an undecoded data item keeps the whole packet alive until
+           it is decoded or detached, see CDPDataItem.detach. Packets that are not bytes objects are
+           copied once, unless zero_copy is set, in which case the caller must not modify the buffer
+           until every data item has been decoded.
+
+           If include_types is given, only data items of those types are created. Data items of a type
+           in exclude_types are never created. Skipped data items are only looked at by their header.
+
+           Raises ValueError on malformed packets, see try_decode for a decode that does not."""
+
+        if not zero_copy and not isinstance(data, bytes):
+            data = bytes(data)
+
+        status, offset = self._decode(data, include_types, exclude_types)
+        if status == DECODE_OK:
+            return
+        if status == DECODE_BAD_SIZE:
+            raise ValueError("Packet Size Error")
+        if status == DECODE_BAD_MARK:
+            raise ValueError("CDP Header - Unrecognized Mark: 0x{:04x}".format(unpack_cdp_header_from(data)[0]))
+        if status == DECODE_BAD_STRING:
+            raise ValueError(f"CDP Header - Unrecognized String: {unpack_cdp_header_from(data)[2]}")
+        if status == DECODE_TRUNCATED_ITEM:
+            if CDP.decode_errors.verbose:
+                di_type, di_size = unpack_data_header_from(data, offset - self.di_header_size)
+                print("Type: 0x{:04X}, Expected data size: {}, Actual data size: {}".format(di_type, di_size, len(data)))
+            # A truncated data item with nothing after its header ends the packet
+            if len(data) == offset:
+                return
+        raise ValueError("Incomplete CDP Packet")
+
+    @classmethod
+    def try_decode(cls, data, zero_copy=False, include_types=None, exclude_types=None):
+        """Decodes a CDP packet like decode, without raising or printing on malformed packets.
+           Returns (status, packet), where status is one of the DECODE_ codes and packet holds the data
+           items decoded before the error, or is None when the CDP header is invalid. Every error is
+           counted in CDP.decode_errors.
 
+           Data items are decoded lazily, when an attribute is first read. The lazy decoders count their
+           errors too, and never print them for the data items of these packets."""
+
+        if not zero_copy and not isinstance(data, bytes):
+            data = bytes(data)
+
+        packet = cls()
+        packet.verbose = False
+        try:
+            status, _offset = packet._decode(data, include_types, exclude_types)
+        except UnknownDataItemError:
+            # Only raised when the unknown type policy asks for it
+            status = DECODE_UNKNOWN_TYPE
+            CDP.decode_errors.counts[decode_error_kinds[status]] += 1
+        if status in (DECODE_BAD_SIZE, DECODE_BAD_MARK, DECODE_BAD_STRING):
+            return status, None
+        return status, packet
+
+    def _decode(self, data, include_types, exclude_types):
+        # Decodes the packet into this one. Returns the DECODE_ status and the offset decoding stopped
+        # at, past the header of a truncated data item.
+        data_length = len(data)
+
+        # Check if the packet is at least large enough to hold a CDP header
+        if data_length < self.cdp_header_size:
+            return CDP.decode_errors.error(DECODE_BAD_SIZE), 0
+
+        mark, sequence, string, serial = unpack_cdp_header_from(data)
+        if mark != 0x3230434c:
+            return CDP.decode_errors.error(DECODE_BAD_MARK), 0
+        if string != b'CDP0002\x00' and string != b'LCM_SELF':
+            return CDP.decode_errors.error(DECODE_BAD_STRING), 0
+
+        self.sequence = sequence
+        self.serial_number = CiholasSerialNumber(serial)
+        current_idx = self.cdp_header_size
 
         while data_length - current_idx >= self.di_header_size:
             # Get data item header
-            di_type, di_size = unpack_data_header( data[current_idx:(current_idx+self.di_header_size)] )
+            di_type, di_size = unpack_data_header_from(data, current_idx)
             current_idx += self.di_header_size
 
             # Check if size of the remaining data matches the size specified in the data item header
             if data_length - current_idx < di_size:
-                print("Type: 0x{:04X}, Expected data size: {}, Actual data size: {}".format(di_type, di_size, len(data)))
-                break
+                return CDP.decode_errors.error(DECODE_TRUNCATED_ITEM), current_idx
+
+            # Skip filtered out data items by their header alone
+            if (include_types is not None and di_type not in include_types) or \
+               (exclude_types is not None and di_type in exclude_types):
+                current_idx += di_size
+                continue
 
             try:
                 di_class = CDP.data_item_classes[di_type]
             except KeyError:
-                # Unregistered unrecognized type
-                class_name = 'Unknown0x{:04X}'.format(di_type)
+                # Unregistered unrecognized type, counted and kept as an opaque data item by default
+                if CDP.unknown_types.seen(di_type):
+                    data_item = UnknownDataItem(data, di_offset=current_idx, di_size=di_size, di_type=di_type)
+                    self.add_data_item(data_item)
+                current_idx += di_size
+                continue
+
+            data_item = di_class(data, di_offset=current_idx, di_size=di_size)
+            self.add_data_item(data_item)
+            current_idx += di_size
 
-                # Dynamically create a CDP data item class for this unknown type
-                di_class = type(class_name, (CDPDataItem,), dict(type=di_type))
+        # Check if there is no more data available to read
+        if data_length - current_idx > 0 :
+            return CDP.decode_errors.error(DECODE_TRAILING_BYTES), current_idx
+        return DECODE_OK, current_idx
 
-                # Register new CDP data item class
-                CDP.data_item_classes[di_type] = di_class
+    @classmethod
+    def peek(cls, data):
+        """Reads only the headers of a CDP packet without creating any data items.
+           Returns (sequence, serial_number, [(type, offset, size), ...]) where serial_number is the
+           integer serial number and offset is the position of each data item's data in the packet."""
 
-            data_item = di_class(data[current_idx:(current_idx+di_size)])
-            self.add_data_item(data_item)
+        sequence, serial = cls._unpack_header(data)
+        data_length = len(data)
+        current_idx = cls.cdp_header_size
+        items = []
+
+        while data_length - current_idx >= cls.di_header_size:
+            di_type, di_size = unpack_data_header_from(data, current_idx)
+            current_idx += cls.di_header_size
+            if data_length - current_idx < di_size:
+                break
+            items.append((di_type, current_idx, di_size))
             current_idx += di_size
 
         # Check if there is no more data available to read
         if data_length - current_idx > 0 :
             raise ValueError("Incomplete CDP Packet")
 
+        return sequence, serial, items
+
+    @classmethod
+    def decode_many(cls, datagrams, types=None, fields=None, skip_invalid=False):
+        """Decodes many CDP packets into columns without creating a data item per item.
+           Returns {type: {attribute name: [values, ...]}} holding the same values the data items
+           would have, in packet order.
+
+           types limits the result to the given data item types or classes. Otherwise every
+           registered type found in the packets is included.
+           fields selects the attributes to collect, either as a list used for every type or as a
+           dictionary keyed by type or class. Besides the data attributes, 'cdp_header_serial' and
+           'cdp_header_sequence' can be selected. By default every data attribute is collected.
+           Invalid packets raise ValueError unless skip_invalid is set."""
+
+        def requested_fields(di_class):
+            if isinstance(fields, dict):
+                if di_class in fields:
+                    return fields[di_class]
+                return fields.get(di_class.type)
+            return fields
+
+        projections = {}
+        if types is not None:
+            for di_type in types:
+                di_class = cls.data_item_classes[getattr(di_type, 'type', di_type)]
+                projections[di_class.type] = ColumnProjection(di_class, requested_fields(di_class))
+
+        for data in datagrams:
+            try:
+                sequence, serial, items = cls.peek(data)
+            except ValueError:
+                if skip_invalid:
+                    continue
+                raise
+
+            serial_number = None
+            for di_type, offset, size in items:
+                try:
+                    projection = projections[di_type]
+                except KeyError:
+                    if types is not None or di_type not in cls.data_item_classes:
+                        continue
+                    di_class = cls.data_item_classes[di_type]
+                    projection = projections[di_type] = ColumnProjection(di_class, requested_fields(di_class))
+                if serial_number is None:
+                    serial_number = CiholasSerialNumber(serial)
+                projection.project(data, offset, size, sequence, serial_number)
+
+        return {di_type: projection.columns for di_type, projection in projections.items()}
+
+    def encoded_size(self):
+        """Returns the size in bytes of the encoded packet"""
+        size = self.cdp_header_size
+        for item in self.data_items:
+            size += item._encoded_size()
+        return size
+
     def encode(self):
-        data = struct.pack("<II8sI", 0x3230434C, self.sequence,
-                           b'CDP0002', self.serial_number.as_int)
+        buffer = bytearray(self.encoded_size())
+        self._encode_into(buffer, 0)
+        return bytes(buffer)
+
+    def encode_into(self, buffer, offset=0):
+        """Encodes the packet into a writable buffer, such as a reused bytearray, starting at offset.
+           Returns the number of bytes written."""
+        size = self.encoded_size()
+        if len(buffer) - offset < size:
+            raise ValueError("Buffer too small for CDP Packet: {} bytes needed at offset {}, {} available".format(
+                size, offset, len(buffer) - offset))
+        return self._encode_into(buffer, offset) - offset
+
+    def _encode_into(self, buffer, offset):
+        pack_cdp_header_into(buffer, offset, 0x3230434C, self.sequence,
+                             b'CDP0002', self.serial_number.as_int)
+        offset += self.cdp_header_size
         for item in self.data_items:
-            data += item._encode()
-        return data
+            offset = item._encode_into(buffer, offset)
+        return offset
 
     def add_data_item(self, data_item):
-        data_item.cdp_header_sequence = self.sequence
-        data_item.cdp_header_serial = self.serial_number
+        # Data items share one context until the sequence or serial number of the packet changes
+        context = self.packet_context
+        if context is None or context.sequence != self.sequence or context.serial_number is not self.serial_number \
+           or context.verbose != self.verbose:
+            context = self.packet_context = PacketContext(self.sequence, self.serial_number, self.verbose)
+        data_item.packet_context = context
         self.data_items.append(data_item)
         self.data_items_by_type[data_item.type].append(data_item)
 
@@ -96,6 +417,7 @@ class CDP():
 
     @classmethod
     def register_data_item(cls, di_class):
+        di_class.compiled_definition = CompiledDefinition(di_class.definition)
         cls.data_item_classes[di_class.type] = di_class
 
     @classmethod
@@ -115,17 +437,45 @@ class DataItemAttribute():
         self.size = size  # Size in bytes of the data attribute
         self.default = default
         self.is_list = False
+        self.struct = struct.Struct("<" + format)  # Precompiled struct used for packing/unpacking the data attribute
+        self.convert = None  # Callable that converts the unpacked value(s) to the attribute value, if any
+        self.unconvert = None  # Callable that converts the attribute value back to a tuple of value(s) to pack, if any
 
     def _decode(self, data):
         if len(data) < self.size:
             return (self.default, self.size)
         else:
-            value, = struct.unpack("<" + self.format, data[:self.size])
+            value, = self.struct.unpack_from(data)
             return (value, self.size)
 
 
     def _encode(self, value):
-        return struct.pack("<" + self.format, value)
+        return self.struct.pack(value)
+
+    def _encoded_size(self, value):
+        return self.size
+
+    def _encode_into(self, buffer, offset, value):
+        self.struct.pack_into(buffer, offset, value)
+        return offset + self.size
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Attributes that only override _encode are written through it
+        if '_encode' in cls.__dict__ and '_encode_into' not in cls.__dict__:
+            cls._encoded_size = _encoded_size_from_encode
+            cls._encode_into = _encode_into_from_encode
+
+
+def _encoded_size_from_encode(self, value):
+    return len(self._encode(value))
+
+
+def _encode_into_from_encode(self, buffer, offset, value):
+    data = self._encode(value)
+    end = offset + len(data)
+    buffer[offset:end] = data
+    return end
 
 
 class DIUInt8Attr(DataItemAttribute):
@@ -225,21 +575,30 @@ class DIFixedLengthStrAttr(DataItemAttribute):
 
     def __init__(self, name, size):
         super().__init__(name, 's', size, '')
+        self.struct = struct.Struct("<" + str(size) + self.format)  # Prepend count to 's'
+        self.convert = nullstrip
+        self.unconvert = self._unconvert
+
+    @staticmethod
+    def _unconvert(value):
+        return (value.encode(),)
 
     def _decode(self, data):
         # Convert bytes object to str
         if len(data) < self.size:
             return (self.default, self.size)
         else:
-            fmt = str(self.size) + self.format  # Prepend count to 's'
-            value, = struct.unpack("<" + fmt, data[:self.size])
+            value, = self.struct.unpack_from(data)
             value = nullstrip(value)
             return (value, self.size)  
 
     def _encode(self, value):
         value = value.encode()  # Convert str to bytes object
-        fmt = str(self.size) + self.format  # Prepend count to 's'
-        return struct.pack("<" + fmt, value)
+        return self.struct.pack(value)
+
+    def _encode_into(self, buffer, offset, value):
+        self.struct.pack_into(buffer, offset, *self._unconvert(value))
+        return offset + self.size
 
 
 class DIVariableLengthStrAttr(DataItemAttribute):
@@ -250,9 +609,7 @@ class DIVariableLengthStrAttr(DataItemAttribute):
 
     def _decode(self, data):
         size = len(data)
-        fmt = str(size) + self.format  # Prepend count to 's'
-        value, = struct.unpack("<" + fmt, data[:size])
-        value = nullstrip(value)  # Convert bytes object to str
+        value = nullstrip(bytes(data))  # Convert bytes object to str
         return (value, size)
 
     def _encode(self, value):
@@ -260,23 +617,35 @@ class DIVariableLengthStrAttr(DataItemAttribute):
         fmt = str(len(value)) + self.format  # Prepend count to 's'
         return struct.pack("<" + fmt, value)
 
+    def _encoded_size(self, value):
+        return len(value.encode())
+
+    def _encode_into(self, buffer, offset, value):
+        value = value.encode()  # Convert str to bytes object
+        end = offset + len(value)
+        buffer[offset:end] = value
+        return end
+
 class DIFixedLengthBytesAttr(DataItemAttribute):
     """Data Item Attribute: CDP Data Item Fixed Length Bytes Attribute Class Definition"""
 
     def __init__(self, name, size):
         super().__init__(name, 's', size, b'')
+        self.struct = struct.Struct("<" + str(size) + self.format)  # Prepend count to 's'
 
     def _decode(self, data):
         if len(data) < self.size:
             return (self.default, self.size)
         else:
-            fmt = str(self.size) + self.format  # Prepend count to 's'
-            value, = struct.unpack("<" + fmt, data[:self.size])
+            value, = self.struct.unpack_from(data)
             return (value, self.size)
 
     def _encode(self, value):
-        fmt = str(self.size) + self.format  # Prepend count to 's'
-        return struct.pack("<" + fmt, value)
+        return self.struct.pack(value)
+
+    def _encode_into(self, buffer, offset, value):
+        self.struct.pack_into(buffer, offset, value)
+        return offset + self.size
 
 
 class DIVariableLengthBytesAttr(DataItemAttribute):
@@ -287,30 +656,46 @@ class DIVariableLengthBytesAttr(DataItemAttribute):
 
     def _decode(self, data):
         size = len(data)
-        fmt = str(size) + self.format  # Prepend count to 's'
-        value, = struct.unpack("<" + fmt, data[:size])
-        return (value, size)
+        return (bytes(data), size)
 
     def _encode(self, value):
         fmt = str(len(value)) + self.format  # Prepend count to 's'
         return struct.pack("<" + fmt, value)
 
+    def _encoded_size(self, value):
+        return len(value)
+
+    def _encode_into(self, buffer, offset, value):
+        end = offset + len(value)
+        buffer[offset:end] = value
+        return end
+
 
 class DISerialNumberAttr(DataItemAttribute):
     """Data Item Attribute: CDP Data Item Serial Number Attribute Class Definition"""
 
     def __init__(self, name):
         super().__init__(name, 'I', 4, CiholasSerialNumber())
+        self.convert = CiholasSerialNumber
+        self.unconvert = self._unconvert
+
+    @staticmethod
+    def _unconvert(serial_number):
+        return (serial_number.as_int,)
 
     def _decode(self, data):
         if len(data) < self.size:
             return (self.default, self.size)
         else:
-            serial_number, = struct.unpack("<" + self.format, data[:self.size])
+            serial_number, = self.struct.unpack_from(data)
             return (CiholasSerialNumber(serial_number), self.size)
 
     def _encode(self, serial_number):
-        return struct.pack("<" + self.format, serial_number.as_int)
+        return self.struct.pack(serial_number.as_int)
+
+    def _encode_into(self, buffer, offset, serial_number):
+        self.struct.pack_into(buffer, offset, *self._unconvert(serial_number))
+        return offset + self.size
 
 
 class UWBSignalStrength():
@@ -374,28 +759,46 @@ class DISignalStrengthAttr(DataItemAttribute):
 
     def __init__(self, name):
         super().__init__(name, 'HHHHHH', 12, UWBSignalStrength())
+        self.convert = self._convert
+        self.unconvert = self._unconvert
+
+    @staticmethod
+    def _convert(*values):
+        uwb_ss = UWBSignalStrength()
+        uwb_ss.fp_ampl1, \
+            uwb_ss.fp_ampl2, \
+            uwb_ss.fp_ampl3, \
+            uwb_ss.rx_preamble_acc, \
+            uwb_ss.cir_power, \
+            uwb_ss.std_noise = values
+        return uwb_ss
+
+    @staticmethod
+    def _unconvert(uwb_ss):
+        return (uwb_ss.fp_ampl1,
+                uwb_ss.fp_ampl2,
+                uwb_ss.fp_ampl3,
+                uwb_ss.rx_preamble_acc,
+                uwb_ss.cir_power,
+                uwb_ss.std_noise)
 
     def _decode(self, data):
         if len(data) < self.size:
             return (self.default, self.size)
         else:
-            uwb_ss = UWBSignalStrength()
-            uwb_ss.fp_ampl1, \
-                uwb_ss.fp_ampl2, \
-                uwb_ss.fp_ampl3, \
-                uwb_ss.rx_preamble_acc, \
-                uwb_ss.cir_power, \
-                uwb_ss.std_noise = struct.unpack("<" + self.format, data[:self.size])
-            return (uwb_ss, self.size)
+            return (self._convert(*self.struct.unpack_from(data)), self.size)
 
     def _encode(self, uwb_ss):
-        return struct.pack("<" + self.format,
-                           uwb_ss.fp_ampl1,
-                           uwb_ss.fp_ampl2,
-                           uwb_ss.fp_ampl3,
-                           uwb_ss.rx_preamble_acc,
-                           uwb_ss.cir_power,
-                           uwb_ss.std_noise)
+        return self.struct.pack(uwb_ss.fp_ampl1,
+                                uwb_ss.fp_ampl2,
+                                uwb_ss.fp_ampl3,
+                                uwb_ss.rx_preamble_acc,
+                                uwb_ss.cir_power,
+                                uwb_ss.std_noise)
+
+    def _encode_into(self, buffer, offset, uwb_ss):
+        self.struct.pack_into(buffer, offset, *self._unconvert(uwb_ss))
+        return offset + self.size
 
 
 class UWBCondensedSignalStrength():
@@ -415,32 +818,118 @@ class DICondensedSignalStrengthAttr(DataItemAttribute):
 
     def __init__(self, name):
         super().__init__(name, "bb", 2, UWBCondensedSignalStrength())
+        self.convert = self._convert
+        self.unconvert = self._unconvert
+
+    @staticmethod
+    def _convert(*values):
+        uwb_css = UWBCondensedSignalStrength()
+        uwb_css.fp_rssi, \
+            uwb_css.tp_rssi = values
+        return uwb_css
+
+    @staticmethod
+    def _unconvert(uwb_css):
+        return (uwb_css.fp_rssi, uwb_css.tp_rssi)
 
     def _decode(self, data):
         if len(data) < self.size:
             return (self.default, self.size)
         else:
-            uwb_css = UWBCondensedSignalStrength()
-            uwb_css.fp_rssi, \
-                uwb_css.tp_rssi = struct.unpack("<" + self.format, data[:self.size])
-            return (uwb_css, self.size)
+            return (self._convert(*self.struct.unpack_from(data)), self.size)
 
     def _encode(self, uwb_css):
-        return struct.pack("<" + self.format, uwb_css.fp_rssi, uwb_css.tp_rssi)
+        return self.struct.pack(uwb_css.fp_rssi, uwb_css.tp_rssi)
+
+    def _encode_into(self, buffer, offset, uwb_css):
+        self.struct.pack_into(buffer, offset, *self._unconvert(uwb_css))
+        return offset + self.size
 
 
 class DIListAttr():
     """Data Item Attribute: CDP Data Item List Attribute Class Definition"""
 
-    def __init__(self, name, class_name):
+    # Attribute values a helper structure may share between decoded elements
+    immutable_types = (int, float, bool, str, bytes, tuple, type(None))
+
+    def __init__(self, name, class_name, as_tuples=False):
         self.name = name  # String corresponding to the data attibute name
         self.class_name = class_name  # Name of the helper structure
         self.default = []
         self.is_list = True
+        self.as_tuples = as_tuples  # Decode fixed size elements to named tuples instead of helper structures
+        self.compiled = None  # Compiled helper structure definition, set on first use when it is fixed size
+        self.compiled_from = None  # Helper structure definition the compiled definition was built from
+        self.prototype = None  # Instance attributes copied into each element built without calling __init__
+        self.tuple_class = None  # Named tuple class of the elements when decoding to tuples
+
+    def _compile(self):
+        """Returns the compiled definition of a fixed size helper structure, None otherwise"""
+        definition = self.class_name.definition
+        if self.compiled_from is not definition:
+            compiled = CompiledDefinition(definition)
+            self.compiled = compiled if compiled.names and not compiled.remaining else None
+            self.compiled_from = definition
+            self.prototype = None
+            self.tuple_class = None
+        return self.compiled
+
+    def _element_prototype(self):
+        """Returns the instance attributes of a default helper structure when each element can start
+           from a copy of them, None when elements have to be built through __init__"""
+        if self.prototype is None:
+            prototype = getattr(self.class_name(), '__dict__', None)
+            if prototype is None or any(not isinstance(value, self.immutable_types)
+                                        for key, value in prototype.items() if key not in self.compiled.slices):
+                prototype = False
+            self.prototype = prototype
+        return self.prototype
 
     def _decode(self, data):
-        lst = []
         data_size = len(data)
+        compiled = self._compile()
+        if compiled is None:
+            return self._decode_elements(data, []), data_size
+
+        count = data_size // compiled.size
+        fixed_size = count * compiled.size
+        names = compiled.names
+        conversions = compiled.conversions
+        rows = compiled.struct.iter_unpack(data[:fixed_size])
+        if conversions:
+            rows = map(list, rows)
+
+        if self.as_tuples:
+            if self.tuple_class is None:
+                self.tuple_class = namedtuple(self.class_name.__name__, names)
+            make = self.tuple_class._make
+            lst = []
+            for values in rows:
+                for start, stop, convert in conversions:
+                    values[start:stop] = (convert(*values[start:stop]),)
+                lst.append(make(values))
+        else:
+            prototype = self._element_prototype()
+            cls = self.class_name
+            new = cls.__new__
+            lst = []
+            for values in rows:
+                for start, stop, convert in conversions:
+                    values[start:stop] = (convert(*values[start:stop]),)
+                if prototype:
+                    di_subdata = new(cls)
+                    di_subdata.__dict__ = prototype.copy()
+                else:
+                    di_subdata = cls()
+                di_subdata.__dict__.update(zip(names, values))
+                lst.append(di_subdata)
+
+        # A trailing partial element is decoded with defaults for the attributes that do not fit
+        if fixed_size < data_size:
+            self._decode_elements(data[fixed_size:], lst)
+        return lst, data_size
+
+    def _decode_elements(self, data, lst):
         while data:
             di_subdata = self.class_name()
             for attr in self.class_name.definition:
@@ -448,15 +937,46 @@ class DIListAttr():
                 data = data[size:]
                 setattr(di_subdata, attr.name, value)
             lst.append(di_subdata)
-        return lst, data_size
+        return lst
 
     def _encode(self, lst):
-        data = b''
+        # Call the base implementations directly, a subclass may override only _encode and call this one
+        buffer = bytearray(DIListAttr._encoded_size(self, lst))
+        DIListAttr._encode_into(self, buffer, 0, lst)
+        return bytes(buffer)
+
+    def _encoded_size(self, lst):
+        compiled = self._compile()
+        if compiled is not None and compiled.packable:
+            return len(lst) * compiled.size
+        size = 0
+        definition = self.class_name.definition
         for di_subdata in lst:
-            for attr in self.class_name.definition:
-                value = getattr(di_subdata, attr.name)
-                data += attr._encode(value)
-        return data
+            for attr in definition:
+                size += attr._encoded_size(getattr(di_subdata, attr.name))
+        return size
+
+    def _encode_into(self, buffer, offset, lst):
+        compiled = self._compile()
+        if compiled is not None and compiled.packable:
+            pack_into = compiled.pack_into
+            size = compiled.size
+            for di_subdata in lst:
+                pack_into(buffer, offset, di_subdata)
+                offset += size
+            return offset
+        definition = self.class_name.definition
+        for di_subdata in lst:
+            for attr in definition:
+                offset = attr._encode_into(buffer, offset, getattr(di_subdata, attr.name))
+        return offset
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # List attributes that only override _encode are written through it
+        if '_encode' in cls.__dict__ and '_encode_into' not in cls.__dict__:
+            cls._encoded_size = _encoded_size_from_encode
+            cls._encode_into = _encode_into_from_encode
 
 class DISerialNumberListAttr(DIListAttr):
     """Data Item Attribute: CDP Data Item Serial Number Attribute Class Definition"""
@@ -465,19 +985,21 @@ class DISerialNumberListAttr(DIListAttr):
         super().__init__(name, CiholasSerialNumber)
 
     def _decode(self, data):
-        lst = []
-        data_size = len(data)
-        while data:
-            serial_number, = struct.unpack("<I", data[:4])
-            data = data[4:]
-            lst.append(CiholasSerialNumber(serial_number))
-        return lst, data_size
+        # Decoded to a compact array backed sequence of serial numbers
+        return CiholasSerialNumberArray(values=unpack_uint_array(uint32_typecode, data)), len(data)
 
     def _encode(self, lst):
-        data = b''
-        for serial_number in lst:
-            data += struct.pack("<I", serial_number.as_int)
-        return data
+        buffer = bytearray(DISerialNumberListAttr._encoded_size(self, lst))
+        DISerialNumberListAttr._encode_into(self, buffer, 0, lst)
+        return bytes(buffer)
+
+    def _encoded_size(self, lst):
+        return 4 * len(lst)
+
+    def _encode_into(self, buffer, offset, lst):
+        if isinstance(lst, CiholasSerialNumberArray):
+            return pack_uint_array_into(uint32_typecode, buffer, offset, lst.values)
+        return pack_uint_array_into(uint32_typecode, buffer, offset, [serial_number.as_int for serial_number in lst])
 
 class DIUInt16ListAttr(DIListAttr):
     """Data Item Attribute: CDP Data Item Unsigned 16-bit Integer List Attribute Class Definition"""
@@ -486,19 +1008,19 @@ class DIUInt16ListAttr(DIListAttr):
         super().__init__(name, None)
 
     def _decode(self, data):
-        lst = []
-        data_size = len(data)
-        while data:
-            uint16, = struct.unpack("<H", data[:2])
-            data = data[2:]
-            lst.append(uint16)
-        return lst, data_size
+        # Decoded to a compact array instead of a list of ints
+        return unpack_uint_array('H', data), len(data)
 
     def _encode(self, lst):
-        data = b''
-        for uint16 in lst:
-            data += struct.pack("<H", uint16)
-        return data
+        buffer = bytearray(DIUInt16ListAttr._encoded_size(self, lst))
+        DIUInt16ListAttr._encode_into(self, buffer, 0, lst)
+        return bytes(buffer)
+
+    def _encoded_size(self, lst):
+        return 2 * len(lst)
+
+    def _encode_into(self, buffer, offset, lst):
+        return pack_uint_array_into('H', buffer, offset, lst)
 
 class DIUInt32ListAttr(DIListAttr):
     """Data Item Attribute: CDP Data Item Unsigned 32-bit Integer List Attribute Class Definition"""
@@ -507,19 +1029,19 @@ class DIUInt32ListAttr(DIListAttr):
         super().__init__(name, None)
 
     def _decode(self, data):
-        lst = []
-        data_size = len(data)
-        while data:
-            uint32, = struct.unpack("<I", data[:4])
-            data = data[4:]
-            lst.append(uint32)
-        return lst, data_size
+        # Decoded to a compact array instead of a list of ints
+        return unpack_uint_array(uint32_typecode, data), len(data)
 
     def _encode(self, lst):
-        data = b''
-        for uint32 in lst:
-            data += struct.pack("<I", uint32)
-        return data
+        buffer = bytearray(DIUInt32ListAttr._encoded_size(self, lst))
+        DIUInt32ListAttr._encode_into(self, buffer, 0, lst)
+        return bytes(buffer)
+
+    def _encoded_size(self, lst):
+        return 4 * len(lst)
+
+    def _encode_into(self, buffer, offset, lst):
+        return pack_uint_array_into(uint32_typecode, buffer, offset, lst)
 
 class InterfaceRxStatsV1():
     """Interface Reception Stats V1 Class Definition"""
@@ -589,7 +1111,9 @@ class DIRxStatsAttribute(DIListAttr):
                 rx_stats.append(ifc_stats)
                 data = data[ifc_stats_size:]
         except KeyError:
-            print("Rx Stats Attribute - Unrecognized Interface Rx Stats type: 0x{:02x}".format(stats_type))
+            CDP.decode_errors.counts['unknown_rx_stats'] += 1
+            if CDP.decode_errors.verbose:
+                print("Rx Stats Attribute - Unrecognized Interface Rx Stats type: 0x{:02x}".format(stats_type))
 
         data_size = header_size + stats_len
         return rx_stats, data_size
@@ -614,56 +1138,302 @@ class DIRxStatsAttribute(DIListAttr):
             data += ifc_stats.encode()
         return data
 
+    def _encoded_size(self, lst):
+        header_size = 4
+        return header_size + sum(ifc_stats.size for ifc_stats in lst)
+
+    def _encode_into(self, buffer, offset, lst):
+        header_size = 4
+        if lst:
+            struct.pack_into("<BBH", buffer, offset, lst[0].type, len(lst), len(lst) * lst[0].size)
+        else:
+            struct.pack_into("<BBH", buffer, offset, 0, 0, 0)
+        offset += header_size
+
+        # Encode each Interface Rx Stats
+        for ifc_stats in lst:
+            data = ifc_stats.encode()
+            end = offset + len(data)
+            buffer[offset:end] = data
+            offset = end
+        return offset
+
+
+class CompiledDefinition():
+    """Compiled Definition: Single precompiled struct for the leading fixed size attributes of a definition"""
+
+    def __init__(self, definition):
+        self.definition = definition  # Definition this instance was compiled from
+        self.names = []  # Names of the attributes covered by the compiled struct
+        self.conversions = []  # (start, stop, convert) slices of the unpacked values that need converting
+        self.slices = {}  # Attribute name to its (start, stop, convert) slice of the unpacked values
+        self.unconversions = []  # (index, unconvert) of the attribute values that need converting back before packing
+        self.packable = True  # Whether every covered attribute can be packed through the compiled struct
+        fmt = "<"
+        index = 0
+        for attr in definition:
+            # Stop at the first list or variable length attribute
+            if attr.is_list or attr.size < 0:
+                break
+            count = len(attr.struct.unpack(bytes(attr.size)))  # Number of values unpacked for the attribute
+            if attr.convert is not None:
+                self.conversions.append((index, index + count, attr.convert))
+            self.slices[attr.name] = (index, index + count, attr.convert)
+            if attr.unconvert is not None:
+                self.unconversions.append((len(self.names), attr.unconvert))
+            elif attr.convert is not None:
+                self.packable = False
+            fmt += attr.struct.format[1:]
+            index += count
+            self.names.append(attr.name)
+        # Convert from the back so earlier slice indexes stay valid
+        self.conversions.reverse()
+        self.unconversions.reverse()
+        self.remaining = definition[len(self.names):]  # Attributes decoded one at a time
+        self.struct = struct.Struct(fmt)
+        self.size = self.struct.size
+        if not self.names:
+            self.packable = False
+        elif len(self.names) == 1:
+            name = self.names[0]
+            self.getter = lambda item: (getattr(item, name),)
+        else:
+            self.getter = attrgetter(*self.names)  # Reads the covered attribute values of a data item
+
+    def unpack_from(self, data, offset=0):
+        """Unpacks the leading fixed size attributes and returns their values in definition order"""
+        values = self.struct.unpack_from(data, offset)
+        if self.conversions:
+            values = list(values)
+            for start, stop, convert in self.conversions:
+                values[start:stop] = (convert(*values[start:stop]),)
+        return values
+
+    def pack_into(self, buffer, offset, item):
+        """Packs the leading fixed size attributes of a data item into buffer at offset"""
+        values = self.getter(item)
+        if self.unconversions:
+            values = list(values)
+            for index, unconvert in self.unconversions:
+                values[index:index + 1] = unconvert(values[index])
+        self.struct.pack_into(buffer, offset, *values)
+
+
+class ColumnProjection():
+    """Column Projection: Collects selected attributes of one data item class into per attribute lists"""
+
+    header_names = ('cdp_header_serial', 'cdp_header_sequence')
+
+    def __init__(self, di_class, names=None):
+        attr_names = [attr.name for attr in di_class.definition]
+        if names is None:
+            names = attr_names
+        compiled = di_class.compiled_definition
+        if compiled is not None and compiled.definition is not di_class.definition:
+            compiled = None
+
+        self.di_class = di_class
+        self.compiled = compiled
+        self.columns = {name: [] for name in names}  # Attribute name to the list of its values
+        self.header_columns = []  # (append, name) for the CDP header fields
+        self.fixed_columns = []  # (append, start, stop, convert) for attributes in the compiled struct
+        self.other_columns = []  # (append, name) for attributes that need the data item to be decoded
+        self.item_columns = []  # (append, name) for every data attribute, used for short data items
+
+        for name in names:
+            append = self.columns[name].append
+            if name in self.header_names:
+                self.header_columns.append((append, name))
+                continue
+            if name not in attr_names:
+                raise ValueError("{} has no attribute {}".format(di_class.__name__, name))
+            if compiled is not None and name in compiled.slices:
+                start, stop, convert = compiled.slices[name]
+                self.fixed_columns.append((append, start, stop, convert))
+            else:
+                self.other_columns.append((append, name))
+            self.item_columns.append((append, name))
+
+    def project(self, data, offset, size, sequence, serial_number):
+        """Appends the selected attributes of the data item found at offset in the packet"""
+        for append, name in self.header_columns:
+            append(serial_number if name == 'cdp_header_serial' else sequence)
+
+        compiled = self.compiled
+        if compiled is not None and size >= compiled.size:
+            values = compiled.struct.unpack_from(data, offset)
+            for append, start, stop, convert in self.fixed_columns:
+                if convert is None:
+                    append(values[start])
+                else:
+                    append(convert(*values[start:stop]))
+            item_columns = self.other_columns
+        else:
+            item_columns = self.item_columns
+
+        # Fall back to decoding a data item for the attributes outside the compiled struct
+        if item_columns:
+            data_item = self.di_class(data, di_offset=offset, di_size=size)
+            for append, name in item_columns:
+                append(getattr(data_item, name))
+
 
 class CDPDataItem():
     """CDP Data Item: Ciholas Data Protocol Data Item Class Definition"""
 
     type = 0xFFFF
     definition = [DIVariableLengthBytesAttr('data')]
+    compiled_definition = None  # Set when the class is registered
+    packet_context = PacketContext()  # Header of the packet the data item came in, set when added to a packet
+    di_name = 'CDPDataItem'  # String version of the data item name, the class name of every subclass
 
-    def __init__(self, di_data=None, **kwargs):
-        self.cdp_header_sequence = 0
-        self.cdp_header_serial = CiholasSerialNumber()
-        self.di_size = 0 if di_data is None else len(di_data)  # Size of the data in the CDP Data Item
-        self.di_data = di_data
-        self.di_name = self.__class__.__name__  # String version of the data item name
+    def __init__(self, di_data=None, di_offset=0, di_size=None, **kwargs):
+        if di_size is None:
+            di_size = 0 if di_data is None else len(di_data) - di_offset
+        self.di_size = di_size  # Size of the data in the CDP Data Item
+        self.di_buffer = di_data  # Buffer holding the undecoded data, None once decoded
+        self.di_offset = di_offset  # Offset of the data in the buffer
 
         # If present, set Data Item attributes from keyword arguments
-        self.__dict__.update(kwargs)
+        if kwargs:
+            for name in ('cdp_header_sequence', 'cdp_header_serial'):
+                if name in kwargs:
+                    setattr(self, name, kwargs.pop(name))
+            self.__dict__.update(kwargs)
+
+    @property
+    def cdp_header_sequence(self):
+        """Sequence number of the CDP packet the data item came in"""
+        return self.packet_context.sequence
+
+    @cdp_header_sequence.setter
+    def cdp_header_sequence(self, sequence):
+        context = self.packet_context
+        self.packet_context = PacketContext(sequence, context.serial_number, context.verbose)
+
+    @property
+    def cdp_header_serial(self):
+        """Serial number of the CDP packet the data item came in"""
+        return self.packet_context.serial_number
+
+    @cdp_header_serial.setter
+    def cdp_header_serial(self, serial_number):
+        context = self.packet_context
+        self.packet_context = PacketContext(context.sequence, serial_number, context.verbose)
+
+    @property
+    def di_data(self):
+        """Undecoded data of the CDP Data Item, None once decoded"""
+        if self.di_buffer is None:
+            return None
+        return bytes(self.di_buffer[self.di_offset:(self.di_offset+self.di_size)])
+
+    @di_data.setter
+    def di_data(self, di_data):
+        self.di_buffer = di_data
+        self.di_offset = 0
+        if di_data is not None:
+            self.di_size = len(di_data)
+
+    def detach(self):
+        """Copies the undecoded data of the data item out of the packet it was decoded from, so that
+           keeping the data item no longer keeps the whole packet alive. This costs a copy of the data
+           item's own data, against decoding the data item, which releases the packet as well but builds
+           every attribute. Returns the data item."""
+        buffer = self.di_buffer
+        if buffer is not None and (self.di_offset or len(buffer) != self.di_size or not isinstance(buffer, bytes)):
+            self.di_data = self.di_data
+        return self
 
     def __getattr__(self, key):
-        if self.di_data is not None:
-            self._decode()
-        else:
-            for attr in self.definition:
-                # Check if data attribute has not been defined yet before initializing
-                # it to its default value
-                if not attr.name in dir(self):
-                    if attr.is_list:
-                        setattr(self, attr.name, list(attr.default))
-                    else:
-                        setattr(self, attr.name, attr.default)
-
-        if key in dir(self):
-            return getattr(self, key)
+        # Only called when normal attribute lookup fails, so the key is never a class attribute.
+        # Special names are looked up by copy/pickle on partially built instances and are never data attributes.
+        instance_dict = self.__dict__
+        if key[:2] != '__':
+            if instance_dict.get('di_buffer') is not None:
+                if self.packet_context.verbose:
+                    self._decode()
+                else:
+                    _decode_quietly(self)
+            else:
+                for attr in self.definition:
+                    # Check if data attribute has not been defined yet before initializing
+                    # it to its default value
+                    if not attr.name in instance_dict:
+                        if attr.is_list:
+                            setattr(self, attr.name, list(attr.default))
+                        else:
+                            setattr(self, attr.name, attr.default)
+
+            if key in instance_dict:
+                return instance_dict[key]
 
         # Raise appropriately formatted attribute error
         return object.__getattribute__(self, key)
 
     def _decode(self):
-        for attr in self.definition:
-            value, size = attr._decode(self.di_data)
-            self.di_data = self.di_data[size:]
-            setattr(self, attr.name, value)
-        self.di_data = None
+        buffer = self.di_buffer
+        offset = self.di_offset
+        end = offset + self.di_size
+        definition = self.definition
+        compiled = self.compiled_definition
+        # Decode the fixed size leading attributes in one go when the class was compiled for this definition
+        if compiled is not None and compiled.definition is definition and end - offset >= compiled.size:
+            self.__dict__.update(zip(compiled.names, compiled.unpack_from(buffer, offset)))
+            offset += compiled.size
+            definition = compiled.remaining
+        if definition:
+            # Attributes get zero-copy views of the remaining data
+            view = memoryview(buffer)
+            for attr in definition:
+                value, size = attr._decode(view[offset:end])
+                offset += size
+                setattr(self, attr.name, value)
+        self.di_buffer = None
 
     def _encode(self):
-        data = b''
-        for attr in self.definition:
-            value = getattr(self, attr.name)
-            data += attr._encode(value)
-        self.di_size = len(data)
-        return struct.pack("<HH", self.type, self.di_size) + data
+        # Call the base implementations directly, a subclass may override only _encode and call this one
+        buffer = bytearray(CDPDataItem._encoded_size(self))
+        CDPDataItem._encode_into(self, buffer, 0)
+        return bytes(buffer)
+
+    def _encoded_size(self):
+        """Returns the size in bytes of the encoded data item, header included"""
+        size = CDP.di_header_size
+        definition = self.definition
+        compiled = self.compiled_definition
+        if compiled is not None and compiled.definition is definition and compiled.packable:
+            size += compiled.size
+            definition = compiled.remaining
+        for attr in definition:
+            size += attr._encoded_size(getattr(self, attr.name))
+        return size
+
+    def _encode_into(self, buffer, offset):
+        """Encodes the data item, header included, into buffer at offset and returns the offset past it"""
+        start = offset + CDP.di_header_size
+        end = start
+        definition = self.definition
+        compiled = self.compiled_definition
+        # Pack the fixed size leading attributes in one go when the class was compiled for this definition
+        if compiled is not None and compiled.definition is definition and compiled.packable:
+            compiled.pack_into(buffer, end, self)
+            end += compiled.size
+            definition = compiled.remaining
+        for attr in definition:
+            end = attr._encode_into(buffer, end, getattr(self, attr.name))
+        self.di_size = end - start
+        pack_data_header_into(buffer, offset, self.type, self.di_size)
+        return end
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'di_name' not in cls.__dict__:
+            cls.di_name = cls.__name__
+        # Data items that only override _encode are written through it
+        if '_encode' in cls.__dict__ and '_encode_into' not in cls.__dict__:
+            cls._encoded_size = _item_encoded_size_from_encode
+            cls._encode_into = _item_encode_into_from_encode
 
     def __str__(self):
         # Generic printable representation of a CDP data item.
@@ -679,3 +1449,31 @@ class CDPDataItem():
 
             string += ", {}".format(value)
         return string
+
+
+class UnknownDataItem(CDPDataItem):
+    """Unknown Data Item: Opaque data item of an unregistered type, shared by every such type.
+       The type is set on each instance, and the data is left undecoded until read."""
+
+    def __init__(self, di_data=None, di_offset=0, di_size=None, di_type=0xFFFF, **kwargs):
+        super().__init__(di_data, di_offset, di_size, **kwargs)
+        self.type = di_type
+        self.di_name = 'Unknown0x{:04X}'.format(di_type)
+
+    @property
+    def payload(self):
+        """Data of the data item, as a view of the packet while it is undecoded"""
+        if self.di_buffer is None:
+            return self.data
+        return memoryview(self.di_buffer)[self.di_offset:self.di_offset + self.di_size]
+
+
+def _item_encoded_size_from_encode(self):
+    return len(self._encode())
+
+
+def _item_encode_into_from_encode(self, buffer, offset):
+    data = self._encode()
+    end = offset + len(data)
+    buffer[offset:end] = data
+    return end
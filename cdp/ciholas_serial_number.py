@@ -2,6 +2,9 @@
 # Licensed under: creativecommons.org/licenses/by/4.0
 # pylint: disable=trailing-whitespace, too-few-public-methods
 
+from array import array
+from collections.abc import MutableSequence, Sequence
+
 class CiholasSerialNumber:
     """Ciholas Serial Number Class Definition"""
 
@@ -64,4 +67,46 @@ class CiholasSerialNumber:
         return hash(self.as_int)
 
     def __repr__(self):
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+class CiholasSerialNumberArray(MutableSequence):
+    """Ciholas Serial Number Array Class Definition. Compact sequence of serial numbers stored as 32-bit integers."""
+
+    __slots__ = ('values',)
+
+    typecode = 'I' if array('I').itemsize == 4 else 'L'  # Array type code of an unsigned 32-bit integer
+
+    def __init__(self, serial_numbers=(), values=None):
+        if values is None:
+            values = array(self.typecode, (CiholasSerialNumber(value).as_int for value in serial_numbers))
+        self.values = values  # Array of the serial numbers as integers
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CiholasSerialNumberArray(values=self.values[index])
+        return CiholasSerialNumber(self.values[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.values[index] = array(self.typecode, (CiholasSerialNumber(serial_number).as_int for serial_number in value))
+        else:
+            self.values[index] = CiholasSerialNumber(value).as_int
+
+    def __delitem__(self, index):
+        del self.values[index]
+
+    def __len__(self):
+        return len(self.values)
+
+    def insert(self, index, value):
+        self.values.insert(index, CiholasSerialNumber(value).as_int)
+
+    def __eq__(self, other):
+        if isinstance(other, CiholasSerialNumberArray):
+            return self.values == other.values
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
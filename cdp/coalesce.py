@@ -0,0 +1,169 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import struct
+import time
+
+from cdp.aio import open_send_socket
+from cdp.cdp import CDP, pack_cdp_header_into
+
+__all__ = ['Coalescer']
+
+cdp_header_size = CDP.cdp_header_size
+di_header_size = CDP.di_header_size
+
+
+class _Pending():
+    # Data items buffered for one serial number, after room for the CDP header
+    __slots__ = ('buffer', 'items', 'deadline')
+
+    def __init__(self, deadline):
+        self.buffer = bytearray(cdp_header_size)
+        self.items = 0  # Number of data items in the buffer
+        self.deadline = deadline  # Time the buffer must be sent by
+
+
+class Coalescer():
+    """Coalescer: Packs the data items of small CDP packets into packets of up to mtu bytes, one stream
+       per serial number, and sends them to a UDP or multicast target or to a callback.
+
+       Data items are copied verbatim, in the order they arrive. A packet is sent when the next data item
+       would not fit, or once the oldest of its data items has waited max_latency seconds; poll() or run()
+       enforce that deadline. Each serial number gets consecutive sequence numbers starting from
+       sequence_start. A data item too large to share a packet is sent alone."""
+
+    def __init__(self, target=None, callback=None, mtu=1472, max_latency=0.01, sequence_start=0,
+                 sock=None, interface=None, ttl=1, loopback=True):
+        if (target is None) == (callback is None):
+            raise ValueError("Exactly one of target or callback is required")
+        if mtu < cdp_header_size + di_header_size:
+            raise ValueError("MTU too small to hold a CDP packet: {}".format(mtu))
+        self.target = target  # (host, port) the packets are sent to
+        self.callback = callback  # Callable the packets are passed to instead, as bytes
+        self.mtu = mtu  # Largest size of a coalesced packet, UDP payload of a 1500 byte Ethernet MTU by default
+        self.max_latency = max_latency  # Longest time a data item is buffered, in seconds
+        self.sequence_start = sequence_start
+        self.sequences = {}  # Next sequence number of each serial number
+        self.pending = {}  # Serial number to its _Pending, in deadline order
+        self.sock = sock
+        self.owns_socket = target is not None and sock is None  # Whether close() closes the socket
+        if self.owns_socket:
+            self.sock = open_send_socket(interface, ttl, loopback)
+        self.running = False
+        self.packets_in = 0  # Number of packets received
+        self.items_in = 0  # Number of data items received
+        self.invalid = 0  # Number of datagrams that are not valid CDP packets
+        self.packets_out = 0  # Number of coalesced packets sent
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.deadline_flushes = 0  # Number of packets sent because their deadline passed
+        self.send_errors = 0  # Number of packets the socket refused to send
+
+    @property
+    def stats(self):
+        return dict(packets_in=self.packets_in, items_in=self.items_in, invalid=self.invalid,
+                    packets_out=self.packets_out, bytes_in=self.bytes_in, bytes_out=self.bytes_out,
+                    deadline_flushes=self.deadline_flushes, send_errors=self.send_errors,
+                    packing_ratio=self.packets_in / self.packets_out if self.packets_out else None,
+                    items_per_packet=self.items_in / self.packets_out if self.packets_out else None)
+
+    def add(self, data, now=None):
+        """Buffers the data items of a CDP packet, sending the packets that fill up. now is the
+           time.monotonic() time the packet was received, now by default."""
+        try:
+            _sequence, serial, items = CDP.peek(data)
+        except (ValueError, struct.error):
+            self.invalid += 1
+            return
+        if now is None:
+            now = time.monotonic()
+        self.packets_in += 1
+        self.items_in += len(items)
+        self.bytes_in += len(data)
+        if not items:
+            return
+
+        pending = self.pending.get(serial)
+        if pending is None:
+            pending = self.pending[serial] = _Pending(now + self.max_latency)
+        view = memoryview(data)
+        for _di_type, offset, size in items:
+            if len(pending.buffer) + di_header_size + size > self.mtu and pending.items:
+                self._flush(serial)
+                pending = self.pending[serial] = _Pending(now + self.max_latency)
+            pending.buffer += view[offset - di_header_size:offset + size]
+            pending.items += 1
+
+    def poll(self, now=None):
+        """Sends the packets whose deadline has passed. Returns the time.monotonic() time of the next
+           deadline, None when nothing is buffered."""
+        if now is None:
+            now = time.monotonic()
+        # Buffers are created in deadline order and removed when sent, so the oldest comes first
+        for serial, pending in list(self.pending.items()):
+            if pending.deadline > now:
+                return pending.deadline
+            self._flush(serial)
+            self.deadline_flushes += 1
+        return None
+
+    def flush(self):
+        """Sends every buffered data item"""
+        for serial in list(self.pending):
+            self._flush(serial)
+
+    def _flush(self, serial):
+        pending = self.pending.pop(serial)
+        sequence = self.sequences.get(serial, self.sequence_start)
+        self.sequences[serial] = (sequence + 1) & 0xFFFFFFFF
+        pack_cdp_header_into(pending.buffer, 0, 0x3230434C, sequence, b'CDP0002\x00', serial)
+        self._send(pending.buffer)
+
+    def _send(self, packet):
+        if self.callback is not None:
+            self.callback(bytes(packet))
+        else:
+            try:
+                self.sock.sendto(packet, self.target)
+            except OSError:
+                self.send_errors += 1
+                return
+        self.packets_out += 1
+        self.bytes_out += len(packet)
+
+    def run(self, reader, timeout=None):
+        """Coalesces the datagrams of a cdp.batch_reader.BatchReader until stopped, or until none arrives
+           within timeout seconds when set, then sends what is left"""
+        self.running = True
+        idle_since = time.monotonic()
+        while self.running:
+            deadline = self.poll()
+            now = time.monotonic()
+            wait = timeout if deadline is None else deadline - now
+            if timeout is not None:
+                wait = min(wait, idle_since + timeout - now)
+            batch = reader.read_batch(timeout=max(wait, 0) if wait is not None else None)
+            if batch:
+                idle_since = now = time.monotonic()
+                for data in batch:
+                    self.add(data, now)
+            elif timeout is not None and time.monotonic() - idle_since >= timeout:
+                break
+        self.flush()
+        self.running = False
+
+    def stop(self):
+        """Stops a coalescer running in another thread after its current batch"""
+        self.running = False
+
+    def close(self):
+        self.flush()
+        if self.owns_socket:
+            self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
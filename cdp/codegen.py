@@ -0,0 +1,926 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+"""Generates straight line _decode, _encoded_size, _encode_into and _encode methods for data item
+   classes from their definitions, replacing the loop over attribute objects of the base classes.
+
+   Fixed size attributes are unpacked by a single struct as the compiled definition does, then every
+   other attribute, including variable length strings, lists of fixed size helper structures and
+   reception stats, is decoded inline. Attribute types without a specialized form call their own
+   _decode and _encode_into, so the generated methods give the same results as the base ones for any
+   definition, and fall back to them when the definition of the class changes.
+
+   The generated source is written to a cache directory, keyed by a hash of what it is generated from,
+   and imported from there by later processes. The directory is $CDP_CODEGEN_CACHE when set, else
+   codegen in the per user cache directory of cdp-py, or in the temporary directory when there is no
+   home directory. It is only used when no other user can write to it, see cache_directory():
+
+       python -m cdp.codegen          generates the methods of every registered data item class
+       python -m cdp.codegen --check  also checks they match the base methods on random data items
+"""
+
+import contextlib
+import hashlib
+import importlib.util
+import io
+import keyword
+import os
+import random
+import struct
+import sys
+import tempfile
+from os.path import expanduser, join
+
+from cdp.cdp import CDP, CDPDataItem, CiholasSerialNumber, DataItemAttribute, DIFixedLengthStrAttr, \
+    DIFixedLengthBytesAttr, DIVariableLengthStrAttr, DIVariableLengthBytesAttr, DISerialNumberAttr, \
+    DISignalStrengthAttr, DICondensedSignalStrengthAttr, DIListAttr, DIRxStatsAttribute, InterfaceRxStatsV1, \
+    nullstrip
+from cdp.device_data_items import DeviceDataItem
+
+__all__ = ['install', 'uninstall', 'use_generated_codecs', 'generate_source', 'check_equivalence',
+           'cache_directory']
+
+version = 1  # Changes the cache key of every class, bump when the generated source changes
+
+cache_dir = None  # Directory of the generated sources, when set instead of the one from the environment
+default_directory = object()  # Stands for the cache directory, resolved when the methods are built
+
+
+def cache_directory():
+    """Returns the directory the generated sources are cached in: cache_dir when set, else
+       $CDP_CODEGEN_CACHE, else codegen in the per user cache directory of cdp-py"""
+    if cache_dir is not None:
+        return cache_dir
+    # Outside the package, which is often installed read only or shared between environments
+    directory = os.environ.get('CDP_CODEGEN_CACHE')
+    if directory:
+        return directory
+    base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    if not base:
+        home = expanduser('~')
+        if home == '~':
+            user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+            return join(tempfile.gettempdir(), 'cdp-py-codegen-{}'.format(user))
+        base = join(home, '.cache')
+    return join(base, 'cdp-py', 'codegen')
+
+
+def _private_directory(directory):
+    # Creates the directory, private to the user, and returns whether only the user can write to it, as
+    # the sources in it are imported. A directory someone else made first, in a shared temporary
+    # directory for one, is not used.
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not hasattr(os, 'getuid'):
+        return True
+    status = os.stat(directory)
+    return status.st_uid == os.getuid() and not status.st_mode & 0o022
+
+installed = {}  # Class to the cache key of the methods installed on it and the methods it defined before
+loaded = {}  # Cache key to the bind function of its loaded source
+
+# Attributes set by the signal strength attribute conversions, in the order they set them
+signal_strength_fields = ('fp_ampl1', 'fp_ampl2', 'fp_ampl3', 'rx_preamble_acc', 'cir_power', 'std_noise')
+condensed_signal_strength_fields = ('fp_rssi', 'tp_rssi')
+
+# Fields of the item kinds: base class, names of the buffer, offset and size attributes, and header size
+flavors = {
+    'cdp': (CDPDataItem, 'di_buffer', 'di_offset', 'di_size', CDP.di_header_size),
+    'device': (DeviceDataItem, 'ddi_buffer', 'ddi_offset', 'ddi_size', 3),
+}
+
+
+def _inherits(attr, owner, *names):
+    # Whether the class of attr uses the methods of owner for every name
+    return all(getattr(type(attr), name, None) is getattr(owner, name) for name in names)
+
+
+def _value_count(attr):
+    return len(attr.struct.unpack(bytes(attr.struct.size)))
+
+
+def _conversion(convert):
+    # Kind of the conversion applied to the unpacked values of a fixed size attribute
+    if convert is None:
+        return None
+    if convert is nullstrip:
+        return 'nullstrip'
+    if convert is CiholasSerialNumber:
+        return 'serial'
+    if convert is DISignalStrengthAttr._convert:
+        return ('fields', 'UWBSignalStrength', signal_strength_fields)
+    if convert is DICondensedSignalStrengthAttr._convert:
+        return ('fields', 'UWBCondensedSignalStrength', condensed_signal_strength_fields)
+    return 'call'
+
+
+def _unconversion(unconvert):
+    # Kind of the conversion of an attribute value back to the values packed
+    if unconvert is None:
+        return None
+    if unconvert is DISerialNumberAttr._unconvert:
+        return 'as_int'
+    if unconvert is DIFixedLengthStrAttr._unconvert:
+        return 'encode'
+    if unconvert is DISignalStrengthAttr._unconvert:
+        return ('fields', signal_strength_fields)
+    if unconvert is DICondensedSignalStrengthAttr._unconvert:
+        return ('fields', condensed_signal_strength_fields)
+    return 'call'
+
+
+def _plan_compiled(compiled, prefix, namespace):
+    # Spec of the attributes covered by a compiled definition, binding their conversions into namespace
+    fields = []
+    for index, name in enumerate(compiled.names):
+        start, stop, convert = compiled.slices[name]
+        attr = compiled.definition[index]
+        conversion = _conversion(convert)
+        unconversion = _unconversion(attr.unconvert)
+        if conversion is None and stop - start != 1:
+            return None  # Values that do not map one to one to attributes are left to the base methods
+        if conversion == 'call':
+            namespace['{}convert_{}'.format(prefix, index)] = convert
+        if unconversion == 'call':
+            namespace['{}unconvert_{}'.format(prefix, index)] = attr.unconvert
+        fields.append((name, stop - start, conversion, unconversion))
+    return tuple(fields)
+
+
+def _plan_decode(attr, index, namespace):
+    # Spec of the decoding of one attribute on its own
+    if isinstance(attr, DataItemAttribute) and attr.size >= 0 and attr.struct.size == attr.size:
+        count = _value_count(attr)
+        conversion = False
+        if _inherits(attr, DataItemAttribute, '_decode') and count == 1:
+            conversion = None
+        elif _inherits(attr, DIFixedLengthStrAttr, '_decode'):
+            conversion = 'nullstrip'
+        elif _inherits(attr, DIFixedLengthBytesAttr, '_decode'):
+            conversion = None
+        elif _inherits(attr, DISerialNumberAttr, '_decode'):
+            conversion = 'serial'
+        elif _inherits(attr, DISignalStrengthAttr, '_decode'):
+            conversion = _conversion(attr._convert)
+        elif _inherits(attr, DICondensedSignalStrengthAttr, '_decode'):
+            conversion = _conversion(attr._convert)
+        if conversion is not False:
+            namespace['default_{}'.format(index)] = attr.default
+            namespace['unpack_{}'.format(index)] = attr.struct.unpack_from
+            if conversion == 'call':
+                namespace['convert_{}'.format(index)] = attr._convert
+            return ('fixed', attr.size, count, conversion)
+    if _inherits(attr, DIVariableLengthStrAttr, '_decode'):
+        return ('str',)
+    if _inherits(attr, DIVariableLengthBytesAttr, '_decode'):
+        return ('bytes',)
+    if _inherits(attr, DIRxStatsAttribute, '_decode'):
+        namespace['rx_classes_{}'.format(index)] = attr.ifc_stats_classes
+        return ('rx',)
+    if _inherits(attr, DIListAttr, '_decode', '_compile', '_element_prototype') and attr._compile() is not None:
+        compiled = attr._compile()
+        fields = _plan_compiled(compiled, 'element_{}_'.format(index), namespace)
+        if fields is not None:
+            if attr.as_tuples:
+                mode = 'tuples'
+            else:
+                prototype = attr._element_prototype()
+                mode = 'prototype' if prototype else 'init'
+                namespace['prototype_{}'.format(index)] = prototype
+                namespace['new_{}'.format(index)] = attr.class_name.__new__
+            namespace['iter_unpack_{}'.format(index)] = compiled.struct.iter_unpack
+            return ('list', compiled.size, fields, mode)
+    return ('call',)
+
+
+def _plan_encode(attr, index, namespace):
+    # Specs of the encoded size and encoding of one attribute on its own
+    if _inherits(attr, DataItemAttribute, '_encoded_size'):
+        size = ('const', attr.size)
+    elif _inherits(attr, DIVariableLengthStrAttr, '_encoded_size'):
+        size = ('str',)
+    elif _inherits(attr, DIVariableLengthBytesAttr, '_encoded_size'):
+        size = ('bytes',)
+    elif _inherits(attr, DIRxStatsAttribute, '_encoded_size'):
+        size = ('rx',)
+    else:
+        size = ('call',)
+
+    encode = ('call',)
+    unconversion = False
+    if _inherits(attr, DataItemAttribute, '_encode_into'):
+        unconversion = None
+    elif _inherits(attr, DIFixedLengthStrAttr, '_encode_into', '_unconvert'):
+        unconversion = 'encode'
+    elif _inherits(attr, DIFixedLengthBytesAttr, '_encode_into'):
+        unconversion = None
+    elif _inherits(attr, DISerialNumberAttr, '_encode_into', '_unconvert'):
+        unconversion = 'as_int'
+    elif _inherits(attr, DISignalStrengthAttr, '_encode_into', '_unconvert'):
+        unconversion = _unconversion(DISignalStrengthAttr._unconvert)
+    elif _inherits(attr, DICondensedSignalStrengthAttr, '_encode_into', '_unconvert'):
+        unconversion = _unconversion(DICondensedSignalStrengthAttr._unconvert)
+    if unconversion is not False and attr.size >= 0:
+        namespace['pack_{}'.format(index)] = attr.struct.pack_into
+        encode = ('fixed', attr.size, unconversion)
+    elif _inherits(attr, DIVariableLengthStrAttr, '_encode_into'):
+        encode = ('str',)
+    elif _inherits(attr, DIVariableLengthBytesAttr, '_encode_into'):
+        encode = ('bytes',)
+    elif _inherits(attr, DIRxStatsAttribute, '_encode_into'):
+        encode = ('rx',)
+    elif _inherits(attr, DIListAttr, '_encoded_size', '_encode_into', '_compile'):
+        compiled = attr._compile()
+        if compiled is not None and compiled.packable:
+            fields = _plan_compiled(compiled, 'element_{}_'.format(index), namespace)
+            if fields is not None:
+                namespace['pack_element_{}'.format(index)] = compiled.struct.pack_into
+                size = ('list', compiled.size)
+                encode = ('list', compiled.size, fields)
+    return size, encode
+
+
+def _uses_base(item_class, base, name):
+    # Whether a data item class uses the base method, or a method generated in its place
+    method = getattr(item_class, name)
+    return getattr(method, 'generated_from', method) is getattr(base, name)
+
+
+def _plan(item_class):
+    """Returns the spec the methods of a data item class are generated from and the objects they use,
+       or None when no method of the class can be generated"""
+    # Slotted classes of cdp.slotted decode into their slots and encode through the copied base methods
+    if 'slotted_from' in item_class.__dict__:
+        return None
+    for flavor, (base, _buffer, _offset, _size, _header_size) in flavors.items():
+        if issubclass(item_class, base):
+            break
+    else:
+        raise TypeError("Expected a CDPDataItem or DeviceDataItem class, got {}".format(item_class))
+
+    definition = item_class.definition
+    compiled = item_class.compiled_definition
+    # Methods installed on a base class would be inherited by every data item class
+    if item_class is base or compiled is None or compiled.definition is not definition:
+        return None
+    methods = []
+    if _uses_base(item_class, base, '_decode'):
+        methods.append('_decode')
+    if _uses_base(item_class, base, '_encoded_size') and _uses_base(item_class, base, '_encode_into'):
+        methods.append('_encoded_size')
+        methods.append('_encode_into')
+        if _uses_base(item_class, base, '_encode'):
+            methods.append('_encode')
+    if not methods:
+        return None
+
+    namespace = dict(definition=definition, compiled=compiled, unpack_prefix=compiled.struct.unpack_from,
+                     pack_prefix=compiled.struct.pack_into)
+    for method in methods:
+        namespace['base' + method] = getattr(base, method)
+    prefix = _plan_compiled(compiled, 'prefix_', namespace)
+    if prefix is None:
+        return None
+
+    attrs = []
+    for index, attr in enumerate(definition):
+        if attr.is_list and not _inherits(attr, DIRxStatsAttribute, '_decode'):
+            namespace['helper_{}'.format(index)] = attr.class_name
+            namespace['helper_definition_{}'.format(index)] = getattr(attr.class_name, 'definition', None)
+        namespace['attr_{}'.format(index)] = attr
+        decode = _plan_decode(attr, index, namespace)
+        size, encode = _plan_encode(attr, index, namespace)
+        if compiled.packable and index < len(prefix):
+            namespace.pop('pack_{}'.format(index), None)  # Packed by the compiled struct
+        attrs.append((attr.name, decode, size, encode))
+    spec = (version, flavor, tuple(methods), compiled.size, compiled.packable, prefix, tuple(attrs))
+    return spec, namespace
+
+
+class _Source():
+    # Lines of generated source with the current indentation
+    def __init__(self):
+        self.lines = []
+        self.indent = 0
+
+    def add(self, line, *args):
+        if args:
+            line = line.format(*args)
+        self.lines.append('    ' * self.indent + line if line else '')
+
+    def block(self, line, *args):
+        self.add(line, *args)
+        self.indent += 1
+
+    def end(self, count=1):
+        self.indent -= count
+
+
+def _get(target, name):
+    # Expression reading an attribute
+    if name.isidentifier() and not keyword.iskeyword(name):
+        return '{}.{}'.format(target, name)
+    return 'getattr({}, {!r})'.format(target, name)
+
+
+def _store(source, name, value):
+    if name.isidentifier() and not keyword.iskeyword(name):
+        source.add('self.{} = {}', name, value)
+    else:
+        source.add('setattr(self, {!r}, {})', name, value)
+
+
+def _unpacked(names):
+    # Targets of a struct unpack, a trailing comma for a single value
+    return ', '.join(names) + (',' if len(names) == 1 else '')
+
+
+def _convert(source, conversion, values, target, convert_name):
+    # Adds the statements converting unpacked values, returns the expression of the attribute value
+    if conversion is None:
+        return values[0]
+    if conversion == 'nullstrip':
+        return 'nullstrip({})'.format(values[0])
+    if conversion == 'serial':
+        return 'CiholasSerialNumber({})'.format(values[0])
+    if conversion == 'call':
+        return '{}({})'.format(convert_name, ', '.join(values))
+    _kind, class_name, fields = conversion
+    source.add('{} = new({})', target, class_name)
+    source.add('{}.__dict__ = {{{}}}', target, ', '.join('{!r}: {}'.format(field, value)
+                                                          for field, value in zip(fields, values)))
+    return target
+
+
+def _unconvert(conversion, value, unconvert_name):
+    # Expressions of the values packed for an attribute value
+    if conversion is None:
+        return [value]
+    if conversion == 'as_int':
+        return [value + '.as_int']
+    if conversion == 'encode':
+        return [value + '.encode()']
+    if conversion == 'call':
+        return ['*{}({})'.format(unconvert_name, value)]
+    return [_get(value, field) for field in conversion[1]]
+
+
+def _value_names(fields, value_prefix):
+    # Names of the values unpacked by a compiled struct, flat and per attribute
+    slices = []
+    for index, (_name, count, _conversion, _unconversion) in enumerate(fields):
+        slices.append(['{}{}_{}'.format(value_prefix, index, position) if count > 1 else
+                       '{}{}'.format(value_prefix, index) for position in range(count)])
+    return [value for names in slices for value in names], slices
+
+
+def _convert_fields(source, fields, prefix, value_prefix, convert_prefix):
+    # Adds the conversions of the values unpacked by a compiled struct, from the back as the compiled
+    # definition does. Returns the names of the unpacked values and the expression of every attribute.
+    values, slices = _value_names(fields, value_prefix)
+    expressions = [None] * len(fields)
+    for index in reversed(range(len(fields))):
+        conversion = fields[index][2]
+        expression = _convert(source, conversion, slices[index], '{}{}'.format(prefix, index),
+                              '{}convert_{}'.format(convert_prefix, index))
+        if conversion is not None and not isinstance(conversion, tuple):
+            source.add('{}{} = {}', prefix, index, expression)
+            expression = '{}{}'.format(prefix, index)
+        expressions[index] = expression
+    return values, expressions
+
+
+def _unconvert_fields(source, fields, target, value_prefix, unconvert_prefix):
+    # Adds the reads of the attributes packed by a compiled struct and their conversions back, from the
+    # back as the compiled definition does. Returns the expressions of the packed values.
+    for index, (name, _count, _conversion, _unconversion) in enumerate(fields):
+        source.add('{}{} = {}', value_prefix, index, _get(target, name))
+    packed = [None] * len(fields)
+    for index in reversed(range(len(fields))):
+        unconversion = fields[index][3]
+        value = '{}{}'.format(value_prefix, index)
+        expressions = _unconvert(unconversion, value, '{}unconvert_{}'.format(unconvert_prefix, index))
+        if unconversion is not None:
+            names = ['{}_{}'.format(value, position) for position in range(len(expressions))]
+            if unconversion == 'call':
+                source.add('{} = {}', names[0], expressions[0][1:])
+                expressions = ['*' + names[0]]
+            else:
+                source.add('{} = {}', ', '.join(names), ', '.join(expressions))
+                expressions = names
+        packed[index] = expressions
+    return [expression for expressions in packed for expression in expressions]
+
+
+def _emit_decode_attr(source, index, name, decode):
+    kind = decode[0]
+    value = 'v{}'.format(index)
+    if kind == 'fixed':
+        _kind, size, count, conversion = decode
+        source.block('if end - offset < {}:', size)
+        source.add('{} = default_{}', value, index)
+        source.end()
+        source.block('else:')
+        if conversion is None:
+            source.add('{}, = unpack_{}(buffer, offset)', value, index)
+        else:
+            values = ['u{}_{}'.format(index, position) for position in range(count)]
+            source.add('{} = unpack_{}(buffer, offset)', _unpacked(values), index)
+            expression = _convert(source, conversion, values, value, 'convert_{}'.format(index))
+            if expression != value:
+                source.add('{} = {}', value, expression)
+        source.end()
+        source.add('offset += {}', size)
+    elif kind in ('str', 'bytes'):
+        if kind == 'str':
+            source.add('{} = nullstrip(bytes(buffer[offset:end]))', value)
+        else:
+            source.add('{} = bytes(buffer[offset:end])', value)
+        source.block('if offset < end:')
+        source.add('offset = end')
+        source.end()
+    elif kind == 'list':
+        _kind, element_size, fields, mode = decode
+        source.add('data = view[offset:end]')
+        if mode == 'tuples':
+            source.block('if helper_{0}.definition is helper_definition_{0} and attr_{0}.tuple_class is not None:',
+                          index)
+            source.add('make = attr_{}.tuple_class._make', index)
+        else:
+            source.block('if helper_{0}.definition is helper_definition_{0}:', index)
+        source.add('size = len(data)')
+        source.add('fixed = size - size % {}', element_size)
+        source.add('{} = []', value)
+        source.add('append = {}.append', value)
+        elements, _slices = _value_names(fields, 'e')
+        source.block('for {} in iter_unpack_{}(data[:fixed]):', _unpacked(elements), index)
+        _values, expressions = _convert_fields(source, fields, 'c', 'e', 'element_{}_'.format(index))
+        items = ', '.join('{!r}: {}'.format(field[0], expression) for field, expression in zip(fields, expressions))
+        if mode == 'tuples':
+            source.add('append(make(({},)))', ', '.join(expressions))
+        elif mode == 'prototype':
+            source.add('item = new_{0}(helper_{0})', index)
+            source.add('item.__dict__ = {{**prototype_{}, {}}}', index, items)
+            source.add('append(item)')
+        else:
+            source.add('item = helper_{}()', index)
+            source.add('item.__dict__.update({{{}}})', items)
+            source.add('append(item)')
+        source.end()
+        # A trailing partial element is decoded with defaults for the attributes that do not fit
+        source.block('if fixed < size:')
+        source.add('attr_{}._decode_elements(data[fixed:], {})', index, value)
+        source.end()
+        source.add('offset += size')
+        source.end()
+        source.block('else:')
+        source.add('{}, size = attr_{}._decode(data)', value, index)
+        source.add('offset += size')
+        source.end()
+    elif kind == 'rx':
+        source.add('data = view[offset:end]')
+        source.add('stats_type, count, stats_len = unpack_rx_header(data[:4])')
+        source.block('if rx_classes_{}.get(stats_type) is InterfaceRxStatsV1:', index)
+        source.add('{} = []', value)
+        source.add('position = 4')
+        source.block('for _ in range(count):')
+        source.add('e0, e1, {} = unpack_rx_stats_v1(data[position:position + {}])',
+                   ', '.join('s{}'.format(position) for position in range(len(signal_strength_fields))),
+                   InterfaceRxStatsV1.size)
+        source.add('position += {}', InterfaceRxStatsV1.size)
+        _convert(source, ('fields', 'UWBSignalStrength', signal_strength_fields),
+                 ['s{}'.format(position) for position in range(len(signal_strength_fields))], 'signal_strength', None)
+        source.add('stats = new(InterfaceRxStatsV1)')
+        source.add("stats.__dict__ = {'interface_id': e0, 'rx_dt64': e1, 'signal_strength': signal_strength}")
+        source.add('{}.append(stats)', value)
+        source.end()
+        source.add('offset += 4 + stats_len')
+        source.end()
+        source.block('else:')
+        source.add('{}, size = attr_{}._decode(data)', value, index)
+        source.add('offset += size')
+        source.end()
+    else:
+        source.add('{}, size = attr_{}._decode(view[offset:end])', value, index)
+        source.add('offset += size')
+    _store(source, name, value)
+
+
+def _emit_decode(source, spec, flavor):
+    _version, _flavor, _methods, prefix_size, _packable, prefix, attrs = spec
+    _base, buffer_name, offset_name, size_name, _header_size = flavor
+    source.block('def _decode(self):')
+    source.block('if self.definition is not definition or self.compiled_definition is not compiled:')
+    source.add('return base_decode(self)')
+    source.end()
+    source.add('buffer = self.{}', buffer_name)
+    source.add('offset = self.{}', offset_name)
+    source.add('end = offset + self.{}', size_name)
+    if any(decode[0] in ('list', 'rx', 'call') for _name, decode, _size, _encode in attrs):
+        source.add('view = memoryview(buffer)')
+    if prefix:
+        # Decode the fixed size leading attributes in one go, one at a time when the data is short
+        source.block('if end - offset >= {}:', prefix_size)
+        values, _slices = _value_names(prefix, 'u')
+        source.add('{} = unpack_prefix(buffer, offset)', _unpacked(values))
+        _values, expressions = _convert_fields(source, prefix, 'v', 'u', 'prefix_')
+        source.add('instance_dict = self.__dict__')
+        for (name, _count, _conversion, _unconversion), expression in zip(prefix, expressions):
+            source.add('instance_dict[{!r}] = {}', name, expression)
+        source.add('offset += {}', prefix_size)
+        source.end()
+        source.block('else:')
+        for index, (name, decode, _size, _encode) in enumerate(attrs[:len(prefix)]):
+            _emit_decode_attr(source, index, name, decode)
+        source.end()
+    for index, (name, decode, _size, _encode) in enumerate(attrs):
+        if index >= len(prefix):
+            _emit_decode_attr(source, index, name, decode)
+    source.add('self.{} = None', buffer_name)
+    source.end()
+
+
+def _emit_encoded_size(source, spec, flavor):
+    _version, _flavor, _methods, prefix_size, packable, _prefix, attrs = spec
+    header_size = flavor[4]
+    covered = len(spec[5]) if packable else 0
+    source.block('def _encoded_size(self):')
+    source.block('if self.definition is not definition or self.compiled_definition is not compiled:')
+    source.add('return base_encoded_size(self)')
+    source.end()
+    source.add('size = {}', header_size + (prefix_size if packable else 0))
+    for index, (name, _decode, size, _encode) in enumerate(attrs):
+        if index < covered:
+            continue
+        kind = size[0]
+        value = _get('self', name)
+        if kind == 'const':
+            # The value is still read, as reading it decodes the data item
+            source.add(value)
+            source.add('size += {}', size[1])
+        elif kind == 'str':
+            source.add('size += len({}.encode())', value)
+        elif kind == 'bytes':
+            source.add('size += len({})', value)
+        elif kind == 'rx':
+            source.add('size += 4 + sum(stats.size for stats in {})', value)
+        elif kind == 'list':
+            source.add('v{} = {}', index, value)
+            source.block('if helper_{0}.definition is helper_definition_{0}:', index)
+            source.add('size += len(v{}) * {}', index, size[1])
+            source.end()
+            source.block('else:')
+            source.add('size += attr_{0}._encoded_size(v{0})', index)
+            source.end()
+        else:
+            source.add('size += attr_{}._encoded_size({})', index, value)
+    source.add('return size')
+    source.end()
+
+
+def _emit_encode_into(source, spec, flavor):
+    _version, flavor_name, _methods, prefix_size, packable, prefix, attrs = spec
+    _base, _buffer_name, _offset_name, size_name, header_size = flavor
+    source.block('def _encode_into(self, buffer, offset):')
+    source.block('if self.definition is not definition or self.compiled_definition is not compiled:')
+    source.add('return base_encode_into(self, buffer, offset)')
+    source.end()
+    source.add('start = offset + {}', header_size)
+    covered = 0
+    if packable and prefix:
+        # Pack the fixed size leading attributes in one go
+        packed = _unconvert_fields(source, prefix, 'self', 'v', 'prefix_')
+        source.add('pack_prefix(buffer, start, {})', ', '.join(packed))
+        source.add('end = start + {}', prefix_size)
+        covered = len(prefix)
+    else:
+        source.add('end = start')
+    for index, (name, _decode, _size, encode) in enumerate(attrs):
+        if index < covered:
+            continue
+        kind = encode[0]
+        value = 'v{}'.format(index)
+        source.add('{} = {}', value, _get('self', name))
+        if kind == 'fixed':
+            _kind, size, unconversion = encode
+            packed = _unconvert(unconversion, value, None)
+            source.add('pack_{}(buffer, end, {})', index, ', '.join(packed))
+            source.add('end += {}', size)
+        elif kind in ('str', 'bytes'):
+            if kind == 'str':
+                source.add('{0} = {0}.encode()', value)
+            source.add('stop = end + len({})', value)
+            source.add('buffer[end:stop] = {}', value)
+            source.add('end = stop')
+        elif kind == 'rx':
+            source.block('if {}:', value)
+            source.add('pack_rx_header(buffer, end, {0}[0].type, len({0}), len({0}) * {0}[0].size)', value)
+            source.end()
+            source.block('else:')
+            source.add('pack_rx_header(buffer, end, 0, 0, 0)')
+            source.end()
+            source.add('end += 4')
+            source.block('for stats in {}:', value)
+            source.add('data = stats.encode()')
+            source.add('stop = end + len(data)')
+            source.add('buffer[end:stop] = data')
+            source.add('end = stop')
+            source.end()
+        elif kind == 'list':
+            _kind, element_size, fields = encode
+            source.block('if helper_{0}.definition is helper_definition_{0}:', index)
+            source.block('for item in {}:', value)
+            packed = _unconvert_fields(source, fields, 'item', 'w', 'element_{}_'.format(index))
+            source.add('pack_element_{}(buffer, end, {})', index, ', '.join(packed))
+            source.add('end += {}', element_size)
+            source.end(2)
+            source.block('else:')
+            source.add('end = attr_{0}._encode_into(buffer, end, {1})', index, value)
+            source.end()
+        else:
+            source.add('end = attr_{0}._encode_into(buffer, end, {1})', index, value)
+    source.add('self.{} = end - start', size_name)
+    if flavor_name == 'cdp':
+        source.add('pack_data_header_into(buffer, offset, self.type, self.di_size)')
+    else:
+        source.add("type_length = int(format(self.type, '010b') + format(self.ddi_size, '06b'), 2)")
+        source.add('pack_device_header_into(buffer, offset, self.header_sequence_num, type_length)')
+    source.add('return end')
+    source.end()
+
+
+def _emit_encode(source):
+    source.block('def _encode(self):')
+    source.add('buffer = bytearray(_encoded_size(self))')
+    source.add('_encode_into(self, buffer, 0)')
+    source.add('return bytes(buffer)')
+    source.end()
+
+
+def _source(spec, namespace):
+    """Returns the source of the module holding the bind function of a spec"""
+    flavor = flavors[spec[1]]
+    methods = spec[2]
+    source = _Source()
+    source.add('# Generated by cdp.codegen, do not edit')
+    source.add('')
+    source.add('import struct')
+    source.add('')
+    source.add('from cdp.cdp import CiholasSerialNumber, InterfaceRxStatsV1, UWBSignalStrength, '
+               'UWBCondensedSignalStrength, nullstrip, pack_data_header_into')
+    source.add('')
+    source.add('new = object.__new__')
+    source.add("unpack_rx_header = struct.Struct('<BBH').unpack")
+    source.add("unpack_rx_stats_v1 = struct.Struct('<BQHHHHHH').unpack")
+    source.add("pack_rx_header = struct.Struct('<BBH').pack_into")
+    source.add("pack_device_header_into = struct.Struct('<BH').pack_into")
+    source.add('')
+    source.add('')
+    source.block('def bind({}):', ', '.join(sorted(namespace)))
+    if '_decode' in methods:
+        _emit_decode(source, spec, flavor)
+        source.add('')
+    if '_encoded_size' in methods:
+        _emit_encoded_size(source, spec, flavor)
+        source.add('')
+        _emit_encode_into(source, spec, flavor)
+        source.add('')
+    if '_encode' in methods:
+        _emit_encode(source)
+        source.add('')
+    source.add('return {{{}}}', ', '.join('{0!r}: {0}'.format(method) for method in methods))
+    source.end()
+    source.add('')
+    return '\n'.join(source.lines)
+
+
+def _key(spec, namespace):
+    # Hash of the spec and of the names bound into the generated source, which determine the source
+    return hashlib.sha256(repr((spec, sorted(namespace))).encode()).hexdigest()[:24]
+
+
+def generate_source(item_class):
+    """Returns the generated source of the methods of a data item class, None when the class has none to
+       generate"""
+    plan = _plan(item_class)
+    if plan is None:
+        return None
+    return _source(*plan)
+
+
+def _load(key, spec, namespace, directory):
+    # Returns the bind function of a spec, imported from the cached source when there is one
+    bind = loaded.get(key)
+    if bind is not None:
+        return bind
+    module_name = 'cdp_codegen_' + key
+    module = None
+    if directory is default_directory:
+        directory = cache_directory()
+    if directory is not None:
+        path = join(directory, module_name + '.py')
+        try:
+            if not _private_directory(directory):
+                raise PermissionError("Cache directory writable by other users: " + directory)
+            if not os.path.exists(path):
+                temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+                with open(temporary_path, 'w') as file:
+                    file.write(_source(spec, namespace))
+                os.replace(temporary_path, path)
+            # Imported as a module so its bytecode is cached next to it as well
+            module_spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+        except OSError:
+            module = None
+    if module is None:
+        module = type(sys)(module_name)
+        exec(compile(_source(spec, namespace), '<{}>'.format(module_name), 'exec'), module.__dict__)  # pylint: disable=exec-used
+    loaded[key] = bind = module.bind
+    return bind
+
+
+def _build(item_class, directory):
+    # Returns the cache key and the generated methods of a data item class, None when it has none
+    plan = _plan(item_class)
+    if plan is None:
+        return None
+    spec, namespace = plan
+    key = _key(spec, namespace)
+    methods = _load(key, spec, namespace, directory)(**namespace)
+    base = flavors[spec[1]][0]
+    for name, method in methods.items():
+        method.__qualname__ = '{}.{}'.format(item_class.__qualname__, name)
+        method.generated_from = getattr(base, name)  # Base method the generated one replaces
+    return key, methods
+
+
+def install(item_class, directory=default_directory):
+    """Replaces the base decode and encode methods a data item class uses by methods generated from its
+       definition, with the source cached in directory, cache_directory() by default, or not cached when
+       it is None. Returns whether any method was replaced."""
+    uninstall(item_class)
+    built = _build(item_class, directory)
+    if built is None:
+        return False
+    key, methods = built
+    previous = {name: item_class.__dict__.get(name) for name in methods}
+    for name, method in methods.items():
+        setattr(item_class, name, method)
+    installed[item_class] = (key, previous)
+    return True
+
+
+def uninstall(item_class):
+    """Restores the methods a data item class used before install"""
+    _cache_key, previous = installed.pop(item_class, (None, {}))
+    for name, method in previous.items():
+        if method is None:
+            delattr(item_class, name)
+        else:
+            setattr(item_class, name, method)
+
+
+def _registered_classes():
+    from cdp.data_items.data_items import DeviceData
+
+    return list(CDP.data_item_classes.values()) + list(DeviceData.dd_classes.values())
+
+
+def use_generated_codecs(directory=default_directory):
+    """Installs generated methods on every registered CDP data item and device data item class. Returns
+       the number of classes that got them."""
+    return sum(install(item_class, directory) for item_class in _registered_classes())
+
+
+def _state(value):
+    # Comparable form of a decoded value, attribute order included
+    if isinstance(value, (bool, int, float, str, bytes, type(None))):
+        return (type(value).__name__, repr(value))
+    if isinstance(value, dict):
+        return ('dict', [(key, _state(element)) for key, element in value.items()])
+    if isinstance(value, (list, tuple)) and not hasattr(value, '__dict__'):
+        return (type(value).__name__, [_state(element) for element in value])
+    state = [(name, _state(element)) for name, element in getattr(value, '__dict__', {}).items()]
+    for name in getattr(type(value), '__slots__', ()):
+        if hasattr(value, name):
+            state.append((name, _state(getattr(value, name))))
+    if not state:
+        state = repr(value)
+    return (type(value).__name__, state)
+
+
+def _run(function, *args):
+    # Result, exception and output of a call, in comparable form
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            result = (function(*args), None)
+        except Exception as error:  # pylint: disable=broad-except
+            result = (None, (type(error).__name__, str(error)))
+    return result, output.getvalue()
+
+
+def _sample(definition, rnd):
+    # Well formed data of a definition, with random values
+    data = b''
+    for attr in definition:
+        if isinstance(attr, DIRxStatsAttribute):
+            count = rnd.randrange(4)
+            data += struct.pack('<BBH', InterfaceRxStatsV1.type, count, count * InterfaceRxStatsV1.size)
+            data += bytes(rnd.getrandbits(8) for _ in range(count * InterfaceRxStatsV1.size))
+        elif attr.is_list:
+            element = getattr(attr.class_name, 'definition', None)
+            for _ in range(rnd.randrange(4)):
+                data += _sample(element, rnd) if element else bytes(rnd.getrandbits(8) for _ in range(4))
+        elif attr.size < 0:
+            data += bytes(rnd.getrandbits(8) for _ in range(rnd.randrange(12)))
+        else:
+            data += bytes(rnd.getrandbits(8) for _ in range(attr.size))
+    return data
+
+
+def _compare(item_class, methods, payload):
+    # Differences between the base and the generated methods on one payload
+    base = flavors['cdp' if issubclass(item_class, CDPDataItem) else 'device'][0]
+
+    def make():
+        if base is CDPDataItem:
+            return item_class(payload)
+        return item_class(0, 0, payload)
+
+    def make_default():
+        if base is CDPDataItem:
+            return item_class()
+        return item_class(0, 0)
+
+    differences = []
+    items = []
+    for decode in (base._decode, methods.get('_decode', base._decode)):
+        item = make()
+        result = _run(decode, item)
+        items.append(item)
+        differences.append((result, _state(vars(item))))
+    if differences[0] != differences[1]:
+        return ['_decode', differences]
+
+    if '_encode_into' in methods:
+        for pair in (items, [make(), make()], [make_default(), make_default()]):
+            results = []
+            for encoded_size, encode_into, encode, target in zip(
+                    (base._encoded_size, methods['_encoded_size']), (base._encode_into, methods['_encode_into']),
+                    (base._encode, methods.get('_encode', base._encode)), pair):
+                size = _run(encoded_size, target)
+                buffer = bytearray((size[0][0] or 0) + 8)
+                results.append((size, _run(encode_into, target, buffer, 2), bytes(buffer), _run(encode, target),
+                                _state(vars(target))))
+            if results[0] != results[1]:
+                return ['_encode', results]
+    return None
+
+
+def check_equivalence(classes=None, samples=8, seed=0):
+    """Compares the generated methods of every registered data item class, or of classes, with the base
+       ones on well formed and truncated random data, decoding and encoding back. Returns a list of
+       (class, payload, differences), empty when they all match."""
+    rnd = random.Random(seed)
+    mismatches = []
+    for item_class in (classes if classes is not None else _registered_classes()):
+        built = _build(item_class, None)
+        if built is None:
+            continue
+        _cache_key, methods = built
+        payloads = [b'']
+        for _ in range(samples):
+            payload = _sample(item_class.definition, rnd)
+            payloads += [payload, payload[:rnd.randrange(len(payload) + 1)],
+                         payload + bytes(rnd.getrandbits(8) for _ in range(rnd.randrange(1, 40)))]
+        for payload in payloads:
+            differences = _compare(item_class, methods, payload)
+            if differences is not None:
+                mismatches.append((item_class, payload, differences))
+    return mismatches
+
+
+def _main(argv):
+    directory = cache_directory()
+    if '--cache-dir' in argv:
+        directory = argv[argv.index('--cache-dir') + 1]
+    classes = _registered_classes()
+    count = 0
+    for item_class in classes:
+        count += _build(item_class, directory) is not None
+    print("Generated the methods of {} of {} data item classes in {}".format(count, len(classes), directory))
+    if '--check' in argv:
+        mismatches = check_equivalence(classes)
+        for item_class, payload, differences in mismatches[:20]:
+            print("{} differs on {}: {}".format(item_class.__name__, payload.hex(), differences))
+        if mismatches:
+            print("{} mismatches".format(len(mismatches)))
+            return 1
+        print("Generated methods match the base ones")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main(sys.argv[1:]))
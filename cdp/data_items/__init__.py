@@ -1,35 +1,18 @@
-import inspect
-import sys
-import glob
+# Data item modules are imported, and their classes registered, the first time one of their names or
+# types is used. The modules and names are listed in the generated cdp.type_registry, see cdp.registry.
+# Names bound here, like those of cdp_private, take precedence over the lazily loaded ones.
+from cdp import type_registry as _type_registry
+from cdp.registry import lazy_getattr as _lazy_getattr
+
 try:
+    import cdp_private as _cdp_private
     from cdp_private import *
-except:
+except ImportError:
+    _cdp_private = None
     from cdp.cdp import CDP, CDPDataItem
-from os.path import dirname, basename
-import importlib
-
-# Include .so's such that Cythonized cdp-py can still be properly imported
-module_files = glob.glob(dirname(__file__)+"/*.py") + glob.glob(dirname(__file__)+"/*.so")
-for module_file in module_files:
-    if not '__init__' in module_file:
-        module_name = ''
-        if module_file.endswith('.py'):
-            module_name = basename(module_file)[:-3]
-        else:
-            # Cython outputs to module_name.cpython-python_version-platform.so
-            module_name = basename(module_file).split(".cpython")[0]
-
-        # Import the module
-        module = importlib.import_module(__package__+'.'+module_name)
-
-        # Emulate from X import *
-        if "__all__" in module.__dict__:
-            names = module.__dict__['__all__']
-        else:
-            names = [x for x in module.__dict__ if not x.startswith('_')]
-        globals().update({k: getattr(module, k) for k in names})
 
-        # Get all data items in current module and register their types
-        for name, obj in inspect.getmembers(module):
-            if inspect.isclass(obj) and issubclass(obj, CDPDataItem):
-                CDP.register_data_item(obj)
+__getattr__ = _lazy_getattr(__name__)
+__all__ = list(_type_registry.exports.get(__name__, ()))
+if _cdp_private is not None:
+    __all__ += [name for name in getattr(_cdp_private, '__all__', dir(_cdp_private))
+                if not name.startswith('_') and name not in __all__]
@@ -3,7 +3,8 @@
 # pylint: disable=trailing-whitespace, too-few-public-methods, unused-wildcard-import
 
 from cdp.cdp import *
-from cdp.device_data_items import DeviceDataItem
+from cdp.device_data_items import DeviceDataItem, UnknownDeviceDataItem
+from cdp import registry as _registry, type_registry as _type_registry
 
 class MPUAccelerometerV1(CDPDataItem):
     """CDP Data Item: Ciholas Data Protocol MPU Accelerometer V1 Data Item Definition. Replaced by 0x0008 in v2.0.
@@ -881,20 +882,37 @@ class DirectCommand(CDPDataItem):
 
     def _decode(self):
         self.commands = []
-        while self.di_data:
-            grp, typ, lng = struct.unpack("<IBH", self.di_data[:7])
-            cmd_data = self.di_data[7:7+lng]
+        offset = self.di_offset
+        end = offset + self.di_size
+        view = memoryview(self.di_buffer)[:end]
+        while offset < end:
+            grp, typ, lng = struct.unpack_from("<IBH", view, offset)
+            cmd_data = bytes(view[offset+7:offset+7+lng])
             self.commands.append(UWBNetworkCommand(grp, typ, lng, cmd_data))
-            self.di_data = self.di_data[7+lng:]
-        self.di_data = None
+            offset += 7+lng
+        self.di_buffer = None
 
     def _encode(self):
-        data = b''
+        buffer = bytearray(DirectCommand._encoded_size(self))
+        DirectCommand._encode_into(self, buffer, 0)
+        return bytes(buffer)
+
+    def _encoded_size(self):
+        size = CDP.di_header_size
+        for cmd in self.commands:
+            size += 7 + cmd.length
+        return size
+
+    def _encode_into(self, buffer, offset):
+        start = offset + CDP.di_header_size
+        end = start
         for cmd in self.commands:
-            data += struct.pack("<IBH{:d}s".format(cmd.length), cmd.destination_group.as_int,
-                                cmd.type, cmd.length, cmd.data)
-        self.di_size = len(data)
-        return struct.pack("<HH", self.type, self.di_size) + data
+            struct.pack_into("<IBH{:d}s".format(cmd.length), buffer, end, cmd.destination_group.as_int,
+                             cmd.type, cmd.length, cmd.data)
+            end += 7 + cmd.length
+        self.di_size = end - start
+        struct.pack_into("<HH", buffer, offset, self.type, self.di_size)
+        return end
 
     def add_uwb_network_command(self, destination_group=0, type=0, length=0, data=0):
         """Adds a UWBNetworkCommand object to the list of commands."""
@@ -1508,7 +1526,8 @@ class DeviceData(CDPDataItem):
                   DIUInt8Attr('typing'), # No idea what this does.
                   DISerialNumberAttr('device_id'), # The serial number of the device the DeviceData is for.
                   DIVariableLengthBytesAttr('data')] # Contents of the Device Data UWB packet.
-    dd_classes = {}
+    dd_classes = _registry.TypeRegistry(_type_registry.device_data_item_types)  # Loads the module of a device data item type on first use
+    unknown_types = UnknownTypes(type_format='0x{:02X}')  # Counters and policy of the device data items of unregistered types
 
     def __str__(self):
         return "0x{:04X}, {}, {}, {}, {}, {}, {}, {}".format( \
@@ -1521,45 +1540,98 @@ class DeviceData(CDPDataItem):
             self.device_data)
 
     def _decode(self):
-        for attr in self.definition:
+        offset = self.di_offset
+        end = offset + self.di_size
+        view = memoryview(self.di_buffer)[:end]
+        definition = self.definition
+        compiled = self.compiled_definition
+        # Decode the fixed size header attributes in one go when the class was compiled for this definition
+        if compiled is not None and compiled.definition is definition and end - offset >= compiled.size:
+            self.__dict__.update(zip(compiled.names, compiled.unpack_from(view, offset)))
+            offset += compiled.size
+            definition = compiled.remaining
+        for attr in definition:
             if attr.name == "data":
-                sequence_num, tlv_header = struct.unpack("<BH", self.di_data[:3])
+                sequence_num, tlv_header = struct.unpack_from("<BH", view, offset)
                 tl = format(tlv_header, '016b')
                 dd_type = int(tl[:10], 2)
                 dd_len = int(tl[10:], 2)
-                self.di_data = self.di_data[3:]
+                offset += 3
 
-                if len(self.di_data) < dd_len:
-                    print("Type 0x{:02X}, Expected data size: {}, Actual data size: {}".format(dd_type, dd_len, len(self.di_data)))
+                if end - offset < dd_len:
+                    CDP.decode_errors.counts['truncated_device_data'] += 1
+                    if CDP.decode_errors.verbose:
+                        print("Type 0x{:02X}, Expected data size: {}, Actual data size: {}".format(dd_type, dd_len, end - offset))
 
                 try:
                     dd_class = DeviceData.dd_classes[dd_type]
                 except KeyError:
-                    #Unregistered unrecognized type that needs a DeviceDataItem class
-                    class_name = 'Unknown0x{:02X}'.format(dd_type)
-                    dd_class = type(class_name, (DeviceDataItem,), dict(type=dd_type))
-                    DeviceData.dd_classes[dd_type] = dd_class
-
-                self.device_data = dd_class(self.device_id, sequence_num, self.di_data)
+                    # Unregistered unrecognized type, counted and kept as an opaque device data item by default
+                    if DeviceData.unknown_types.seen(dd_type):
+                        self.device_data = UnknownDeviceDataItem(self.device_id, sequence_num, view, offset, end - offset, dd_type)
+                    else:
+                        # Dropped, the raw device data is kept so the data item encodes back unchanged
+                        self.device_data = None
+                        self.data = bytes(view[offset - 3:end])
+                    continue
+
+                self.device_data = dd_class(self.device_id, sequence_num, view, offset, end - offset)
             else:
-                value, size = attr._decode(self.di_data)
-                self.di_data = self.di_data[size:]
+                value, size = attr._decode(view[offset:end])
+                offset += size
                 setattr(self, attr.name, value)
-        self.di_data = None
+        self.di_buffer = None
 
     def _encode(self):
-        data = b''
-        for attr in self.definition:
+        buffer = bytearray(DeviceData._encoded_size(self))
+        DeviceData._encode_into(self, buffer, 0)
+        return bytes(buffer)
+
+    def _encoded_size(self):
+        size = CDP.di_header_size
+        definition = self.definition
+        compiled = self.compiled_definition
+        if compiled is not None and compiled.definition is definition and compiled.packable:
+            size += compiled.size
+            definition = compiled.remaining
+        for attr in definition:
+            if attr.name == "data":
+                device_data = self.device_data
+                if device_data is None:
+                    size += attr._encoded_size(self.data)
+                else:
+                    size += device_data._encoded_size()
+            else:
+                size += attr._encoded_size(getattr(self, attr.name))
+        return size
+
+    def _encode_into(self, buffer, offset):
+        start = offset + CDP.di_header_size
+        end = start
+        definition = self.definition
+        compiled = self.compiled_definition
+        # Pack the fixed size header attributes in one go when the class was compiled for this definition
+        if compiled is not None and compiled.definition is definition and compiled.packable:
+            compiled.pack_into(buffer, end, self)
+            end += compiled.size
+            definition = compiled.remaining
+        for attr in definition:
             if attr.name == "data":
-                data += self.device_data._encode()
+                # Without a device data item, as when dropped by policy, the raw device data is written
+                device_data = self.device_data
+                if device_data is None:
+                    end = attr._encode_into(buffer, end, self.data)
+                else:
+                    end = device_data._encode_into(buffer, end)
             else:
-                value = getattr(self, attr.name)
-                data += attr._encode(value)
-        self.di_size = len(data)
-        return struct.pack("<HH", self.type, self.di_size) + data
+                end = attr._encode_into(buffer, end, getattr(self, attr.name))
+        self.di_size = end - start
+        struct.pack_into("<HH", buffer, offset, self.type, self.di_size)
+        return end
 
     @classmethod
     def register_dd_item(cls, dd_class):
+        dd_class.compiled_definition = CompiledDefinition(dd_class.definition)
         cls.dd_classes[dd_class.type] = dd_class
 
     @classmethod
@@ -4,17 +4,36 @@
 import struct
 
 from cdp.cdp import CiholasSerialNumber, DIUInt8Attr, DIInt8Attr, DIUInt16Attr, DIInt16Attr, DIUInt32Attr, DIInt32Attr, DIUInt64Attr, DIInt64Attr, DIFloatAttr, DIDoubleAttr, DIBoolAttr, DIFixedLengthStrAttr, DIVariableLengthStrAttr, DIFixedLengthBytesAttr, DIVariableLengthBytesAttr, DISerialNumberAttr, UWBSignalStrength, DISignalStrengthAttr, UWBCondensedSignalStrength, DICondensedSignalStrengthAttr, DIListAttr, DISerialNumberListAttr, DIUInt16ListAttr, DIUInt32ListAttr, InterfaceRxStatsV1, DIRxStatsAttribute
+from cdp.cdp import _item_encoded_size_from_encode, _item_encode_into_from_encode
 
 class DeviceDataItem():
     type = 0xFF
     definition = [DIVariableLengthBytesAttr('data')]
+    compiled_definition = None  # Set when the class is registered
+    ddi_name = 'DeviceDataItem'  # The class name of every subclass
     
-    def __init__(self, device_serial, sequence_num, ddi_data=None):
+    def __init__(self, device_serial, sequence_num, ddi_data=None, ddi_offset=0, ddi_size=None):
         self.header_device_id = device_serial
         self.header_sequence_num = sequence_num
-        self.ddi_size = 0 if ddi_data is None else len(ddi_data)
-        self.ddi_data = ddi_data
-        self.ddi_name = self.__class__.__name__
+        if ddi_size is None:
+            ddi_size = 0 if ddi_data is None else len(ddi_data) - ddi_offset
+        self.ddi_size = ddi_size
+        self.ddi_buffer = ddi_data  # Buffer holding the undecoded data, None once decoded
+        self.ddi_offset = ddi_offset  # Offset of the data in the buffer
+
+    @property
+    def ddi_data(self):
+        """Undecoded data of the Device Data Item, None once decoded"""
+        if self.ddi_buffer is None:
+            return None
+        return bytes(self.ddi_buffer[self.ddi_offset:(self.ddi_offset+self.ddi_size)])
+
+    @ddi_data.setter
+    def ddi_data(self, ddi_data):
+        self.ddi_buffer = ddi_data
+        self.ddi_offset = 0
+        if ddi_data is not None:
+            self.ddi_size = len(ddi_data)
 
     def __str__(self):
         string = "{}, 0x{:02X}".format(CiholasSerialNumber(self.header_device_id), self.type)
@@ -30,39 +49,108 @@ class DeviceDataItem():
         return string
     
     def __getattr__(self, key):
-        if self.ddi_data is not None:
-            self._decode()
-        else:
-            for attr in self.definition:
-                # Check if data attribute has not been defined yet before initializing
-                # it to its default value
-                if not attr.name in dir(self):
-                    if attr.is_list:
-                        setattr(self, attr.name, list(attr.default))
-                    else:
-                        setattr(self, attr.name, attr.default)
-
-        if key in dir(self):
-            return getattr(self, key)
+        # Only called when normal attribute lookup fails, so the key is never a class attribute.
+        # Special names are looked up by copy/pickle on partially built instances and are never data attributes.
+        instance_dict = self.__dict__
+        if key[:2] != '__':
+            if instance_dict.get('ddi_buffer') is not None:
+                self._decode()
+            else:
+                for attr in self.definition:
+                    # Check if data attribute has not been defined yet before initializing
+                    # it to its default value
+                    if not attr.name in instance_dict:
+                        if attr.is_list:
+                            setattr(self, attr.name, list(attr.default))
+                        else:
+                            setattr(self, attr.name, attr.default)
+
+            if key in instance_dict:
+                return instance_dict[key]
 
         # Raise appropriately formatted attribute error
         return object.__getattribute__(self, key)
 
     def _decode(self):
-        for attr in self.definition:
-            value, size = attr._decode(self.ddi_data)
-            self.ddi_data = self.ddi_data[size:]
-            setattr(self, attr.name, value)
-        self.ddi_data = None
+        buffer = self.ddi_buffer
+        offset = self.ddi_offset
+        end = offset + self.ddi_size
+        definition = self.definition
+        compiled = self.compiled_definition
+        # Decode the fixed size leading attributes in one go when the class was compiled for this definition
+        if compiled is not None and compiled.definition is definition and end - offset >= compiled.size:
+            self.__dict__.update(zip(compiled.names, compiled.unpack_from(buffer, offset)))
+            offset += compiled.size
+            definition = compiled.remaining
+        if definition:
+            # Attributes get zero-copy views of the remaining data
+            view = memoryview(buffer)
+            for attr in definition:
+                value, size = attr._decode(view[offset:end])
+                offset += size
+                setattr(self, attr.name, value)
+        self.ddi_buffer = None
 
     def _encode(self):
-        data = b''
-        for attr in self.definition:
-            value = getattr(self, attr.name)
-            data += attr._encode(value)
-        self.ddi_size = len(data)
+        # Call the base implementations directly, a subclass may override only _encode and call this one
+        buffer = bytearray(DeviceDataItem._encoded_size(self))
+        DeviceDataItem._encode_into(self, buffer, 0)
+        return bytes(buffer)
+
+    def _encoded_size(self):
+        """Returns the size in bytes of the encoded device data item, header included"""
+        size = 3
+        definition = self.definition
+        compiled = self.compiled_definition
+        if compiled is not None and compiled.definition is definition and compiled.packable:
+            size += compiled.size
+            definition = compiled.remaining
+        for attr in definition:
+            size += attr._encoded_size(getattr(self, attr.name))
+        return size
+
+    def _encode_into(self, buffer, offset):
+        """Encodes the device data item, header included, into buffer at offset and returns the offset past it"""
+        start = offset + 3
+        end = start
+        definition = self.definition
+        compiled = self.compiled_definition
+        # Pack the fixed size leading attributes in one go when the class was compiled for this definition
+        if compiled is not None and compiled.definition is definition and compiled.packable:
+            compiled.pack_into(buffer, end, self)
+            end += compiled.size
+            definition = compiled.remaining
+        for attr in definition:
+            end = attr._encode_into(buffer, end, getattr(self, attr.name))
+        self.ddi_size = end - start
         type_length = int(format(self.type, '010b') + format(self.ddi_size, '06b'), 2)
-        return struct.pack("<BH", self.header_sequence_num, type_length) + data
+        struct.pack_into("<BH", buffer, offset, self.header_sequence_num, type_length)
+        return end
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'ddi_name' not in cls.__dict__:
+            cls.ddi_name = cls.__name__
+        # Device data items that only override _encode are written through it
+        if '_encode' in cls.__dict__ and '_encode_into' not in cls.__dict__:
+            cls._encoded_size = _item_encoded_size_from_encode
+            cls._encode_into = _item_encode_into_from_encode
+
+class UnknownDeviceDataItem(DeviceDataItem):
+    """Unknown Device Data Item: Opaque device data item of an unregistered type, shared by every such type.
+       The type is set on each instance, and the data is left undecoded until read."""
+
+    def __init__(self, device_serial, sequence_num, ddi_data=None, ddi_offset=0, ddi_size=None, dd_type=0xFF):
+        super().__init__(device_serial, sequence_num, ddi_data, ddi_offset, ddi_size)
+        self.type = dd_type
+        self.ddi_name = 'Unknown0x{:02X}'.format(dd_type)
+
+    @property
+    def payload(self):
+        """Data of the device data item, as a view of the packet while it is undecoded"""
+        if self.ddi_buffer is None:
+            return self.data
+        return memoryview(self.ddi_buffer)[self.ddi_offset:self.ddi_offset + self.ddi_size]
 
 #################################################
 #### BEGIN SPECIFIC DEVICE DATA ITEM CLASSES ####
@@ -0,0 +1,118 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+"""Generates cdp.type_registry from the data item modules, as the packages used to find and register
+   them on import:
+
+       python -m cdp.generate_registry          writes cdp/type_registry.py
+       python -m cdp.generate_registry --check  fails when it is out of date
+"""
+
+import importlib
+import os
+import pprint
+import sys
+from os.path import dirname, join
+
+from cdp.registry import registered_classes
+
+__all__ = ['generate']
+
+
+def _module_names(directory, package, selected):
+    # Module names of the .py files and Cython .so builds in a directory, as the packages used to find them
+    names = []
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith('.py'):
+            module_name = file_name[:-3]
+        elif file_name.endswith('.so'):
+            # Cython outputs to module_name.cpython-python_version-platform.so
+            module_name = file_name.split(".cpython")[0]
+        else:
+            continue
+        if selected(module_name) and package + '.' + module_name not in names:
+            names.append(package + '.' + module_name)
+    return names
+
+
+def _public_names(module):
+    # Names a from X import * of the module binds
+    if '__all__' in module.__dict__:
+        return list(module.__dict__['__all__'])
+    return [name for name in module.__dict__ if not name.startswith('_')]
+
+
+def generate():
+    """Imports every data item module and returns the source of cdp.type_registry"""
+    from cdp.cdp import CDPDataItem
+    from cdp.device_data_items import DeviceDataItem
+
+    package_dir = dirname(__file__)
+    modules = {}
+    for module_name in _module_names(join(package_dir, 'data_items'), 'cdp.data_items',
+                                     lambda name: name != '__init__'):
+        modules[module_name] = 'data_items'
+    for module_name in _module_names(package_dir, 'cdp', lambda name: 'device_data_items' in name):
+        modules[module_name] = 'device_data_items'
+
+    data_item_types = {}
+    device_data_item_types = {}
+    exports = {'cdp': {}, 'cdp.data_items': {}}
+    for module_name, kind in modules.items():
+        module = importlib.import_module(module_name)
+        if kind == 'data_items':
+            types, base, package_exports = data_item_types, CDPDataItem, exports['cdp.data_items']
+        else:
+            types, base, package_exports = device_data_item_types, DeviceDataItem, exports['cdp']
+        for di_type, di_class in registered_classes(module, base).items():
+            types[di_type] = (module_name, di_class.__name__)
+        for name in _public_names(module):
+            package_exports[name] = module_name
+    # cdp exports what cdp.data_items exports, then the device data item modules
+    exports['cdp'] = dict({name: 'cdp.data_items' for name in exports['cdp.data_items']}, **exports['cdp'])
+
+    def hex_keys(types, digits):
+        lines = ["    0x{:0{}X}: {!r},".format(di_type, digits, entry) for di_type, entry in sorted(types.items())]
+        return "\n".join(lines)
+
+    return "\n".join([
+        "# Ciholas, Inc. - www.ciholas.com",
+        "# Licensed under: creativecommons.org/licenses/by/4.0",
+        "# Generated by python -m cdp.generate_registry, do not edit",
+        "",
+        "# Data item module to the kind of classes it registers",
+        "modules = " + pprint.pformat(modules, width=120),
+        "",
+        "# CDP data item type to (module, class name)",
+        "data_item_types = {",
+        hex_keys(data_item_types, 4),
+        "}",
+        "",
+        "# Device data item type to (module, class name)",
+        "device_data_item_types = {",
+        hex_keys(device_data_item_types, 2),
+        "}",
+        "",
+        "# Package to the module each of its exported names comes from",
+        "exports = " + pprint.pformat(exports, width=120),
+        "",
+    ])
+
+
+def _main(argv):
+    path = join(dirname(__file__), 'type_registry.py')
+    source = generate()
+    if '--check' in argv:
+        with open(path) as file:
+            if file.read() != source:
+                print("{} is out of date, run python -m cdp.generate_registry".format(path))
+                return 1
+        return 0
+    with open(path, 'w') as file:
+        file.write(source)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main(sys.argv[1:]))
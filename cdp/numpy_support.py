@@ -0,0 +1,144 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import re
+
+from cdp.cdp import CDP, CDPDataItem, DISignalStrengthAttr, DICondensedSignalStrengthAttr
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ['numpy_dtype', 'frombuffer', 'decode_packets', 'to_numpy']
+
+# NumPy type codes for the struct format characters used by the data item attributes
+numpy_codes = {'B': 'u1', 'b': 'i1', 'H': '<u2', 'h': '<i2', 'I': '<u4', 'i': '<i4',
+               'Q': '<u8', 'q': '<i8', 'f': '<f4', 'd': '<f8', '?': '?'}
+
+# Field names of the attributes that unpack to more than one value
+structure_names = {DISignalStrengthAttr: ('fp_ampl1', 'fp_ampl2', 'fp_ampl3', 'rx_preamble_acc', 'cir_power', 'std_noise'),
+                   DICondensedSignalStrengthAttr: ('fp_rssi', 'tp_rssi')}
+
+header_fields = [('di_type', '<u2'), ('di_size', '<u2')]
+
+# Data item class to its (dtype, dtype with header)
+dtypes = {}
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is required for cdp.numpy_support")
+
+
+def _attr_dtype(attr):
+    """Returns the NumPy type of a fixed size data item attribute"""
+    codes = re.findall(r'(\d*)(\D)', attr.struct.format[1:])
+    if len(codes) == 1:
+        count, code = codes[0]
+        if code == 's':
+            return 'S' + count
+        return numpy_codes[code]
+    names = structure_names[type(attr)]
+    return [(name, numpy_codes[code]) for name, (_count, code) in zip(names, codes)]
+
+
+def numpy_dtype(item_class, header=False):
+    """Returns the packed little-endian NumPy structured dtype of a data item class whose definition
+       only holds fixed size attributes. Serial numbers are stored as integers and fixed length
+       strings as raw bytes. With header set, the dtype starts with the 4 byte data item header."""
+    _require_numpy()
+
+    if item_class in dtypes:
+        return dtypes[item_class][header]
+
+    fields = []
+    for attr in item_class.definition:
+        if attr.is_list or attr.size < 0:
+            raise ValueError("{} does not have a fixed size definition".format(item_class.__name__))
+        fields.append((attr.name, _attr_dtype(attr)))
+
+    dtype = numpy.dtype(fields)
+    header_dtype = numpy.dtype(header_fields + fields)
+    dtypes[item_class] = (dtype, header_dtype)
+    return header_dtype if header else dtype
+
+
+def frombuffer(item_class, buffer, count=-1, offset=0, header=False):
+    """Returns a structured array viewing count consecutive data items of one class in buffer,
+       starting at offset. With header set, each data item is preceded by its 4 byte header."""
+    return numpy.frombuffer(buffer, numpy_dtype(item_class, header), count, offset)
+
+
+def _complete_size(item_class, size):
+    """Returns how many bytes of a short data item hold complete attributes. Attributes past the
+       first incomplete one are decoded as their default, which is zero for every fixed size type."""
+    complete = 0
+    for attr in item_class.definition:
+        if complete + attr.size > size:
+            break
+        complete += attr.size
+    return complete
+
+
+def decode_packets(item_class, datagrams):
+    """Decodes every data item of one class found in the CDP packets into a single structured array.
+       Runs of back to back data items of equal size are read with one strided view per run."""
+    dtype = numpy_dtype(item_class)
+    item_size = dtype.itemsize
+    di_header_size = CDP.di_header_size
+    chunks = []
+
+    for data in datagrams:
+        _sequence, _serial, items = CDP.peek(data)
+        run_start = run_count = run_size = 0
+        for di_type, offset, size in items:
+            if di_type != item_class.type:
+                continue
+            if run_count and size == run_size and offset == run_start + run_count * (run_size + di_header_size):
+                run_count += 1
+                continue
+            if run_count:
+                chunks.append(numpy.ndarray((run_count,), dtype, data, run_start, (run_size + di_header_size,)))
+                run_count = 0
+            if size >= item_size:
+                run_start, run_count, run_size = offset, 1, size
+            else:
+                record = bytearray(item_size)
+                complete = _complete_size(item_class, size)
+                record[:complete] = data[offset:offset + complete]
+                chunks.append(numpy.frombuffer(record, dtype))
+        if run_count:
+            chunks.append(numpy.ndarray((run_count,), dtype, data, run_start, (run_size + di_header_size,)))
+
+    if not chunks:
+        return numpy.zeros(0, dtype)
+    return numpy.concatenate(chunks)
+
+
+def to_numpy(items, item_class=None):
+    """Returns a structured array holding a collection of data items of one class. Data items that
+       have not been decoded yet are copied straight from their packet."""
+    items = list(items)
+    if item_class is None:
+        if not items:
+            raise ValueError("item_class is required for an empty collection")
+        item_class = type(items[0])
+    dtype = numpy_dtype(item_class)
+    item_size = dtype.itemsize
+
+    records = []
+    for item in items:
+        if isinstance(item, CDPDataItem):
+            buffer, offset, size = item.di_buffer, item.di_offset, item.di_size
+        else:
+            buffer, offset, size = item.ddi_buffer, item.ddi_offset, item.ddi_size
+        if buffer is not None and size >= item_size:
+            records.append(bytes(buffer[offset:offset + item_size]))
+        elif buffer is not None:
+            complete = _complete_size(item_class, size)
+            records.append(bytes(buffer[offset:offset + complete]).ljust(item_size, b'\x00'))
+        else:
+            records.append(b''.join(attr._encode(getattr(item, attr.name)) for attr in item_class.definition))
+    return numpy.frombuffer(b''.join(records), dtype).copy()
@@ -0,0 +1,309 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+from collections import namedtuple
+import mmap
+import socket
+import struct
+
+from cdp.cdp import CDP
+
+__all__ = ['PcapReader', 'PcapDatagram']
+
+PcapDatagram = namedtuple('PcapDatagram', ['timestamp', 'source', 'destination', 'data'])
+
+# Link layer types
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+vlan_ethertypes = (0x8100, 0x88A8, 0x9100)
+ipv6_extension_headers = (0, 43, 60)  # Hop-by-hop, routing and destination options
+IPPROTO_UDP = 17
+IPPROTO_FRAGMENT = 44
+null_ipv4_families = (2, 0x02000000)  # AF_INET in either byte order
+null_ipv6_families = (24, 28, 30, 0x18000000, 0x1C000000, 0x1E000000)  # AF_INET6 of the BSDs in either byte order
+
+unpack_ushort_from = struct.Struct(">H").unpack_from
+unpack_udp_header_from = struct.Struct(">HHH").unpack_from
+
+# pcap file header magic to (byte order, timestamp fraction scale)
+pcap_magics = {b'\xd4\xc3\xb2\xa1': ('<', 1e-6), b'\xa1\xb2\xc3\xd4': ('>', 1e-6),
+               b'\x4d\x3c\xb2\xa1': ('<', 1e-9), b'\xa1\xb2\x3c\x4d': ('>', 1e-9)}
+PCAPNG_SECTION_HEADER = 0x0A0D0D0A
+PCAPNG_INTERFACE_DESCRIPTION = 1
+PCAPNG_OBSOLETE_PACKET = 2
+PCAPNG_SIMPLE_PACKET = 3
+PCAPNG_ENHANCED_PACKET = 6
+pcapng_byte_orders = {b'\x4d\x3c\x2b\x1a': '<', b'\x1a\x2b\x3c\x4d': '>'}
+
+
+class PcapReader():
+    """Pcap Reader: Memory maps a pcap or pcapng capture and extracts the payloads of its UDP datagrams.
+
+       Ethernet (with any number of VLAN tags), Linux cooked (SLL and SLL2), raw IP and BSD loopback
+       links are supported, over IPv4 and IPv6. Datagrams can be filtered by destination UDP port and
+       destination address, such as a multicast group. Fragmented and truncated datagrams are counted
+       and skipped. Payloads are memoryviews of the mapped file and stay valid until the reader is closed."""
+
+    def __init__(self, path, ports=None, groups=None, addresses=True):
+        self.ports = None if ports is None else frozenset(ports)  # Destination UDP ports to keep
+        self.groups = None if groups is None else frozenset(_pack_host(group) for group in groups)  # Destination addresses to keep
+        self.addresses = addresses  # Fill in the source and destination of each datagram
+        self.frames = 0  # Number of captured frames
+        self.datagrams_read = 0  # Number of datagrams yielded
+        self.other = 0  # Number of frames that are not UDP over IP
+        self.filtered = 0  # Number of datagrams not matching the port or address filters
+        self.fragments = 0  # Number of fragments of fragmented IP packets
+        self.truncated = 0  # Number of frames cut short by the capture snap length
+
+        self.file = open(path, 'rb')
+        self.map = None
+        self.view = None
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.map)
+            magic = self.map[:4]
+            if magic in pcap_magics:
+                self.format = 'pcap'
+            elif len(self.map) >= 12 and self.map[8:12] in pcapng_byte_orders and \
+                    struct.unpack_from("<I", self.map, 0)[0] == PCAPNG_SECTION_HEADER:
+                self.format = 'pcapng'
+            else:
+                raise ValueError("Not a pcap or pcapng file")
+        except:
+            self.close()
+            raise
+
+    @property
+    def stats(self):
+        return dict(frames=self.frames, datagrams=self.datagrams_read, other=self.other,
+                    filtered=self.filtered, fragments=self.fragments, truncated=self.truncated)
+
+    def _pcap_frames(self):
+        data = self.map
+        size = len(data)
+        byte_order, scale = pcap_magics[data[:4]]
+        unpack_record_from = struct.Struct(byte_order + "IIII").unpack_from
+        linktype = struct.unpack_from(byte_order + "I", data, 20)[0] & 0xFFFF
+        offset = 24
+        while offset + 16 <= size:
+            seconds, fraction, captured_length, _length = unpack_record_from(data, offset)
+            offset += 16
+            end = offset + captured_length
+            if end > size:
+                break
+            yield seconds + fraction * scale, linktype, offset, end
+            offset = end
+
+    def _pcapng_frames(self):
+        data = self.map
+        size = len(data)
+        byte_order = '<'
+        interfaces = []  # (link type, timestamp scale, timestamp offset) of each interface of the section
+        offset = 0
+        while offset + 12 <= size:
+            block_type, = struct.unpack_from(byte_order + "I", data, offset)
+            if block_type == PCAPNG_SECTION_HEADER:
+                byte_order = pcapng_byte_orders.get(data[offset + 8:offset + 12])
+                if byte_order is None:
+                    break
+                interfaces = []
+            block_length, = struct.unpack_from(byte_order + "I", data, offset + 4)
+            if block_length < 12 or offset + block_length > size:
+                break
+            body = offset + 8
+            block_end = offset + block_length - 4
+
+            if block_type == PCAPNG_ENHANCED_PACKET:
+                interface, high, low, captured_length, _length = struct.unpack_from(byte_order + "IIIII", data, body)
+                if interface < len(interfaces):
+                    linktype, scale, time_offset = interfaces[interface]
+                    start = body + 20
+                    yield ((high << 32) | low) * scale + time_offset, linktype, start, min(start + captured_length, block_end)
+            elif block_type == PCAPNG_SIMPLE_PACKET:
+                if interfaces:
+                    length, = struct.unpack_from(byte_order + "I", data, body)
+                    start = body + 4
+                    yield None, interfaces[0][0], start, min(start + length, block_end)
+            elif block_type == PCAPNG_OBSOLETE_PACKET:
+                interface, _drops, high, low, captured_length, _length = struct.unpack_from(byte_order + "HHIIII", data, body)
+                if interface < len(interfaces):
+                    linktype, scale, time_offset = interfaces[interface]
+                    start = body + 20
+                    yield ((high << 32) | low) * scale + time_offset, linktype, start, min(start + captured_length, block_end)
+            elif block_type == PCAPNG_INTERFACE_DESCRIPTION:
+                linktype, = struct.unpack_from(byte_order + "H", data, body)
+                interfaces.append((linktype,) + self._interface_time(data, byte_order, body + 8, block_end))
+            offset += block_length
+
+    @staticmethod
+    def _interface_time(data, byte_order, offset, end):
+        # Returns the (scale, offset) of the timestamps of an interface from its description options
+        scale = 1e-6
+        time_offset = 0
+        while offset + 4 <= end:
+            code, length = struct.unpack_from(byte_order + "HH", data, offset)
+            value = offset + 4
+            if code == 0:
+                break
+            if code == 9 and length >= 1:  # if_tsresol
+                resolution = data[value]
+                scale = 2.0 ** -(resolution & 0x7F) if resolution & 0x80 else 10.0 ** -resolution
+            elif code == 14 and length >= 8:  # if_tsoffset
+                time_offset, = struct.unpack_from(byte_order + "q", data, value)
+            offset = value + (length + 3) // 4 * 4
+        return scale, time_offset
+
+    def _network(self, linktype, offset, end):
+        # Returns the (ethertype, offset) of the network layer packet in a frame, None if unsupported
+        data = self.map
+        if linktype == LINKTYPE_ETHERNET:
+            if end - offset < 14:
+                return None
+            ethertype, = unpack_ushort_from(data, offset + 12)
+            offset += 14
+            while ethertype in vlan_ethertypes:
+                if end - offset < 4:
+                    return None
+                ethertype, = unpack_ushort_from(data, offset + 2)
+                offset += 4
+            return ethertype, offset
+        if linktype == LINKTYPE_LINUX_SLL:
+            if end - offset < 16:
+                return None
+            return unpack_ushort_from(data, offset + 14)[0], offset + 16
+        if linktype == LINKTYPE_LINUX_SLL2:
+            if end - offset < 20:
+                return None
+            return unpack_ushort_from(data, offset)[0], offset + 20
+        if linktype in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6):
+            if end - offset < 1:
+                return None
+            version = data[offset] >> 4
+            return (ETHERTYPE_IPV4 if version == 4 else ETHERTYPE_IPV6 if version == 6 else 0), offset
+        if linktype in (LINKTYPE_NULL, LINKTYPE_LOOP):
+            if end - offset < 4:
+                return None
+            family, = struct.unpack_from("<I", data, offset)
+            if family in null_ipv4_families:
+                return ETHERTYPE_IPV4, offset + 4
+            if family in null_ipv6_families:
+                return ETHERTYPE_IPV6, offset + 4
+        return None
+
+    def datagrams(self):
+        """Yields a PcapDatagram for every UDP datagram that matches the filters, with the source and
+           destination as (host, port) tuples when addresses is set"""
+        data = self.map
+        view = self.view
+        ports = self.ports
+        groups = self.groups
+        addresses = self.addresses
+        frames = self._pcap_frames() if self.format == 'pcap' else self._pcapng_frames()
+
+        for timestamp, linktype, offset, end in frames:
+            self.frames += 1
+            network = self._network(linktype, offset, end)
+            if network is None:
+                self.other += 1
+                continue
+            ethertype, offset = network
+
+            if ethertype == ETHERTYPE_IPV4:
+                if end - offset < 20 or data[offset + 9] != IPPROTO_UDP:
+                    self.other += 1
+                    continue
+                if unpack_ushort_from(data, offset + 6)[0] & 0x3FFF:
+                    self.fragments += 1
+                    continue
+                address_offset, address_size = offset + 12, 4
+                udp = offset + (data[offset] & 0x0F) * 4
+            elif ethertype == ETHERTYPE_IPV6:
+                if end - offset < 40:
+                    self.other += 1
+                    continue
+                protocol = data[offset + 6]
+                udp = offset + 40
+                while protocol in ipv6_extension_headers and udp + 2 <= end:
+                    protocol = data[udp]
+                    udp += (data[udp + 1] + 1) * 8
+                if protocol == IPPROTO_FRAGMENT:
+                    self.fragments += 1
+                    continue
+                if protocol != IPPROTO_UDP:
+                    self.other += 1
+                    continue
+                address_offset, address_size = offset + 8, 16
+            else:
+                self.other += 1
+                continue
+
+            if end - udp < 8:
+                self.truncated += 1
+                continue
+            source_port, port, length = unpack_udp_header_from(data, udp)
+            if ports is not None and port not in ports:
+                self.filtered += 1
+                continue
+            destination_offset = address_offset + address_size
+            if groups is not None and data[destination_offset:destination_offset + address_size] not in groups:
+                self.filtered += 1
+                continue
+            payload_end = udp + length
+            if length < 8 or payload_end > end:
+                self.truncated += 1
+                continue
+
+            self.datagrams_read += 1
+            if addresses:
+                family = socket.AF_INET if address_size == 4 else socket.AF_INET6
+                source = (socket.inet_ntop(family, data[address_offset:destination_offset]), source_port)
+                destination = (socket.inet_ntop(family, data[destination_offset:destination_offset + address_size]), port)
+                yield PcapDatagram(timestamp, source, destination, view[udp + 8:payload_end])
+            else:
+                yield PcapDatagram(timestamp, None, None, view[udp + 8:payload_end])
+
+    def packets(self, include_types=None, exclude_types=None):
+        """Yields (timestamp, CDP) tuples of the datagrams that match the filters, decoded without copying.
+           Datagrams that are not valid CDP packets are skipped."""
+        for datagram in self.datagrams():
+            try:
+                packet = CDP(datagram.data, zero_copy=True, include_types=include_types, exclude_types=exclude_types)
+            except ValueError:
+                continue
+            yield datagram.timestamp, packet
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+        try:
+            if self.map is not None:
+                self.map.close()
+        except BufferError:
+            # Payloads still referenced keep the mapping alive until they are released
+            pass
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _pack_host(host):
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            return socket.inet_pton(family, host)
+        except OSError:
+            pass
+    raise ValueError("Invalid address: {}".format(host))
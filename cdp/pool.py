@@ -0,0 +1,209 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+from functools import partial
+from itertools import count, islice
+import multiprocessing
+import os
+import struct
+
+from cdp.cdp import CDP, CDPDataItem, UnknownDataItem
+from cdp.device_data_items import UnknownDeviceDataItem
+
+__all__ = ['DecodePool', 'decode_values', 'to_packet', 'header_serial']
+
+unpack_serial_from = struct.Struct("<I").unpack_from
+serial_offset = 16  # Offset of the serial number in the CDP header
+
+
+def header_serial(data):
+    """Returns the serial number of a CDP packet as an integer, read from its header without decoding.
+       Returns 0 for data too short to hold a header."""
+    if len(data) < CDP.cdp_header_size:
+        return 0
+    return unpack_serial_from(data, serial_offset)[0]
+
+
+def _item_values(item):
+    # Attribute values in definition order. The data of a Device Data item is replaced by the
+    # type, sequence number and attribute values of the device data item it holds.
+    values = []
+    device_data = getattr(item, '__dict__', {}).get('device_data') if isinstance(item, CDPDataItem) else None
+    for attr in item.definition:
+        if device_data is not None and attr.name == 'data':
+            values.append((device_data.type, device_data.header_sequence_num, _item_values(device_data)))
+        else:
+            values.append(getattr(item, attr.name))
+    return tuple(values)
+
+
+def decode_values(data):
+    """Decodes a CDP packet into a compact picklable (sequence, serial, items) tuple, where serial is an
+       integer and items is a list of (type, values) tuples holding the attribute values of each data
+       item in definition order. Returns None when the packet is invalid."""
+    try:
+        packet = CDP(data)
+        items = []
+        for item in packet.data_items:
+            getattr(item, item.definition[0].name)  # Decode all attributes
+            items.append((item.type, _item_values(item)))
+    except (ValueError, struct.error):
+        return None
+    return (packet.sequence, packet.serial_number.as_int, items)
+
+
+def _make_item(item_class, values, *args):
+    item = item_class(*args)
+    for attr, value in zip(item.definition, values):
+        setattr(item, attr.name, value)
+    return item
+
+
+def to_packet(result):
+    """Rebuilds a CDP packet, with data item objects, from a result of decode_values"""
+    from cdp.data_items.data_items import DeviceData
+
+    sequence, serial, items = result
+    packet = CDP(serial_number=serial)
+    packet.sequence = sequence
+    for di_type, values in items:
+        di_class = CDP.data_item_classes.get(di_type)
+        if di_class is None:
+            di_class = partial(UnknownDataItem, di_type=di_type)
+        item = _make_item(di_class, values)
+        if isinstance(item, DeviceData) and values and isinstance(values[-1], tuple):
+            dd_type, sequence_num, dd_values = values[-1]
+            dd_class = DeviceData.dd_classes.get(dd_type)
+            if dd_class is None:
+                dd_class = partial(UnknownDeviceDataItem, dd_type=dd_type)
+            item.device_data = _make_item(dd_class, dd_values, item.device_id, sequence_num)
+            del item.data
+        packet.add_data_item(item)
+    return packet
+
+
+def _worker(inbox, outbox, decoder):
+    while True:
+        job = inbox.get()
+        if job is None:
+            break
+        batch, worker, datagrams = job
+        try:
+            results = [decoder(data) for data in datagrams]
+        except Exception as error:  # pylint: disable=broad-except
+            results = error
+        outbox.put((batch, worker, results))
+
+
+class DecodePool():
+    """Decode Pool: Decodes CDP packets in worker processes, each packet routed by the serial number in
+       its header so that every device is always decoded by the same worker.
+
+       Results come back in the order the packets were given, so the packets of each device keep their
+       order. The decoder runs in the workers and must be a picklable, module level function returning
+       a picklable result, decode_values by default."""
+
+    def __init__(self, workers=None, decoder=decode_values, context=None):
+        self.context = multiprocessing.get_context(context)
+        self.workers = workers or os.cpu_count() or 1  # Number of worker processes
+        self.decoder = decoder
+        self.inboxes = [self.context.Queue() for _ in range(self.workers)]
+        self.outbox = self.context.Queue()
+        self.depths = [0] * self.workers  # Number of datagrams sent to each worker and not yet decoded
+        self.processes = []
+        for inbox in self.inboxes:
+            process = self.context.Process(target=_worker, args=(inbox, self.outbox, decoder), daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def worker_of(self, data):
+        """Returns the index of the worker that decodes a packet"""
+        return header_serial(data) % self.workers
+
+    def queue_depths(self):
+        """Returns the number of datagrams waiting to be decoded by each worker"""
+        return list(self.depths)
+
+    def imap(self, datagrams, chunk_size=256, max_pending=None):
+        """Decodes an iterable of datagrams and yields the results in the same order. The datagrams are
+           sent in chunks of chunk_size, with at most max_pending chunks (twice the number of workers
+           by default) in flight at once."""
+        if max_pending is None:
+            max_pending = 2 * self.workers
+        pending = {}  # Chunk number to its [results, indexes per worker, parts remaining]
+        next_chunk = 0
+        datagrams = iter(datagrams)
+
+        for chunk_number in count():
+            chunk = list(islice(datagrams, chunk_size))
+            if not chunk:
+                break
+            parts = [[] for _ in range(self.workers)]
+            indexes = [[] for _ in range(self.workers)]
+            for index, data in enumerate(chunk):
+                worker = self.worker_of(data)
+                parts[worker].append(data)
+                indexes[worker].append(index)
+            remaining = 0
+            for worker, part in enumerate(parts):
+                if part:
+                    self.inboxes[worker].put((chunk_number, worker, part))
+                    self.depths[worker] += len(part)
+                    remaining += 1
+            pending[chunk_number] = [[None] * len(chunk), indexes, remaining]
+
+            while len(pending) >= max_pending:
+                self._collect(pending)
+                next_chunk = yield from self._ready(pending, next_chunk)
+
+        while pending:
+            self._collect(pending)
+            next_chunk = yield from self._ready(pending, next_chunk)
+
+    def map(self, datagrams, chunk_size=256):
+        """Decodes a collection of datagrams and returns the list of results in the same order"""
+        return list(self.imap(datagrams, chunk_size))
+
+    def _collect(self, pending):
+        chunk_number, worker, results = self.outbox.get()
+        if isinstance(results, Exception):
+            raise results
+        chunk = pending[chunk_number]
+        for index, result in zip(chunk[1][worker], results):
+            chunk[0][index] = result
+        self.depths[worker] -= len(results)
+        chunk[2] -= 1
+
+    @staticmethod
+    def _ready(pending, next_chunk):
+        # Yield the finished chunks at the head of the order, returns the next chunk to yield
+        while next_chunk in pending and pending[next_chunk][2] == 0:
+            yield from pending.pop(next_chunk)[0]
+            next_chunk += 1
+        return next_chunk
+
+    def close(self):
+        """Stops the workers once they have decoded every datagram already sent"""
+        for inbox in self.inboxes:
+            inbox.put(None)
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+    def terminate(self):
+        """Stops the workers immediately, discarding the datagrams not yet decoded"""
+        for process in self.processes:
+            process.terminate()
+        for inbox in self.inboxes:
+            inbox.cancel_join_thread()
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
@@ -0,0 +1,176 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import struct
+
+from cdp.aio import open_send_socket
+from cdp.batch_reader import BatchReader
+from cdp.cdp import CDP, CiholasSerialNumber
+
+__all__ = ['Route', 'Proxy', 'filter_packet']
+
+cdp_header_size = CDP.cdp_header_size
+di_header_size = CDP.di_header_size
+
+
+def _splice(data, items, keep):
+    """Returns the packet holding only the data items for which keep(type) is true, built by copying
+       the byte ranges of the kept items after the CDP header. Returns data itself when every item is
+       kept, and None when none is."""
+    ranges = []
+    for di_type, offset, size in items:
+        if keep(di_type):
+            start = offset - di_header_size
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = offset + size
+            else:
+                ranges.append([start, offset + size])
+    if not ranges:
+        return None
+    if len(ranges) == 1 and ranges[0][0] == cdp_header_size and ranges[0][1] == len(data):
+        return data
+    view = memoryview(data)
+    packet = bytearray(view[:cdp_header_size])
+    for start, end in ranges:
+        packet += view[start:end]
+    return packet
+
+
+def _type_filter(include_types, exclude_types):
+    # Returns a callable telling whether a data item type is kept
+    if include_types is not None:
+        include_types = frozenset(include_types)
+        if exclude_types is not None:
+            include_types = include_types - frozenset(exclude_types)
+        return include_types.__contains__
+    if exclude_types is not None:
+        exclude_types = frozenset(exclude_types)
+        return lambda di_type: di_type not in exclude_types
+    return lambda di_type: True
+
+
+def filter_packet(data, include_types=None, exclude_types=None, serial_numbers=None):
+    """Returns a CDP packet holding only the data items of data whose type is in include_types (any by
+       default) and not in exclude_types, without decoding them. Returns None when no data item is
+       kept or the packet serial number is not in serial_numbers. Raises ValueError on invalid packets."""
+    _sequence, serial, items = CDP.peek(data)
+    if serial_numbers is not None and serial not in {CiholasSerialNumber(s).as_int for s in serial_numbers}:
+        return None
+    return _splice(data, items, _type_filter(include_types, exclude_types))
+
+
+class Route():
+    """Route: A target the proxy forwards packets to, with the data item types and serial numbers it
+       receives. Packets left without data items are not forwarded unless forward_empty is set."""
+
+    def __init__(self, target, include_types=None, exclude_types=None, serial_numbers=None, forward_empty=False):
+        self.target = target  # (host, port) the packets are sent to
+        self.keep = _type_filter(include_types, exclude_types)  # Returns whether a data item type is kept
+        self.serial_numbers = None  # Integer serial numbers forwarded, None for any
+        if serial_numbers is not None:
+            self.serial_numbers = frozenset(CiholasSerialNumber(serial).as_int for serial in serial_numbers)
+        self.forward_empty = forward_empty
+        self.forwarded = 0  # Number of packets sent
+        self.filtered = 0  # Number of packets not forwarded because no data item was kept
+        self.send_errors = 0  # Number of packets the socket refused to send
+        self.bytes_in = 0  # Size of the packets considered
+        self.bytes_out = 0  # Size of the packets sent
+
+    @property
+    def stats(self):
+        return dict(forwarded=self.forwarded, filtered=self.filtered, send_errors=self.send_errors,
+                    bytes_in=self.bytes_in, bytes_out=self.bytes_out)
+
+    def filter(self, data, serial, items):
+        """Returns the packet forwarded on this route for data with the given header serial number and
+           peeked data items, None when nothing is forwarded"""
+        self.bytes_in += len(data)
+        if self.serial_numbers is not None and serial not in self.serial_numbers:
+            packet = None
+        else:
+            packet = _splice(data, items, self.keep)
+            if packet is None and self.forward_empty:
+                packet = bytes(data[:cdp_header_size])
+        if packet is None:
+            self.filtered += 1
+        return packet
+
+
+class Proxy():
+    """Proxy: Relays CDP packets from a socket to the targets of several routes, each receiving only its
+       data item types and serial numbers.
+
+       Only the data item headers are read. Filtered packets are rebuilt by copying the byte ranges of
+       their kept data items, and packets whose data items are all kept are forwarded unchanged.
+
+           with Proxy(BatchReader.open(7667, '239.255.76.67'), [Route(('10.0.1.255', 7667), [PositionV3.type])]) as proxy:
+               proxy.run()
+    """
+
+    def __init__(self, reader, routes, sock=None, interface=None, ttl=1, loopback=True):
+        if not isinstance(reader, BatchReader):
+            reader = BatchReader(reader)
+        self.reader = reader  # BatchReader the packets are received from
+        self.routes = list(routes)
+        self.sock = sock
+        self.owns_socket = sock is None  # Whether close() closes the send socket
+        if self.owns_socket:
+            self.sock = open_send_socket(interface, ttl, loopback)
+        self.received = 0  # Number of datagrams relayed
+        self.invalid = 0  # Number of datagrams that are not valid CDP packets
+        self.running = False
+
+    @property
+    def stats(self):
+        return dict(received=self.received, invalid=self.invalid, reader=self.reader.stats,
+                    routes=[route.stats for route in self.routes])
+
+    def forward(self, data):
+        """Forwards one datagram on every route. Returns the number of packets sent."""
+        self.received += 1
+        try:
+            _sequence, serial, items = CDP.peek(data)
+        except (ValueError, struct.error):
+            self.invalid += 1
+            return 0
+        sent = 0
+        for route in self.routes:
+            packet = route.filter(data, serial, items)
+            if packet is None:
+                continue
+            try:
+                self.sock.sendto(packet, route.target)
+            except OSError:
+                route.send_errors += 1
+                continue
+            route.forwarded += 1
+            route.bytes_out += len(packet)
+            sent += 1
+        return sent
+
+    def run(self, timeout=None):
+        """Relays datagrams until stopped, or until none arrives within timeout seconds when set"""
+        self.running = True
+        while self.running:
+            batch = self.reader.read_batch(timeout=timeout)
+            if not batch and timeout is not None:
+                break
+            for data in batch:
+                self.forward(data)
+        self.running = False
+
+    def stop(self):
+        """Stops a proxy running in another thread after its current batch"""
+        self.running = False
+
+    def close(self):
+        self.reader.close()
+        if self.owns_socket:
+            self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,140 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+"""Lazily loaded registry of the data item classes.
+
+   cdp.type_registry lists the type, module and class name of every data item class, and the names each
+   package exports. It is generated from the data item modules and checked in, so that importing cdp
+   only imports the modules of the data items actually used. After adding or changing data item
+   modules, regenerate it with:
+
+       python -m cdp.generate_registry
+
+   and check it is current with python -m cdp.generate_registry --check."""
+
+import importlib
+import sys
+
+from cdp import type_registry
+
+__all__ = ['TypeRegistry', 'load_module', 'lazy_getattr']
+
+loaded_modules = set()  # Names of the data item modules whose classes are registered
+
+
+class TypeRegistry(dict):
+    """Type Registry: Dictionary of the data item classes by type that imports the module of a type
+       listed in cdp.type_registry the first time the type is looked up, registering every class of
+       that module. Iterating the registry imports every module first."""
+
+    def __init__(self, types):
+        super().__init__()
+        self.types = types  # Type to the (module name, class name) of its generated entry
+
+    def __missing__(self, key):
+        entry = self.types.get(key)
+        if entry is None or entry[0] in loaded_modules:
+            raise KeyError(key)
+        load_module(entry[0])
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def load_all(self):
+        """Imports and registers every module listed for this registry"""
+        for module_name, _class_name in self.types.values():
+            load_module(module_name)
+
+    def __iter__(self):
+        self.load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.load_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self.load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+
+def registered_classes(module, base):
+    # Classes of the module, including imported ones, deriving from base by type. When several share a
+    # type, the last by name wins, as classes are registered in name order. Classes that inherit their
+    # type, like the shared unknown data item classes, are not registered.
+    classes = {}
+    for name in sorted(vars(module)):
+        obj = getattr(module, name)
+        if isinstance(obj, type) and issubclass(obj, base) and 'type' in obj.__dict__:
+            classes[obj.type] = obj
+    return classes
+
+
+def _register(module, kind):
+    # Registers the classes of a module. Classes registered before their module was loaded, by the user
+    # or from another module, are kept.
+    if kind == 'data_items':
+        # From the package, which takes them from cdp_private when it is installed
+        from cdp.data_items import CDP, CDPDataItem
+        registry, register, base = CDP.data_item_classes, CDP.register_data_item, CDPDataItem
+    else:
+        from cdp.data_items.data_items import DeviceData
+        from cdp.device_data_items import DeviceDataItem
+        registry, register, base = DeviceData.dd_classes, DeviceData.register_dd_item, DeviceDataItem
+    for di_type, di_class in registered_classes(module, base).items():
+        if not dict.__contains__(registry, di_type):
+            register(di_class)
+
+
+def load_module(module_name):
+    """Imports a data item module listed in cdp.type_registry and registers its classes, once. Returns
+       the module."""
+    module = importlib.import_module(module_name)
+    if module_name not in loaded_modules:
+        loaded_modules.add(module_name)
+        _register(module, type_registry.modules[module_name])
+    return module
+
+
+def lazy_getattr(package_name):
+    """Returns a module __getattr__ for the package that imports the module exporting a name the first
+       time the name is used"""
+    exports = type_registry.exports.get(package_name, {})
+    package = sys.modules[package_name]
+
+    def __getattr__(name):
+        try:
+            module_name = exports[name]
+        except KeyError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(package_name, name)) from None
+        if module_name in type_registry.modules:
+            module = load_module(module_name)
+        else:
+            module = importlib.import_module(module_name)
+        value = getattr(module, name)
+        setattr(package, name, value)
+        return value
+
+    return __getattr__
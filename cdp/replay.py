@@ -0,0 +1,174 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import struct
+import time
+
+from cdp.aio import open_send_socket
+from cdp.cdp import CDP, CiholasSerialNumber
+
+__all__ = ['Replayer']
+
+pack_uint32_into = struct.Struct("<I").pack_into
+unpack_uint32_from = struct.Struct("<I").unpack_from
+sequence_offset = 4  # Offset of the sequence number in the CDP header
+serial_offset = 16  # Offset of the serial number in the CDP header
+spin_time = 0.001  # Time before a send spent spinning instead of sleeping, for sleep inaccuracy
+
+
+def _timed_payloads(stream):
+    # Yields (timestamp or None, payload) from raw payloads, CDP packets, (timestamp, payload) tuples,
+    # or records with timestamp and data fields such as capture and pcap records
+    for entry in stream:
+        if isinstance(entry, (bytes, bytearray, memoryview)):
+            yield None, entry
+        elif isinstance(entry, CDP):
+            yield None, entry.encode()
+        elif hasattr(entry, 'data') and hasattr(entry, 'timestamp'):
+            yield entry.timestamp, entry.data
+        else:
+            timestamp, payload = entry
+            yield timestamp, payload.encode() if isinstance(payload, CDP) else payload
+
+
+class Replayer():
+    """Replayer: Sends a stream of CDP packets to a UDP or multicast target, or to a callback, either
+       keeping their recorded timing scaled by speed, at a fixed rate, or as fast as possible.
+
+       The stream may hold raw payloads, CDP packets, (timestamp, payload) tuples, or records with
+       timestamp and data fields such as those of cdp.capture and cdp.pcap. Packets without a timestamp
+       are sent at rate packets per second, or as fast as possible when rate is not set. A speed of None
+       sends timestamped packets as fast as possible too.
+
+       The serial number of every packet can be replaced, by a fixed serial number or by a mapping or
+       callable from the original serial number as an integer. With sequence_start set, each (rewritten)
+       serial number gets consecutive sequence numbers starting from it."""
+
+    def __init__(self, target=None, callback=None, speed=1.0, rate=None, serial_number=None, sequence_start=None,
+                 sock=None, interface=None, ttl=1, loopback=True):
+        if (target is None) == (callback is None):
+            raise ValueError("Exactly one of target or callback is required")
+        self.target = target  # (host, port) the packets are sent to
+        self.callback = callback  # Callable the packets are passed to instead, as bytes
+        self.speed = speed  # Factor applied to the recorded timing, None to send as fast as possible
+        self.rate = rate  # Packets per second of packets without a timestamp, None for as fast as possible
+        self.serial_number = serial_number
+        self.sequence_start = sequence_start
+        self.sequences = {}  # Next sequence number of each serial number
+        self.running = False
+        self.sock = sock
+        self.owns_socket = target is not None and sock is None  # Whether close() closes the socket
+        if self.owns_socket:
+            self.sock = open_send_socket(interface, ttl, loopback)
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.sent = 0  # Number of packets sent
+        self.dropped = 0  # Number of packets the socket refused to send
+        self.bytes_sent = 0
+        self.elapsed = 0.0  # Seconds spent replaying
+        self.target_rate = None  # Packets per second the replay was scheduled at, None when as fast as possible
+        self.max_lateness = 0.0  # Largest delay of a send past its scheduled time, in seconds
+
+    @property
+    def stats(self):
+        return dict(sent=self.sent, dropped=self.dropped, bytes=self.bytes_sent, elapsed=self.elapsed,
+                    target_rate=self.target_rate,
+                    achieved_rate=self.sent / self.elapsed if self.elapsed > 0 else None,
+                    max_lateness=self.max_lateness)
+
+    def _rewrite(self, payload):
+        if self.serial_number is None and self.sequence_start is None or len(payload) < CDP.cdp_header_size:
+            return payload
+        payload = bytearray(payload)
+        serial, = unpack_uint32_from(payload, serial_offset)
+        if self.serial_number is not None:
+            if callable(self.serial_number):
+                serial = self.serial_number(serial)
+            elif isinstance(self.serial_number, dict):
+                serial = self.serial_number.get(serial, serial)
+            else:
+                serial = self.serial_number
+            serial = CiholasSerialNumber(serial).as_int
+            pack_uint32_into(payload, serial_offset, serial)
+        if self.sequence_start is not None:
+            sequence = self.sequences.get(serial, self.sequence_start)
+            pack_uint32_into(payload, sequence_offset, sequence)
+            self.sequences[serial] = (sequence + 1) & 0xFFFFFFFF
+        return payload
+
+    def _send(self, payload):
+        if self.callback is not None:
+            self.callback(bytes(payload))
+        else:
+            try:
+                self.sock.sendto(payload, self.target)
+            except OSError:
+                # Full send buffer (ENOBUFS, EAGAIN) or unreachable target
+                self.dropped += 1
+                return
+        self.sent += 1
+        self.bytes_sent += len(payload)
+
+    def run(self, stream, limit=None):
+        """Replays the stream, or its first limit packets, and returns the stats"""
+        self._reset_stats()
+        self.running = True
+        clock = time.perf_counter
+        start = clock()
+        first_timestamp = None
+        due = 0.0  # Scheduled send time of the current packet, relative to start
+        last_due = 0.0  # Scheduled send time of the last timestamped packet
+        scheduled = 0  # Number of packets sent on a schedule
+        count = 0
+
+        for timestamp, payload in _timed_payloads(stream):
+            if not self.running or limit is not None and count >= limit:
+                break
+            if timestamp is not None and self.speed:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                due = last_due = (timestamp - first_timestamp) / self.speed
+                scheduled += 1
+            elif timestamp is None and self.rate:
+                due = count / self.rate
+                scheduled += 1
+            else:
+                due = clock() - start
+            count += 1
+
+            # Sleep until shortly before the send time, then spin for precision
+            remaining = start + due - clock()
+            if remaining > spin_time:
+                time.sleep(remaining - spin_time)
+            while clock() - start < due:
+                pass
+            lateness = clock() - start - due
+            if lateness > self.max_lateness:
+                self.max_lateness = lateness
+
+            self._send(self._rewrite(payload))
+
+        self.elapsed = clock() - start
+        if scheduled == count and count:
+            if first_timestamp is None:
+                self.target_rate = self.rate
+            elif last_due > 0:
+                self.target_rate = (count - 1) / last_due
+        self.running = False
+        return self.stats
+
+    def stop(self):
+        """Stops a replay running in another thread after its current packet"""
+        self.running = False
+
+    def close(self):
+        if self.owns_socket:
+            self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
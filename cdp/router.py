@@ -0,0 +1,171 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import asyncio
+import struct
+import time
+
+from cdp.cdp import CDP, CiholasSerialNumber
+
+__all__ = ['Router', 'Subscription']
+
+
+class Subscription():
+    """Subscription: A handler receiving the data items of one type, optionally only those from a set
+       of serial numbers and only those a predicate accepts.
+
+       With serial_source 'item', the serial numbers are matched against the serial_number attribute of
+       the data item, such as the tag of a position, or the serial number of the CDP header for data
+       items without one. With 'header', they are matched against the serial number of the CDP header,
+       the device that sent the packet.
+
+       The handler is either a callable, called with each data item, or an asyncio queue, which the
+       data items are put into without waiting. Items that do not fit in a full queue are dropped."""
+
+    def __init__(self, router, di_type, handler, serial_numbers=None, predicate=None, serial_source='item'):
+        if serial_source not in ('item', 'header'):
+            raise ValueError("serial_source must be 'item' or 'header', not {!r}".format(serial_source))
+        self.router = router
+        self.type = di_type  # Data item type delivered to the handler
+        self.handler = handler
+        self.serial_numbers = None  # Integer serial numbers delivered, None for any
+        if serial_numbers is not None:
+            self.serial_numbers = frozenset(CiholasSerialNumber(serial).as_int for serial in serial_numbers)
+        self.item_serial = serial_source == 'item'  # Whether serial numbers are matched against the data item
+        self.predicate = predicate  # Callable returning whether a data item is delivered, None for all
+        self.is_queue = isinstance(handler, asyncio.Queue)
+        self.delivered = 0  # Number of data items delivered
+        self.rejected = 0  # Number of data items of the type filtered out by serial number or predicate
+        self.dropped = 0  # Number of data items that did not fit in the queue
+        self.total_latency = 0.0  # Sum of the delays from receipt to delivery, in seconds
+        self.max_latency = 0.0  # Largest delay from receipt to delivery, in seconds
+
+    @property
+    def stats(self):
+        return dict(delivered=self.delivered, rejected=self.rejected, dropped=self.dropped,
+                    mean_latency=self.total_latency / self.delivered if self.delivered else None,
+                    max_latency=self.max_latency)
+
+    def _deliver(self, item, received):
+        # Returns whether the item was delivered
+        if self.is_queue:
+            try:
+                self.handler.put_nowait(item)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return False
+        else:
+            self.handler(item)
+        latency = time.perf_counter() - received
+        self.delivered += 1
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+        return True
+
+    def cancel(self):
+        """Removes the subscription from its router"""
+        self.router.unsubscribe(self)
+
+
+class Router():
+    """Router: Dispatches the data items of CDP packets to the handlers subscribed to their type.
+
+       Packets are decoded once for every subscriber, and only data items of a subscribed type are
+       created. A data item is only decoded when a predicate or handler reads its attributes, and is
+       the same object for every handler it is delivered to.
+
+           router = Router()
+           router.subscribe(PositionV3, print, serial_numbers=['01:00AA'])  # Positions of tag 01:00AA
+           router.subscribe(0x0135, queue, serial_numbers=['01:0001'], serial_source='header')
+           router.subscribe(0x0135, queue, predicate=lambda item: item.quality > 10)
+           router.dispatch(data)
+    """
+
+    def __init__(self):
+        self.subscriptions = []
+        self.table = {}  # Data item type to the tuple of its subscriptions
+        self.types = frozenset()  # Subscribed data item types
+        self.packets = 0  # Number of packets dispatched
+        self.invalid = 0  # Number of datagrams that failed to decode
+
+    @property
+    def stats(self):
+        return dict(packets=self.packets, invalid=self.invalid,
+                    subscriptions=[subscription.stats for subscription in self.subscriptions])
+
+    def subscribe(self, di_type, handler, serial_numbers=None, predicate=None, serial_source='item'):
+        """Subscribes a callable or asyncio queue to the data items of a type, given as an integer or a
+           data item class, optionally only with the serial numbers and accepted by the predicate. The
+           serial numbers are those of the data items, or of the CDP header when serial_source is
+           'header' or the data items have none. Returns the Subscription."""
+        di_type = getattr(di_type, 'type', di_type)
+        subscription = Subscription(self, di_type, handler, serial_numbers, predicate, serial_source)
+        self.subscriptions.append(subscription)
+        self._compile()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            self._compile()
+
+    def _compile(self):
+        table = {}
+        for subscription in self.subscriptions:
+            table.setdefault(subscription.type, []).append(subscription)
+        self.table = {di_type: tuple(subscriptions) for di_type, subscriptions in table.items()}
+        self.types = frozenset(self.table)
+
+    def dispatch(self, data, received=None, zero_copy=False):
+        """Decodes a datagram and delivers its subscribed data items. received is the time.perf_counter()
+           time the datagram was received, now by default. Returns the number of deliveries, or None when
+           the datagram is invalid."""
+        if received is None:
+            received = time.perf_counter()
+        try:
+            packet = CDP(data, zero_copy=zero_copy, include_types=self.types)
+        except (ValueError, struct.error):
+            self.invalid += 1
+            return None
+        return self.dispatch_packet(packet, received)
+
+    def dispatch_packet(self, packet, received=None):
+        """Delivers the subscribed data items of a decoded CDP packet. Returns the number of deliveries."""
+        if received is None:
+            received = time.perf_counter()
+        self.packets += 1
+        table = self.table
+        serial = packet.serial_number.as_int
+        deliveries = 0
+        for item in packet.data_items:
+            subscriptions = table.get(item.type)
+            if subscriptions is None:
+                continue
+            for subscription in subscriptions:
+                if (subscription.serial_numbers is not None and
+                        self._serial(item, serial, subscription) not in subscription.serial_numbers) or \
+                   (subscription.predicate is not None and not subscription.predicate(item)):
+                    subscription.rejected += 1
+                    continue
+                if subscription._deliver(item, received):
+                    deliveries += 1
+        return deliveries
+
+    @staticmethod
+    def _serial(item, header_serial, subscription):
+        # Integer serial number a subscription filters the data item on
+        if subscription.item_serial:
+            serial_number = getattr(item, 'serial_number', None)
+            if serial_number is not None:
+                return getattr(serial_number, 'as_int', serial_number)
+        return header_serial
+
+    async def run(self, receiver):
+        """Dispatches every packet or datagram of a cdp.aio.CDPReceiver until it is closed"""
+        async for entry in receiver:
+            if isinstance(entry, CDP):
+                self.dispatch_packet(entry)
+            else:
+                self.dispatch(entry[0])
@@ -0,0 +1,171 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+import struct
+import time
+
+__all__ = ['SequenceTracker']
+
+unpack_header_from = struct.Struct("<II8xI").unpack_from  # Mark, sequence and serial number of a CDP header
+
+# Indexes of the per source state lists
+HIGHEST = 0  # Highest sequence number received
+SEEN = 1  # Bit i set when sequence number HIGHEST - i was received
+VALID = 2  # Number of bits of SEEN tracking sequence numbers since the first packet or the last restart
+RESTART = 3  # Sequence number of a packet far behind HIGHEST that may be the first of a restart, or None
+RECEIVED = 4
+LOST = 5
+DUPLICATES = 6
+REORDERED = 7
+LATE = 8
+RESTARTS = 9
+
+counter_names = ('received', 'lost', 'duplicates', 'reordered', 'late', 'restarts')
+
+
+class SequenceTracker():
+    """Sequence Tracker: Counts lost, duplicated and out of order packets of every source from the
+       sequence and serial numbers of their CDP headers.
+
+       A packet is lost when its sequence number was skipped, and stops being lost if it arrives late
+       within reorder_window packets, in which case it is counted as reordered. Packets further behind,
+       or from before the first packet of the source, are counted as late. Sequence numbers wrap around
+       at 32 bits. A jump forward of more than max_gap is counted as a restart of the source, as is a
+       jump back by more than reorder_window to a sequence number below reorder_window, or followed by
+       a packet continuing from it. Tracking then starts over from the new sequence number."""
+
+    def __init__(self, reorder_window=64, max_gap=1000):
+        self.reorder_window = reorder_window  # Number of sequence numbers behind the highest one remembered
+        self.max_gap = max_gap  # Largest jump forward counted as lost packets instead of a restart
+        self.window_mask = (1 << reorder_window) - 1
+        self.sources = {}  # Serial number to its state list
+        self.invalid = 0  # Number of datagrams without a valid CDP header
+        self.window_start = time.monotonic()
+        self.window_counters = {}  # Counters of every source at the start of the current window
+
+    def update(self, serial, sequence):
+        """Tracks a packet from the source with the integer serial number"""
+        state = self.sources.get(serial)
+        if state is None:
+            self.sources[serial] = [sequence, 1, 1, None, 1, 0, 0, 0, 0, 0]
+            return
+        state[RECEIVED] += 1
+        restart = state[RESTART]
+        state[RESTART] = None
+        delta = (sequence - state[HIGHEST]) & 0xFFFFFFFF
+        if delta == 0:
+            state[DUPLICATES] += 1
+            return
+        if delta <= self.max_gap:
+            # In order, after losing delta - 1 packets
+            state[LOST] += delta - 1
+            state[HIGHEST] = sequence
+            state[SEEN] = ((state[SEEN] << delta) | 1) & self.window_mask
+            state[VALID] = min(state[VALID] + delta, self.reorder_window)
+            return
+        behind = 0x100000000 - delta
+        if behind < state[VALID]:
+            bit = 1 << behind
+            if state[SEEN] & bit:
+                state[DUPLICATES] += 1
+            else:
+                state[SEEN] |= bit
+                state[REORDERED] += 1
+                state[LOST] -= 1
+            return
+        if restart is not None:
+            # Continuing from the packet far behind, which started the restart
+            delta = (sequence - restart) & 0xFFFFFFFF
+            if 0 < delta <= self.max_gap:
+                state[LATE] -= 1
+                self._restart(state, sequence)
+                state[LOST] += delta - 1
+                if delta < self.reorder_window:
+                    state[SEEN] |= 1 << delta
+                state[VALID] = min(delta + 1, self.reorder_window)
+                return
+        if delta < 0x80000000:
+            self._restart(state, sequence)
+        elif behind < self.reorder_window:
+            # From before the first packet of the source or the last restart
+            state[LATE] += 1
+        elif sequence < self.reorder_window:
+            # Sequence numbers starting over
+            self._restart(state, sequence)
+        else:
+            # A single late packet, unless the next packet continues from it
+            state[LATE] += 1
+            state[RESTART] = sequence
+
+    def _restart(self, state, sequence):
+        state[RESTARTS] += 1
+        state[HIGHEST] = sequence
+        state[SEEN] = 1
+        state[VALID] = 1
+
+    def update_header(self, data):
+        """Tracks a packet from the header of its raw data. Returns False when the header is invalid."""
+        try:
+            mark, sequence, serial = unpack_header_from(data)
+        except struct.error:
+            self.invalid += 1
+            return False
+        if mark != 0x3230434C:
+            self.invalid += 1
+            return False
+        self.update(serial, sequence)
+        return True
+
+    def update_packet(self, packet):
+        """Tracks a decoded CDP packet"""
+        self.update(packet.serial_number.as_int, packet.sequence)
+
+    def _counters(self, state):
+        return dict(zip(counter_names, state[RECEIVED:]))
+
+    def snapshot(self):
+        """Returns {serial number: counters} of every source, where the counters are the numbers of
+           packets received, lost, duplicated, reordered, late and source restarts, the highest sequence
+           number and the loss ratio of the packets expected"""
+        snapshot = {}
+        for serial, state in self.sources.items():
+            counters = self._counters(state)
+            counters['highest_sequence'] = state[HIGHEST]
+            expected = state[RECEIVED] - state[DUPLICATES] - state[LATE] + state[LOST]
+            counters['loss_ratio'] = state[LOST] / expected if expected else 0.0
+            snapshot[serial] = counters
+        return snapshot
+
+    def totals(self):
+        """Returns the counters summed over every source"""
+        totals = dict.fromkeys(counter_names, 0)
+        for state in self.sources.values():
+            for name, value in zip(counter_names, state[RECEIVED:]):
+                totals[name] += value
+        return totals
+
+    def window(self, now=None):
+        """Returns {serial number: counters per second} since the previous call, or since the tracker
+           was created, and starts a new window"""
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self.window_start
+        rates = {}
+        counters = {}
+        for serial, state in self.sources.items():
+            current = state[RECEIVED:]
+            previous = self.window_counters.get(serial, (0,) * len(current))
+            if elapsed > 0:
+                rates[serial] = {name: (value - start) / elapsed
+                                 for name, value, start in zip(counter_names, current, previous)}
+            counters[serial] = current
+        self.window_start = now
+        self.window_counters = counters
+        return rates
+
+    def reset(self):
+        self.sources.clear()
+        self.window_counters = {}
+        self.window_start = time.monotonic()
+        self.invalid = 0
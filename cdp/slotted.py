@@ -0,0 +1,186 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+from cdp.cdp import CDP, CDPDataItem, _decode_quietly
+from cdp.device_data_items import DeviceDataItem
+
+__all__ = ['make_slotted_class', 'use_slotted_data_items']
+
+# Instance attributes set by the CDPDataItem and DeviceDataItem constructors
+cdp_header_names = ('packet_context', 'di_size', 'di_buffer', 'di_offset')
+dd_header_names = ('header_device_id', 'header_sequence_num', 'ddi_size', 'ddi_buffer', 'ddi_offset')
+
+# Generated classes, keyed by the class they were generated from
+slotted_classes = {}
+
+
+def _decode_values(self, buffer, offset, end):
+    """Decodes the data attributes of a slotted data item into its slots"""
+    definition = self.definition
+    compiled = self.compiled_definition
+    if compiled is not None and compiled.definition is definition and end - offset >= compiled.size:
+        for name, value in zip(compiled.names, compiled.unpack_from(buffer, offset)):
+            setattr(self, name, value)
+        offset += compiled.size
+        definition = compiled.remaining
+    if definition:
+        view = memoryview(buffer)
+        for attr in definition:
+            value, size = attr._decode(view[offset:end])
+            offset += size
+            setattr(self, attr.name, value)
+
+
+def _getattr(self, key):
+    # Only called for empty slots and missing attributes
+    try:
+        attr = self.slot_attributes[key]
+    except KeyError:
+        # Raise appropriately formatted attribute error
+        return object.__getattribute__(self, key)
+
+    if self._undecoded():
+        if getattr(self, 'packet_context', CDPDataItem.packet_context).verbose:
+            self._decode()
+        else:
+            _decode_quietly(self)
+        return getattr(self, key)
+
+    # Constructed data item: fill in the default value of this attribute only
+    value = list(attr.default) if attr.is_list else attr.default
+    setattr(self, key, value)
+    return value
+
+
+def _reduce(self):
+    # Pickle as the class the slotted class was generated from, along with the filled slots
+    state = {}
+    for name in self.__slots__:
+        try:
+            state[name] = object.__getattribute__(self, name)
+        except AttributeError:
+            pass
+    return (_unpickle, (self.slotted_from, state))
+
+
+def _unpickle(item_class, state):
+    slotted_class = make_slotted_class(item_class)
+    item = slotted_class.__new__(slotted_class)
+    for key, value in state.items():
+        setattr(item, key, value)
+    return item
+
+
+def _cdp_init(self, di_data=None, di_offset=0, di_size=None, **kwargs):
+    # The slot hides the class default of the packet context, so it is always filled
+    self.packet_context = CDPDataItem.packet_context
+    if di_size is None:
+        di_size = 0 if di_data is None else len(di_data) - di_offset
+    self.di_size = di_size
+    self.di_buffer = di_data
+    self.di_offset = di_offset
+
+    # If present, set Data Item attributes from keyword arguments
+    for key, value in kwargs.items():
+        setattr(self, key, value)
+
+
+def _cdp_decode(self):
+    _decode_values(self, self.di_buffer, self.di_offset, self.di_offset + self.di_size)
+    self.di_buffer = None
+
+
+def _cdp_undecoded(self):
+    return self.di_buffer is not None
+
+
+def _dd_init(self, device_serial, sequence_num, ddi_data=None, ddi_offset=0, ddi_size=None):
+    self.header_device_id = device_serial
+    self.header_sequence_num = sequence_num
+    if ddi_size is None:
+        ddi_size = 0 if ddi_data is None else len(ddi_data) - ddi_offset
+    self.ddi_size = ddi_size
+    self.ddi_buffer = ddi_data
+    self.ddi_offset = ddi_offset
+
+
+def _dd_decode(self):
+    _decode_values(self, self.ddi_buffer, self.ddi_offset, self.ddi_offset + self.ddi_size)
+    self.ddi_buffer = None
+
+
+def _dd_undecoded(self):
+    return self.ddi_buffer is not None
+
+
+def _class_namespace(item_class, slot_names):
+    # Methods and class attributes of the class and its bases, the most derived first, without the
+    # instance dictionary and the class attributes the slots replace
+    namespace = {}
+    for cls in reversed(item_class.__mro__[:-1]):
+        namespace.update(cls.__dict__)
+    for name in ('__dict__', '__weakref__', '__init_subclass__') + slot_names:
+        namespace.pop(name, None)
+    return namespace
+
+
+def make_slotted_class(item_class):
+    """Returns a class with the methods of a CDPDataItem or DeviceDataItem class that stores its header
+       fields and data attributes in __slots__, without an instance dictionary. The first access to an
+       attribute of a received item decodes every attribute at once, after which reads go straight to
+       the slots. Constructed items fill in the default value of an attribute the first time it is read.
+
+       As a subclass would inherit the instance dictionary, the class is built from the methods of the
+       class and its bases instead. Its instances report the original class as __class__, so that
+       isinstance checks against the original class and its bases still hold, but issubclass checks of
+       the slotted class do not. slotted_from is the original class.
+
+       Classes that override _decode store their attributes themselves and are returned unchanged."""
+
+    if item_class in slotted_classes:
+        return slotted_classes[item_class]
+
+    if issubclass(item_class, CDPDataItem):
+        base, header_names = CDPDataItem, cdp_header_names
+        overrides = dict(__init__=_cdp_init, _decode=_cdp_decode, _undecoded=_cdp_undecoded)
+    elif issubclass(item_class, DeviceDataItem):
+        base, header_names = DeviceDataItem, dd_header_names
+        overrides = dict(__init__=_dd_init, _decode=_dd_decode, _undecoded=_dd_undecoded)
+    else:
+        raise TypeError("Expected a CDPDataItem or DeviceDataItem class, got {}".format(item_class))
+
+    # Methods generated by cdp.codegen stand in for the base _decode, which the slots replace as well
+    decode = getattr(item_class._decode, 'generated_from', item_class._decode)
+    if decode is not base._decode or '__slots__' in item_class.__dict__:
+        slotted_classes[item_class] = item_class
+        return item_class
+
+    slot_names = header_names + tuple(attr.name for attr in item_class.definition)
+    namespace = _class_namespace(item_class, slot_names)
+    namespace.update(overrides)
+    namespace.update(__slots__=slot_names,
+                     __getattr__=_getattr,
+                     __reduce__=_reduce,
+                     __class__=property(lambda self: item_class),
+                     slotted_from=item_class,
+                     __module__=item_class.__module__,
+                     __qualname__=item_class.__qualname__,
+                     __doc__=item_class.__doc__,
+                     slot_attributes={attr.name: attr for attr in item_class.definition})
+
+    # Keep the original class name so di_name and printed output are unchanged
+    slotted_class = type(item_class.__name__, (), namespace)
+    slotted_classes[item_class] = slotted_class
+    return slotted_class
+
+
+def use_slotted_data_items():
+    """Replaces every registered CDP data item and device data item class with its slotted version,
+       so packets decoded from then on create slotted data items."""
+    from cdp.data_items.data_items import DeviceData
+
+    for di_type, di_class in list(CDP.data_item_classes.items()):
+        CDP.data_item_classes[di_type] = make_slotted_class(di_class)
+    for dd_type, dd_class in list(DeviceData.dd_classes.items()):
+        DeviceData.dd_classes[dd_type] = make_slotted_class(dd_class)
@@ -0,0 +1,92 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# pylint: disable=trailing-whitespace, too-few-public-methods
+
+from functools import partial
+import struct
+
+from cdp.cdp import CDP, CiholasSerialNumber, DataItemAttribute
+
+__all__ = ['CDPTemplate']
+
+pack_uint32_into = struct.Struct("<I").pack_into
+
+
+class CDPTemplate():
+    """CDP Template: Pre-encoded CDP packet whose header and data item fields are patched in place"""
+
+    sequence_offset = 4  # Offset of the sequence number in the CDP header
+    serial_number_offset = 16  # Offset of the serial number in the CDP header
+
+    def __init__(self, packet):
+        self.buffer = bytearray(packet.encoded_size())  # Encoded packet, ready to be sent
+        packet._encode_into(self.buffer, 0)
+        self.sequence = packet.sequence
+        self.item_classes = []  # Class of each data item, in packet order
+        self.fields = []  # Attribute name to its (offset, attribute) in the buffer, for each data item
+
+        offset = CDP.cdp_header_size
+        for item in packet.data_items:
+            self.item_classes.append(type(item))
+            self.fields.append(self._item_fields(item, offset + CDP.di_header_size))
+            offset += item._encoded_size()
+
+    @classmethod
+    def from_classes(cls, item_classes, serial_number=0, sequence=0):
+        """Returns a template of a packet holding one default data item of each class"""
+        packet = CDP(serial_number=serial_number)
+        packet.sequence = sequence
+        packet.add_data_items(item_class() for item_class in item_classes)
+        return cls(packet)
+
+    @staticmethod
+    def _item_fields(item, offset):
+        # Only the leading fixed size attributes have an offset that does not depend on the values
+        fields = {}
+        for attr in item.definition:
+            if attr.is_list or attr.size < 0:
+                break
+            fields[attr.name] = (offset, attr)
+            offset += attr.size
+        return fields
+
+    def __len__(self):
+        return len(self.fields)
+
+    def set_sequence(self, sequence):
+        self.sequence = sequence
+        pack_uint32_into(self.buffer, self.sequence_offset, sequence)
+
+    def next_sequence(self):
+        """Increments the sequence number, wrapping at 32 bits, and returns it"""
+        self.set_sequence((self.sequence + 1) & 0xFFFFFFFF)
+        return self.sequence
+
+    def set_serial_number(self, serial_number):
+        pack_uint32_into(self.buffer, self.serial_number_offset, CiholasSerialNumber(serial_number).as_int)
+
+    def set_field(self, index, name, value):
+        """Sets an attribute of the data item at index. Only the leading fixed size attributes of a
+           data item can be set."""
+        offset, attr = self._field(index, name)
+        attr._encode_into(self.buffer, offset, value)
+
+    def set_fields(self, index, **values):
+        for name, value in values.items():
+            self.set_field(index, name, value)
+
+    def setter(self, index, name):
+        """Returns a callable that sets an attribute of the data item at index, for use in tight loops"""
+        offset, attr = self._field(index, name)
+        if type(attr)._encode_into is DataItemAttribute._encode_into:
+            return partial(attr.struct.pack_into, self.buffer, offset)
+        return partial(attr._encode_into, self.buffer, offset)
+
+    def _field(self, index, name):
+        try:
+            return self.fields[index][name]
+        except KeyError:
+            raise KeyError("{} has no fixed offset attribute '{}'".format(self.item_classes[index].__name__, name)) from None
+
+    def encode(self):
+        return bytes(self.buffer)
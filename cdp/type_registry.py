@@ -0,0 +1,511 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+# Generated by python -m cdp.generate_registry, do not edit
+
+# Data item module to the kind of classes it registers
+modules = {'cdp.data_items.data_items': 'data_items', 'cdp.device_data_items': 'device_data_items'}
+
+# CDP data item type to (module, class name)
+data_item_types = {
+    0x0001: ('cdp.data_items.data_items', 'MPUAccelerometerV1'),
+    0x0002: ('cdp.data_items.data_items', 'MPUGyroscopeV1'),
+    0x0003: ('cdp.data_items.data_items', 'MPUMagnetometerV1'),
+    0x0005: ('cdp.data_items.data_items', 'LPSPressureV1'),
+    0x0006: ('cdp.data_items.data_items', 'LPSTemperatureV1'),
+    0x0007: ('cdp.data_items.data_items', 'UserDefinedV1'),
+    0x0008: ('cdp.data_items.data_items', 'MPUAccelerometerV2'),
+    0x0009: ('cdp.data_items.data_items', 'MPUGyroscopeV2'),
+    0x000A: ('cdp.data_items.data_items', 'MPUQuaternionV2'),
+    0x00FD: ('cdp.data_items.data_items', 'LogMessageV1'),
+    0x0100: ('cdp.data_items.data_items', 'PositionV1'),
+    0x0101: ('cdp.data_items.data_items', 'DistanceV1'),
+    0x0102: ('cdp.data_items.data_items', 'InfrastructureV1'),
+    0x0103: ('cdp.data_items.data_items', 'AnchorStatusV1'),
+    0x0104: ('cdp.data_items.data_items', 'AnnouncementStatusV1'),
+    0x0105: ('cdp.data_items.data_items', 'AnchorPositionStatusV1'),
+    0x0106: ('cdp.data_items.data_items', 'AnchorHealthV1'),
+    0x0107: ('cdp.data_items.data_items', 'InfrastructureV2'),
+    0x0108: ('cdp.data_items.data_items', 'NodeStatusChangeV1'),
+    0x010C: ('cdp.data_items.data_items', 'DeliverUserDataV1'),
+    0x010D: ('cdp.data_items.data_items', 'NodeStatusChangeV2'),
+    0x010E: ('cdp.data_items.data_items', 'AnchorPositionStatusV2'),
+    0x010F: ('cdp.data_items.data_items', 'AnchorHealthV2'),
+    0x0110: ('cdp.data_items.data_items', 'InfrastructureV3'),
+    0x0111: ('cdp.data_items.data_items', 'InfrastructureV4'),
+    0x0112: ('cdp.data_items.data_items', 'TWRV1'),
+    0x011A: ('cdp.data_items.data_items', 'CDPStreamInformation'),
+    0x011B: ('cdp.data_items.data_items', 'HostnameAnnounce'),
+    0x011C: ('cdp.data_items.data_items', 'InstanceAnnounce'),
+    0x0121: ('cdp.data_items.data_items', 'AppSettingsChunk'),
+    0x0123: ('cdp.data_items.data_items', 'SetMagnetometerCalibration'),
+    0x0124: ('cdp.data_items.data_items', 'AnchorHealthV3'),
+    0x0125: ('cdp.data_items.data_items', 'AnchorHealthV4'),
+    0x0126: ('cdp.data_items.data_items', 'MagnetometerCalibrationResponse'),
+    0x0127: ('cdp.data_items.data_items', 'DistanceV2'),
+    0x0128: ('cdp.data_items.data_items', 'DeviceStatus'),
+    0x0129: ('cdp.data_items.data_items', 'AccelerometerV1'),
+    0x012A: ('cdp.data_items.data_items', 'GyroscopeV1'),
+    0x012B: ('cdp.data_items.data_items', 'MagnetometerV1'),
+    0x012C: ('cdp.data_items.data_items', 'PressureV1'),
+    0x012D: ('cdp.data_items.data_items', 'QuaternionV1'),
+    0x012E: ('cdp.data_items.data_items', 'TemperatureV1'),
+    0x012F: ('cdp.data_items.data_items', 'PositionV2'),
+    0x0130: ('cdp.data_items.data_items', 'GyroscopeCalibration'),
+    0x0131: ('cdp.data_items.data_items', 'RstpReport'),
+    0x0135: ('cdp.data_items.data_items', 'PositionV3'),
+    0x0136: ('cdp.data_items.data_items', 'AnchorPositionStatusV3'),
+    0x0137: ('cdp.data_items.data_items', 'DeviceActivityState'),
+    0x0138: ('cdp.data_items.data_items', 'DeviceHardwareStatusV2'),
+    0x0139: ('cdp.data_items.data_items', 'AccelerometerV2'),
+    0x013A: ('cdp.data_items.data_items', 'GyroscopeV2'),
+    0x013B: ('cdp.data_items.data_items', 'MagnetometerV2'),
+    0x013C: ('cdp.data_items.data_items', 'PressureV2'),
+    0x013D: ('cdp.data_items.data_items', 'QuaternionV2'),
+    0x013E: ('cdp.data_items.data_items', 'TemperatureV2'),
+    0x013F: ('cdp.data_items.data_items', 'DeviceNames'),
+    0x0140: ('cdp.data_items.data_items', 'Synchronization'),
+    0x0141: ('cdp.data_items.data_items', 'RoleReport'),
+    0x0142: ('cdp.data_items.data_items', 'DirectCommand'),
+    0x0148: ('cdp.data_items.data_items', 'UserDefinedV2'),
+    0x0149: ('cdp.data_items.data_items', 'NetworkTime'),
+    0x014A: ('cdp.data_items.data_items', 'AnchorHealthV5'),
+    0x014C: ('cdp.data_items.data_items', 'GlobalPingTimingReportV1'),
+    0x0157: ('cdp.data_items.data_items', 'TopologyInfo'),
+    0x0158: ('cdp.data_items.data_items', 'PtpInfo'),
+    0x015A: ('cdp.data_items.data_items', 'NtRealTimeMappingV1'),
+    0x015B: ('cdp.data_items.data_items', 'SetPersistentProperty'),
+    0x015C: ('cdp.data_items.data_items', 'GetPersistentPropertyValue'),
+    0x015D: ('cdp.data_items.data_items', 'GetPersistentPropertyList'),
+    0x015E: ('cdp.data_items.data_items', 'GetPersistentPropertyValueResponse'),
+    0x015F: ('cdp.data_items.data_items', 'GetPersistentPropertyListResponse'),
+    0x0160: ('cdp.data_items.data_items', 'BootloadProgress'),
+    0x0161: ('cdp.data_items.data_items', 'AnchorPositionStatusV4'),
+    0x0163: ('cdp.data_items.data_items', 'LinkMDStatus'),
+    0x0164: ('cdp.data_items.data_items', 'PolarCoordinatesV1'),
+    0x0165: ('cdp.data_items.data_items', 'PoeSystemStats'),
+    0x016A: ('cdp.data_items.data_items', 'BoundingBoxReport'),
+    0x016B: ('cdp.data_items.data_items', 'BoundingCylinderReport'),
+    0x0171: ('cdp.data_items.data_items', 'ImageDiscoveryV2'),
+    0x0173: ('cdp.data_items.data_items', 'PoeSystemStatsV2'),
+    0x0176: ('cdp.data_items.data_items', 'BoundaryStatus'),
+    0x0177: ('cdp.data_items.data_items', 'PositionlessBoundaryStatus'),
+    0x0178: ('cdp.data_items.data_items', 'QuaternionV3'),
+    0x0179: ('cdp.data_items.data_items', 'UserDefinedV3'),
+    0x017A: ('cdp.data_items.data_items', 'AccelerometerV3'),
+    0x017B: ('cdp.data_items.data_items', 'GyroscopeV3'),
+    0x017C: ('cdp.data_items.data_items', 'MagnetometerV3'),
+    0x017D: ('cdp.data_items.data_items', 'CommandWindowUsageReport'),
+    0x8009: ('cdp.data_items.data_items', 'ImageDiscoveryV1'),
+    0x802C: ('cdp.data_items.data_items', 'TimedRxV5'),
+    0x802D: ('cdp.data_items.data_items', 'TickV4'),
+    0x802F: ('cdp.data_items.data_items', 'PingV5'),
+    0x803D: ('cdp.data_items.data_items', 'SetDiagnosticLED'),
+    0x8042: ('cdp.data_items.data_items', 'DeviceData'),
+    0x80B2: ('cdp.data_items.data_items', 'TickV5'),
+    0x80B3: ('cdp.data_items.data_items', 'TimedRxV6'),
+    0x80C0: ('cdp.data_items.data_items', 'DeviceColor'),
+    0x80D4: ('cdp.data_items.data_items', 'DeviceStatusV3'),
+    0x80DA: ('cdp.data_items.data_items', 'ClearDeviceColor'),
+    0x80DB: ('cdp.data_items.data_items', 'GeofencerZoneInfo'),
+    0x80DC: ('cdp.data_items.data_items', 'TagZoneInfo'),
+    0x80DD: ('cdp.data_items.data_items', 'DrawPrism'),
+    0x80DE: ('cdp.data_items.data_items', 'ClearObject'),
+    0xFFFF: ('cdp.data_items.data_items', 'CDPDataItem'),
+}
+
+# Device data item type to (module, class name)
+device_data_item_types = {
+    0x01: ('cdp.device_data_items', 'VersionStringResponse'),
+    0x03: ('cdp.device_data_items', 'MagnetometerCalibrationResponse'),
+    0x04: ('cdp.device_data_items', 'DeviceStatus'),
+    0x06: ('cdp.device_data_items', 'GyroscopeCalibrationResponse'),
+    0x07: ('cdp.device_data_items', 'PersistentPropertyGetTypesResponse'),
+    0x08: ('cdp.device_data_items', 'PersistentPropertyGetPropertyResponse'),
+    0x09: ('cdp.device_data_items', 'BootloaderStatus'),
+    0x0A: ('cdp.device_data_items', 'WifiCredentialResponse'),
+    0x0B: ('cdp.device_data_items', 'UserData'),
+    0x0C: ('cdp.device_data_items', 'UserDataWithTimestamp'),
+    0x0D: ('cdp.device_data_items', 'DeviceStatusV2'),
+    0x0E: ('cdp.device_data_items', 'DeviceDataDeviceAttributesResponse'),
+    0xFF: ('cdp.device_data_items', 'DeviceDataItem'),
+}
+
+# Package to the module each of its exported names comes from
+exports = {'cdp': {'AccelerometerV1': 'cdp.data_items',
+         'AccelerometerV2': 'cdp.data_items',
+         'AccelerometerV3': 'cdp.data_items',
+         'AnchorHealthV1': 'cdp.data_items',
+         'AnchorHealthV2': 'cdp.data_items',
+         'AnchorHealthV3': 'cdp.data_items',
+         'AnchorHealthV4': 'cdp.data_items',
+         'AnchorHealthV5': 'cdp.data_items',
+         'AnchorPositionStatusV1': 'cdp.data_items',
+         'AnchorPositionStatusV2': 'cdp.data_items',
+         'AnchorPositionStatusV3': 'cdp.data_items',
+         'AnchorPositionStatusV4': 'cdp.data_items',
+         'AnchorStatusV1': 'cdp.data_items',
+         'AnnouncementStatusV1': 'cdp.data_items',
+         'AppSettingsChunk': 'cdp.data_items',
+         'BootloadProgress': 'cdp.data_items',
+         'BootloaderStatus': 'cdp.device_data_items',
+         'BoundaryStatus': 'cdp.data_items',
+         'BoundingBoxReport': 'cdp.data_items',
+         'BoundingCylinderReport': 'cdp.data_items',
+         'CDP': 'cdp.data_items',
+         'CDPDataItem': 'cdp.data_items',
+         'CDPStreamInformation': 'cdp.data_items',
+         'CiholasSerialNumber': 'cdp.device_data_items',
+         'CiholasSerialNumberArray': 'cdp.data_items',
+         'ClearDeviceColor': 'cdp.data_items',
+         'ClearObject': 'cdp.data_items',
+         'ColumnProjection': 'cdp.data_items',
+         'CommandWindowUsageReport': 'cdp.data_items',
+         'CompiledDefinition': 'cdp.data_items',
+         'DECODE_BAD_MARK': 'cdp.data_items',
+         'DECODE_BAD_SIZE': 'cdp.data_items',
+         'DECODE_BAD_STRING': 'cdp.data_items',
+         'DECODE_OK': 'cdp.data_items',
+         'DECODE_TRAILING_BYTES': 'cdp.data_items',
+         'DECODE_TRUNCATED_ITEM': 'cdp.data_items',
+         'DECODE_UNKNOWN_TYPE': 'cdp.data_items',
+         'DIBoolAttr': 'cdp.device_data_items',
+         'DICondensedSignalStrengthAttr': 'cdp.device_data_items',
+         'DIDoubleAttr': 'cdp.device_data_items',
+         'DIFixedLengthBytesAttr': 'cdp.device_data_items',
+         'DIFixedLengthStrAttr': 'cdp.device_data_items',
+         'DIFloatAttr': 'cdp.device_data_items',
+         'DIInt16Attr': 'cdp.device_data_items',
+         'DIInt32Attr': 'cdp.device_data_items',
+         'DIInt64Attr': 'cdp.device_data_items',
+         'DIInt8Attr': 'cdp.device_data_items',
+         'DIListAttr': 'cdp.device_data_items',
+         'DIRxStatsAttribute': 'cdp.device_data_items',
+         'DISerialNumberAttr': 'cdp.device_data_items',
+         'DISerialNumberListAttr': 'cdp.device_data_items',
+         'DISignalStrengthAttr': 'cdp.device_data_items',
+         'DIUInt16Attr': 'cdp.device_data_items',
+         'DIUInt16ListAttr': 'cdp.device_data_items',
+         'DIUInt32Attr': 'cdp.device_data_items',
+         'DIUInt32ListAttr': 'cdp.device_data_items',
+         'DIUInt64Attr': 'cdp.device_data_items',
+         'DIUInt8Attr': 'cdp.device_data_items',
+         'DIVariableLengthBytesAttr': 'cdp.device_data_items',
+         'DIVariableLengthStrAttr': 'cdp.device_data_items',
+         'DataItemAttribute': 'cdp.data_items',
+         'DecodeErrors': 'cdp.data_items',
+         'DeliverUserDataV1': 'cdp.data_items',
+         'DeviceActivityState': 'cdp.data_items',
+         'DeviceColor': 'cdp.data_items',
+         'DeviceData': 'cdp.data_items',
+         'DeviceDataDeviceAttributesResponse': 'cdp.device_data_items',
+         'DeviceDataItem': 'cdp.device_data_items',
+         'DeviceHardwareStatusV2': 'cdp.data_items',
+         'DeviceNames': 'cdp.data_items',
+         'DeviceStatus': 'cdp.device_data_items',
+         'DeviceStatusV2': 'cdp.device_data_items',
+         'DeviceStatusV3': 'cdp.data_items',
+         'DirectCommand': 'cdp.data_items',
+         'DistanceV1': 'cdp.data_items',
+         'DistanceV2': 'cdp.data_items',
+         'DrawPrism': 'cdp.data_items',
+         'ErrorPattern': 'cdp.data_items',
+         'FullDeviceID': 'cdp.data_items',
+         'GeofencerZoneInfo': 'cdp.data_items',
+         'GetPersistentPropertyList': 'cdp.data_items',
+         'GetPersistentPropertyListResponse': 'cdp.data_items',
+         'GetPersistentPropertyValue': 'cdp.data_items',
+         'GetPersistentPropertyValueResponse': 'cdp.data_items',
+         'GlobalPingTimingReportV1': 'cdp.data_items',
+         'GyroscopeCalibration': 'cdp.data_items',
+         'GyroscopeCalibrationResponse': 'cdp.device_data_items',
+         'GyroscopeV1': 'cdp.data_items',
+         'GyroscopeV2': 'cdp.data_items',
+         'GyroscopeV3': 'cdp.data_items',
+         'HostnameAnnounce': 'cdp.data_items',
+         'Image': 'cdp.data_items',
+         'ImageDiscoveryV1': 'cdp.data_items',
+         'ImageDiscoveryV2': 'cdp.data_items',
+         'ImageNotificationV2': 'cdp.data_items',
+         'ImageV2': 'cdp.data_items',
+         'InfrastructureV1': 'cdp.data_items',
+         'InfrastructureV2': 'cdp.data_items',
+         'InfrastructureV3': 'cdp.data_items',
+         'InfrastructureV4': 'cdp.data_items',
+         'InstanceAnnounce': 'cdp.data_items',
+         'InterfaceRxStatsV1': 'cdp.device_data_items',
+         'LEDStates': 'cdp.data_items',
+         'LPSPressureV1': 'cdp.data_items',
+         'LPSTemperatureV1': 'cdp.data_items',
+         'LinkMDStatus': 'cdp.data_items',
+         'LogMessageV1': 'cdp.data_items',
+         'MPUAccelerometerV1': 'cdp.data_items',
+         'MPUAccelerometerV2': 'cdp.data_items',
+         'MPUGyroscopeV1': 'cdp.data_items',
+         'MPUGyroscopeV2': 'cdp.data_items',
+         'MPUMagnetometerV1': 'cdp.data_items',
+         'MPUQuaternionV2': 'cdp.data_items',
+         'MagnetometerCalibrationResponse': 'cdp.device_data_items',
+         'MagnetometerV1': 'cdp.data_items',
+         'MagnetometerV2': 'cdp.data_items',
+         'MagnetometerV3': 'cdp.data_items',
+         'NetworkTime': 'cdp.data_items',
+         'NodeStatusChangeV1': 'cdp.data_items',
+         'NodeStatusChangeV2': 'cdp.data_items',
+         'NtRealTimeMappingV1': 'cdp.data_items',
+         'PacketContext': 'cdp.data_items',
+         'PersistentPropertyGetPropertyResponse': 'cdp.device_data_items',
+         'PersistentPropertyGetTypesResponse': 'cdp.device_data_items',
+         'PingV5': 'cdp.data_items',
+         'PoeSystemStats': 'cdp.data_items',
+         'PoeSystemStatsV2': 'cdp.data_items',
+         'PolarCoordinatesV1': 'cdp.data_items',
+         'PortInfo': 'cdp.data_items',
+         'PositionAnchorStatusStructure': 'cdp.data_items',
+         'PositionAnchorStatusStructureV4': 'cdp.data_items',
+         'PositionV1': 'cdp.data_items',
+         'PositionV2': 'cdp.data_items',
+         'PositionV3': 'cdp.data_items',
+         'PositionlessBoundaryStatus': 'cdp.data_items',
+         'PressureV1': 'cdp.data_items',
+         'PressureV2': 'cdp.data_items',
+         'PtpInfo': 'cdp.data_items',
+         'QuaternionV1': 'cdp.data_items',
+         'QuaternionV2': 'cdp.data_items',
+         'QuaternionV3': 'cdp.data_items',
+         'RoleReport': 'cdp.data_items',
+         'RstpReport': 'cdp.data_items',
+         'SetDiagnosticLED': 'cdp.data_items',
+         'SetMagnetometerCalibration': 'cdp.data_items',
+         'SetPersistentProperty': 'cdp.data_items',
+         'Synchronization': 'cdp.data_items',
+         'TWRV1': 'cdp.data_items',
+         'TagZoneInfo': 'cdp.data_items',
+         'TemperatureV1': 'cdp.data_items',
+         'TemperatureV2': 'cdp.data_items',
+         'TickV4': 'cdp.data_items',
+         'TickV5': 'cdp.data_items',
+         'TimedRxV5': 'cdp.data_items',
+         'TimedRxV6': 'cdp.data_items',
+         'TopologyInfo': 'cdp.data_items',
+         'UNKNOWN_DROP': 'cdp.data_items',
+         'UNKNOWN_KEEP': 'cdp.data_items',
+         'UNKNOWN_RAISE': 'cdp.data_items',
+         'UWBCondensedSignalStrength': 'cdp.device_data_items',
+         'UWBNetworkCommand': 'cdp.data_items',
+         'UWBSignalStrength': 'cdp.device_data_items',
+         'UnknownDataItem': 'cdp.data_items',
+         'UnknownDataItemError': 'cdp.data_items',
+         'UnknownDeviceDataItem': 'cdp.device_data_items',
+         'UnknownTypes': 'cdp.data_items',
+         'UserData': 'cdp.device_data_items',
+         'UserDataWithTimestamp': 'cdp.device_data_items',
+         'UserDefinedV1': 'cdp.data_items',
+         'UserDefinedV2': 'cdp.data_items',
+         'UserDefinedV3': 'cdp.data_items',
+         'VersionStringResponse': 'cdp.device_data_items',
+         'WifiCredentialResponse': 'cdp.device_data_items',
+         'XyCoordinate': 'cdp.data_items',
+         'array': 'cdp.data_items',
+         'attrgetter': 'cdp.data_items',
+         'decode_error_kinds': 'cdp.data_items',
+         'defaultdict': 'cdp.data_items',
+         'deque': 'cdp.data_items',
+         'log10': 'cdp.data_items',
+         'namedtuple': 'cdp.data_items',
+         'nullstrip': 'cdp.data_items',
+         'pack_cdp_header_into': 'cdp.data_items',
+         'pack_data_header_into': 'cdp.data_items',
+         'pack_uint_array_into': 'cdp.data_items',
+         'struct': 'cdp.device_data_items',
+         'swap_bytes': 'cdp.data_items',
+         'sys': 'cdp.data_items',
+         'uint32_typecode': 'cdp.data_items',
+         'unpack_cdp_header': 'cdp.data_items',
+         'unpack_cdp_header_from': 'cdp.data_items',
+         'unpack_data_header': 'cdp.data_items',
+         'unpack_data_header_from': 'cdp.data_items',
+         'unpack_uint_array': 'cdp.data_items'},
+ 'cdp.data_items': {'AccelerometerV1': 'cdp.data_items.data_items',
+                    'AccelerometerV2': 'cdp.data_items.data_items',
+                    'AccelerometerV3': 'cdp.data_items.data_items',
+                    'AnchorHealthV1': 'cdp.data_items.data_items',
+                    'AnchorHealthV2': 'cdp.data_items.data_items',
+                    'AnchorHealthV3': 'cdp.data_items.data_items',
+                    'AnchorHealthV4': 'cdp.data_items.data_items',
+                    'AnchorHealthV5': 'cdp.data_items.data_items',
+                    'AnchorPositionStatusV1': 'cdp.data_items.data_items',
+                    'AnchorPositionStatusV2': 'cdp.data_items.data_items',
+                    'AnchorPositionStatusV3': 'cdp.data_items.data_items',
+                    'AnchorPositionStatusV4': 'cdp.data_items.data_items',
+                    'AnchorStatusV1': 'cdp.data_items.data_items',
+                    'AnnouncementStatusV1': 'cdp.data_items.data_items',
+                    'AppSettingsChunk': 'cdp.data_items.data_items',
+                    'BootloadProgress': 'cdp.data_items.data_items',
+                    'BoundaryStatus': 'cdp.data_items.data_items',
+                    'BoundingBoxReport': 'cdp.data_items.data_items',
+                    'BoundingCylinderReport': 'cdp.data_items.data_items',
+                    'CDP': 'cdp.data_items.data_items',
+                    'CDPDataItem': 'cdp.data_items.data_items',
+                    'CDPStreamInformation': 'cdp.data_items.data_items',
+                    'CiholasSerialNumber': 'cdp.data_items.data_items',
+                    'CiholasSerialNumberArray': 'cdp.data_items.data_items',
+                    'ClearDeviceColor': 'cdp.data_items.data_items',
+                    'ClearObject': 'cdp.data_items.data_items',
+                    'ColumnProjection': 'cdp.data_items.data_items',
+                    'CommandWindowUsageReport': 'cdp.data_items.data_items',
+                    'CompiledDefinition': 'cdp.data_items.data_items',
+                    'DECODE_BAD_MARK': 'cdp.data_items.data_items',
+                    'DECODE_BAD_SIZE': 'cdp.data_items.data_items',
+                    'DECODE_BAD_STRING': 'cdp.data_items.data_items',
+                    'DECODE_OK': 'cdp.data_items.data_items',
+                    'DECODE_TRAILING_BYTES': 'cdp.data_items.data_items',
+                    'DECODE_TRUNCATED_ITEM': 'cdp.data_items.data_items',
+                    'DECODE_UNKNOWN_TYPE': 'cdp.data_items.data_items',
+                    'DIBoolAttr': 'cdp.data_items.data_items',
+                    'DICondensedSignalStrengthAttr': 'cdp.data_items.data_items',
+                    'DIDoubleAttr': 'cdp.data_items.data_items',
+                    'DIFixedLengthBytesAttr': 'cdp.data_items.data_items',
+                    'DIFixedLengthStrAttr': 'cdp.data_items.data_items',
+                    'DIFloatAttr': 'cdp.data_items.data_items',
+                    'DIInt16Attr': 'cdp.data_items.data_items',
+                    'DIInt32Attr': 'cdp.data_items.data_items',
+                    'DIInt64Attr': 'cdp.data_items.data_items',
+                    'DIInt8Attr': 'cdp.data_items.data_items',
+                    'DIListAttr': 'cdp.data_items.data_items',
+                    'DIRxStatsAttribute': 'cdp.data_items.data_items',
+                    'DISerialNumberAttr': 'cdp.data_items.data_items',
+                    'DISerialNumberListAttr': 'cdp.data_items.data_items',
+                    'DISignalStrengthAttr': 'cdp.data_items.data_items',
+                    'DIUInt16Attr': 'cdp.data_items.data_items',
+                    'DIUInt16ListAttr': 'cdp.data_items.data_items',
+                    'DIUInt32Attr': 'cdp.data_items.data_items',
+                    'DIUInt32ListAttr': 'cdp.data_items.data_items',
+                    'DIUInt64Attr': 'cdp.data_items.data_items',
+                    'DIUInt8Attr': 'cdp.data_items.data_items',
+                    'DIVariableLengthBytesAttr': 'cdp.data_items.data_items',
+                    'DIVariableLengthStrAttr': 'cdp.data_items.data_items',
+                    'DataItemAttribute': 'cdp.data_items.data_items',
+                    'DecodeErrors': 'cdp.data_items.data_items',
+                    'DeliverUserDataV1': 'cdp.data_items.data_items',
+                    'DeviceActivityState': 'cdp.data_items.data_items',
+                    'DeviceColor': 'cdp.data_items.data_items',
+                    'DeviceData': 'cdp.data_items.data_items',
+                    'DeviceDataItem': 'cdp.data_items.data_items',
+                    'DeviceHardwareStatusV2': 'cdp.data_items.data_items',
+                    'DeviceNames': 'cdp.data_items.data_items',
+                    'DeviceStatus': 'cdp.data_items.data_items',
+                    'DeviceStatusV3': 'cdp.data_items.data_items',
+                    'DirectCommand': 'cdp.data_items.data_items',
+                    'DistanceV1': 'cdp.data_items.data_items',
+                    'DistanceV2': 'cdp.data_items.data_items',
+                    'DrawPrism': 'cdp.data_items.data_items',
+                    'ErrorPattern': 'cdp.data_items.data_items',
+                    'FullDeviceID': 'cdp.data_items.data_items',
+                    'GeofencerZoneInfo': 'cdp.data_items.data_items',
+                    'GetPersistentPropertyList': 'cdp.data_items.data_items',
+                    'GetPersistentPropertyListResponse': 'cdp.data_items.data_items',
+                    'GetPersistentPropertyValue': 'cdp.data_items.data_items',
+                    'GetPersistentPropertyValueResponse': 'cdp.data_items.data_items',
+                    'GlobalPingTimingReportV1': 'cdp.data_items.data_items',
+                    'GyroscopeCalibration': 'cdp.data_items.data_items',
+                    'GyroscopeV1': 'cdp.data_items.data_items',
+                    'GyroscopeV2': 'cdp.data_items.data_items',
+                    'GyroscopeV3': 'cdp.data_items.data_items',
+                    'HostnameAnnounce': 'cdp.data_items.data_items',
+                    'Image': 'cdp.data_items.data_items',
+                    'ImageDiscoveryV1': 'cdp.data_items.data_items',
+                    'ImageDiscoveryV2': 'cdp.data_items.data_items',
+                    'ImageNotificationV2': 'cdp.data_items.data_items',
+                    'ImageV2': 'cdp.data_items.data_items',
+                    'InfrastructureV1': 'cdp.data_items.data_items',
+                    'InfrastructureV2': 'cdp.data_items.data_items',
+                    'InfrastructureV3': 'cdp.data_items.data_items',
+                    'InfrastructureV4': 'cdp.data_items.data_items',
+                    'InstanceAnnounce': 'cdp.data_items.data_items',
+                    'InterfaceRxStatsV1': 'cdp.data_items.data_items',
+                    'LEDStates': 'cdp.data_items.data_items',
+                    'LPSPressureV1': 'cdp.data_items.data_items',
+                    'LPSTemperatureV1': 'cdp.data_items.data_items',
+                    'LinkMDStatus': 'cdp.data_items.data_items',
+                    'LogMessageV1': 'cdp.data_items.data_items',
+                    'MPUAccelerometerV1': 'cdp.data_items.data_items',
+                    'MPUAccelerometerV2': 'cdp.data_items.data_items',
+                    'MPUGyroscopeV1': 'cdp.data_items.data_items',
+                    'MPUGyroscopeV2': 'cdp.data_items.data_items',
+                    'MPUMagnetometerV1': 'cdp.data_items.data_items',
+                    'MPUQuaternionV2': 'cdp.data_items.data_items',
+                    'MagnetometerCalibrationResponse': 'cdp.data_items.data_items',
+                    'MagnetometerV1': 'cdp.data_items.data_items',
+                    'MagnetometerV2': 'cdp.data_items.data_items',
+                    'MagnetometerV3': 'cdp.data_items.data_items',
+                    'NetworkTime': 'cdp.data_items.data_items',
+                    'NodeStatusChangeV1': 'cdp.data_items.data_items',
+                    'NodeStatusChangeV2': 'cdp.data_items.data_items',
+                    'NtRealTimeMappingV1': 'cdp.data_items.data_items',
+                    'PacketContext': 'cdp.data_items.data_items',
+                    'PingV5': 'cdp.data_items.data_items',
+                    'PoeSystemStats': 'cdp.data_items.data_items',
+                    'PoeSystemStatsV2': 'cdp.data_items.data_items',
+                    'PolarCoordinatesV1': 'cdp.data_items.data_items',
+                    'PortInfo': 'cdp.data_items.data_items',
+                    'PositionAnchorStatusStructure': 'cdp.data_items.data_items',
+                    'PositionAnchorStatusStructureV4': 'cdp.data_items.data_items',
+                    'PositionV1': 'cdp.data_items.data_items',
+                    'PositionV2': 'cdp.data_items.data_items',
+                    'PositionV3': 'cdp.data_items.data_items',
+                    'PositionlessBoundaryStatus': 'cdp.data_items.data_items',
+                    'PressureV1': 'cdp.data_items.data_items',
+                    'PressureV2': 'cdp.data_items.data_items',
+                    'PtpInfo': 'cdp.data_items.data_items',
+                    'QuaternionV1': 'cdp.data_items.data_items',
+                    'QuaternionV2': 'cdp.data_items.data_items',
+                    'QuaternionV3': 'cdp.data_items.data_items',
+                    'RoleReport': 'cdp.data_items.data_items',
+                    'RstpReport': 'cdp.data_items.data_items',
+                    'SetDiagnosticLED': 'cdp.data_items.data_items',
+                    'SetMagnetometerCalibration': 'cdp.data_items.data_items',
+                    'SetPersistentProperty': 'cdp.data_items.data_items',
+                    'Synchronization': 'cdp.data_items.data_items',
+                    'TWRV1': 'cdp.data_items.data_items',
+                    'TagZoneInfo': 'cdp.data_items.data_items',
+                    'TemperatureV1': 'cdp.data_items.data_items',
+                    'TemperatureV2': 'cdp.data_items.data_items',
+                    'TickV4': 'cdp.data_items.data_items',
+                    'TickV5': 'cdp.data_items.data_items',
+                    'TimedRxV5': 'cdp.data_items.data_items',
+                    'TimedRxV6': 'cdp.data_items.data_items',
+                    'TopologyInfo': 'cdp.data_items.data_items',
+                    'UNKNOWN_DROP': 'cdp.data_items.data_items',
+                    'UNKNOWN_KEEP': 'cdp.data_items.data_items',
+                    'UNKNOWN_RAISE': 'cdp.data_items.data_items',
+                    'UWBCondensedSignalStrength': 'cdp.data_items.data_items',
+                    'UWBNetworkCommand': 'cdp.data_items.data_items',
+                    'UWBSignalStrength': 'cdp.data_items.data_items',
+                    'UnknownDataItem': 'cdp.data_items.data_items',
+                    'UnknownDataItemError': 'cdp.data_items.data_items',
+                    'UnknownDeviceDataItem': 'cdp.data_items.data_items',
+                    'UnknownTypes': 'cdp.data_items.data_items',
+                    'UserDefinedV1': 'cdp.data_items.data_items',
+                    'UserDefinedV2': 'cdp.data_items.data_items',
+                    'UserDefinedV3': 'cdp.data_items.data_items',
+                    'XyCoordinate': 'cdp.data_items.data_items',
+                    'array': 'cdp.data_items.data_items',
+                    'attrgetter': 'cdp.data_items.data_items',
+                    'decode_error_kinds': 'cdp.data_items.data_items',
+                    'defaultdict': 'cdp.data_items.data_items',
+                    'deque': 'cdp.data_items.data_items',
+                    'log10': 'cdp.data_items.data_items',
+                    'namedtuple': 'cdp.data_items.data_items',
+                    'nullstrip': 'cdp.data_items.data_items',
+                    'pack_cdp_header_into': 'cdp.data_items.data_items',
+                    'pack_data_header_into': 'cdp.data_items.data_items',
+                    'pack_uint_array_into': 'cdp.data_items.data_items',
+                    'struct': 'cdp.data_items.data_items',
+                    'swap_bytes': 'cdp.data_items.data_items',
+                    'sys': 'cdp.data_items.data_items',
+                    'uint32_typecode': 'cdp.data_items.data_items',
+                    'unpack_cdp_header': 'cdp.data_items.data_items',
+                    'unpack_cdp_header_from': 'cdp.data_items.data_items',
+                    'unpack_data_header': 'cdp.data_items.data_items',
+                    'unpack_data_header_from': 'cdp.data_items.data_items',
+                    'unpack_uint_array': 'cdp.data_items.data_items'}}
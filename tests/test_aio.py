@@ -0,0 +1,64 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import asyncio
+import socket
+import struct
+import unittest
+
+from cdp.aio import DROP_NEWEST, DROP_OLDEST, CDPReceiver, open_receiver
+from cdp.data_items import PositionV3
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+async def collect(receiver):
+    return [packet.sequence async for packet in receiver]
+
+
+class TestAio(unittest.TestCase):
+
+    def test_drop_oldest(self):
+        receiver = CDPReceiver(max_queue=2, drop_policy=DROP_OLDEST)
+        for sequence in range(4):
+            receiver.datagram_received(position_packet(sequence), None)
+        receiver.datagram_received(b'invalid', None)
+        receiver.close()
+        self.assertEqual(asyncio.run(collect(receiver)), [3])
+        self.assertEqual(receiver.stats, dict(received=5, dropped=3, invalid=1, queued=0))
+
+    def test_drop_newest(self):
+        receiver = CDPReceiver(max_queue=2, drop_policy=DROP_NEWEST)
+        for sequence in range(4):
+            receiver.datagram_received(position_packet(sequence), None)
+        receiver.close()
+        self.assertEqual(asyncio.run(collect(receiver)), [0, 1])
+        self.assertEqual(receiver.dropped, 2)
+
+    def test_unknown_drop_policy(self):
+        with self.assertRaises(ValueError):
+            CDPReceiver(drop_policy='drop_all')
+
+    def test_socket(self):
+        async def receive():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(('127.0.0.1', 0))
+            sock.setblocking(False)
+            async with await open_receiver(0, sock=sock) as receiver:
+                sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                try:
+                    sender.sendto(position_packet(7), sock.getsockname())
+                finally:
+                    sender.close()
+                packet = await asyncio.wait_for(receiver.__anext__(), 1)
+            return packet.sequence, packet.data_items[0].x
+
+        self.assertEqual(asyncio.run(receive()), (7, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
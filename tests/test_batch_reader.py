@@ -0,0 +1,71 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import socket
+import struct
+import threading
+import time
+import unittest
+
+from cdp.batch_reader import BatchReader
+from cdp.data_items import PositionV3
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+class TestBatchReader(unittest.TestCase):
+
+    def setUp(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        self.reader = BatchReader(sock, slots=4, slot_size=128, receive_buffer_size=0)
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.address = sock.getsockname()
+
+    def tearDown(self):
+        self.reader.close()
+        self.sender.close()
+
+    def send(self, *datagrams):
+        for datagram in datagrams:
+            self.sender.sendto(datagram, self.address)
+
+    def test_read_packets(self):
+        self.send(position_packet(1), b'invalid', position_packet(2), b'x' * 200)
+        time.sleep(0.05)
+        packets = self.reader.read_packets(timeout=1)
+        self.assertEqual([packet.sequence for packet in packets], [1, 2])
+        self.assertEqual(self.reader.stats['received'], 4)
+        self.assertEqual(self.reader.stats['invalid'], 2)
+        self.assertEqual(self.reader.stats['truncated'], 1)
+        self.assertEqual(self.reader.read_batch(timeout=0), [])
+
+    def test_ring(self):
+        # Views are slots of the ring, reused once it wraps around
+        self.send(*(position_packet(sequence) for sequence in range(6)))
+        time.sleep(0.05)
+        first = self.reader.read_batch(timeout=1)
+        second = self.reader.read_batch(timeout=1)
+        self.assertEqual(len(first), 4)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(bytes(first[0]), position_packet(4))
+
+    def test_packets_after_invalid_batch(self):
+        # A batch of only invalid datagrams does not end the iteration
+        self.send(b'invalid')
+        sender = threading.Timer(0.2, self.send, (position_packet(7),))
+        sender.start()
+        try:
+            packets = list(self.reader.packets(timeout=1))
+        finally:
+            sender.join()
+        self.assertEqual([packet.sequence for packet in packets], [7])
+        self.assertEqual(self.reader.invalid, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import os
+import struct
+import tempfile
+import unittest
+
+from cdp.capture import CaptureReader, CaptureWriter
+from cdp.data_items import PositionV3
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+def other_packet(sequence=1, serial=0x01000001, di_type=0x7F00):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    return data + struct.pack('<HH', di_type, 2) + b'ab'
+
+
+class TestCapture(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'capture.cdp')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_chunks(self):
+        # Three chunks, of one serial number and time range each, the last holding another type too
+        with CaptureWriter(self.path) as writer:
+            for sequence in range(3):
+                writer.write(position_packet(sequence, 0x01000001), 10.0 + sequence, ('10.0.0.1', 7667))
+            writer.flush()
+            for sequence in range(3):
+                writer.write(position_packet(sequence, 0x01000002), 20.0 + sequence, ('::1', 7667))
+            writer.flush()
+            writer.write(other_packet(0, 0x01000003), 30.0)
+            writer.write(b'invalid', 31.0)
+            writer.write(position_packet(1, 0x01000003), 32.0)
+
+    def test_round_trip(self):
+        self.write_chunks()
+        with CaptureReader(self.path) as reader:
+            records = [(record.timestamp, record.address, bytes(record.data)) for record in reader.records()]
+            self.assertEqual(len(reader), 9)
+            self.assertEqual(len(reader.chunks), 3)
+            self.assertEqual(reader.time_range(), (10.0, 32.0))
+            self.assertEqual(reader.serials(), {0x01000001, 0x01000002, 0x01000003})
+            self.assertEqual(reader.types(), {PositionV3.type, 0x7F00})
+            self.assertEqual(len(list(reader.packets())), 8)
+        self.assertEqual(records[0], (10.0, ('10.0.0.1', 7667), position_packet(0, 0x01000001)))
+        self.assertEqual(records[3], (20.0, ('::1', 7667), position_packet(0, 0x01000002)))
+        self.assertEqual(records[7], (31.0, None, b'invalid'))
+
+    def test_chunk_filtering(self):
+        self.write_chunks()
+        with CaptureReader(self.path) as reader:
+            self.assertEqual([chunk.t_min for chunk in reader.select_chunks(start=15, end=25)], [20.0])
+            self.assertEqual([chunk.t_min for chunk in reader.select_chunks(serials=[0x01000003])], [30.0])
+            self.assertEqual([chunk.t_min for chunk in reader.select_chunks(types=[0x7F00])], [30.0])
+            self.assertEqual([chunk.t_min for chunk in reader.select_chunks(types=[PositionV3.type])], [10.0, 20.0, 30.0])
+            self.assertEqual([record.timestamp for record in reader.records(start=11, end=21)], [11.0, 12.0, 20.0, 21.0])
+            self.assertEqual([record.timestamp for record in reader.records(serials=[0x01000003])], [30.0, 32.0])
+            self.assertEqual([record.timestamp for record in reader.records(types=[0x7F00])], [30.0])
+            packets = [packet for _timestamp, _address, packet in reader.packets(types=[PositionV3.type], start=30)]
+            self.assertEqual([(packet.sequence, len(packet.data_items)) for packet in packets], [(1, 1)])
+            del packets
+
+    def test_append(self):
+        # A chunk cut short by an interrupted write is dropped before appending
+        self.write_chunks()
+        with open(self.path, 'ab') as capture:
+            capture.write(b'CHNK\x05')
+        with CaptureWriter(self.path) as writer:
+            writer.write(position_packet(9, 0x01000004), 40.0)
+        with CaptureReader(self.path) as reader:
+            self.assertEqual(len(reader.chunks), 4)
+            self.assertEqual(reader.time_range(), (10.0, 40.0))
+
+    def test_bad_file(self):
+        with open(self.path, 'wb') as capture:
+            capture.write(b'not a capture file')
+        with self.assertRaises(ValueError):
+            CaptureReader(self.path)
+        with self.assertRaises(ValueError):
+            CaptureWriter(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
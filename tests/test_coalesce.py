@@ -0,0 +1,82 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import socket
+import struct
+import unittest
+
+from cdp.cdp import CDP
+from cdp.coalesce import Coalescer
+from cdp.data_items import PositionV3
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+class TestCoalesce(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.coalescer = Coalescer(callback=self.sent.append, sequence_start=10)
+
+    def test_flush(self):
+        for tag in range(3):
+            self.coalescer.add(position_packet(serial=0x01000001, tag=tag), now=0)
+        self.coalescer.add(position_packet(serial=0x01000002), now=0)
+        self.assertEqual(self.sent, [])
+        self.coalescer.flush()
+        packets = [CDP(packet) for packet in self.sent]
+        self.assertEqual([(packet.serial_number.as_int, packet.sequence) for packet in packets],
+                         [(0x01000001, 10), (0x01000002, 10)])
+        self.assertEqual([item.serial_number.as_int for item in packets[0].data_items], [0, 1, 2])
+        self.assertEqual(self.coalescer.stats['packing_ratio'], 2.0)
+
+    def test_mtu(self):
+        # Each position takes 34 bytes after the 20 byte header, so two fit in 100 bytes
+        coalescer = Coalescer(callback=self.sent.append, mtu=100)
+        for tag in range(5):
+            coalescer.add(position_packet(tag=tag), now=0)
+        coalescer.flush()
+        self.assertEqual([len(CDP(packet).data_items) for packet in self.sent], [2, 2, 1])
+        self.assertEqual([CDP(packet).sequence for packet in self.sent], [0, 1, 2])
+
+    def test_deadline(self):
+        self.coalescer.add(position_packet(serial=0x01000001), now=0)
+        self.coalescer.add(position_packet(serial=0x01000002), now=0.005)
+        self.assertEqual(self.coalescer.poll(now=0.009), 0.01)
+        self.assertEqual(self.coalescer.poll(now=0.012), 0.015)
+        self.assertEqual(len(self.sent), 1)
+        self.assertIsNone(self.coalescer.poll(now=0.02))
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(self.coalescer.deadline_flushes, 2)
+
+    def test_invalid(self):
+        self.coalescer.add(b'invalid')
+        self.coalescer.flush()
+        self.assertEqual(self.sent, [])
+        self.assertEqual(self.coalescer.invalid, 1)
+
+    def test_mtu_too_small(self):
+        with self.assertRaises(ValueError):
+            Coalescer(callback=print, mtu=20)
+
+    def test_given_socket_left_open(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            with Coalescer(target=('127.0.0.1', 7667), sock=sock):
+                pass
+            self.assertNotEqual(sock.fileno(), -1)
+        finally:
+            sock.close()
+
+    def test_own_socket_closed(self):
+        with Coalescer(target=('127.0.0.1', 7667)) as coalescer:
+            pass
+        self.assertEqual(coalescer.sock.fileno(), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
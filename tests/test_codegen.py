@@ -0,0 +1,54 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+"""Checks the generated decode and encode methods of every registered data item class against the base
+   ones. Run with python -m unittest discover tests, or pytest."""
+
+import os
+import tempfile
+import unittest
+
+from cdp import codegen
+from cdp.cdp import CDP
+from cdp.data_items import PositionV3
+from cdp.data_items.data_items import DeviceData
+
+
+class TestCodegen(unittest.TestCase):
+
+    def test_data_item_classes(self):
+        for item_class in list(CDP.data_item_classes.values()):
+            with self.subTest(item_class=item_class.__name__):
+                self.assertEqual(codegen.check_equivalence([item_class]), [])
+
+    def test_device_data_item_classes(self):
+        for item_class in list(DeviceData.dd_classes.values()):
+            with self.subTest(item_class=item_class.__name__):
+                self.assertEqual(codegen.check_equivalence([item_class]), [])
+
+    def test_cached_source(self):
+        # Generated methods imported from the cache decode like the ones compiled in memory
+        with tempfile.TemporaryDirectory() as directory:
+            classes = list(CDP.data_item_classes.values())
+            try:
+                self.assertGreater(codegen.use_generated_codecs(directory), 0)
+                self.assertEqual(codegen.check_equivalence(classes), [])
+            finally:
+                for item_class in list(codegen.installed):
+                    codegen.uninstall(item_class)
+            self.assertEqual(codegen.installed, {})
+
+    def test_shared_cache_directory(self):
+        # Sources are not imported from a directory other users can write to
+        with tempfile.TemporaryDirectory() as directory:
+            os.chmod(directory, 0o777)
+            codegen.loaded.clear()
+            try:
+                self.assertTrue(codegen.install(PositionV3, directory))
+            finally:
+                codegen.uninstall(PositionV3)
+            self.assertEqual(os.listdir(directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import contextlib
+import io
+import struct
+import unittest
+
+from cdp.cdp import CDP, DECODE_OK
+from cdp.data_items.data_items import DeviceData
+
+
+def truncated_device_data_packet():
+    # Device data header claiming 20 bytes of data, 4 present
+    data = struct.pack('<QIIIBBBI', 1, 2, 3, 4, 5, 6, 7, 0x010000AA)
+    data += struct.pack('<BH', 9, (0x01 << 6) | 20) + b'abcd'
+    header = struct.pack('<II8sI', 0x3230434C, 1, b'CDP0002\x00', 0x01000001)
+    return header + struct.pack('<HH', DeviceData.type, len(data)) + data
+
+
+class TestDecodeErrors(unittest.TestCase):
+
+    def setUp(self):
+        self.verbose = CDP.decode_errors.verbose
+        CDP.decode_errors.verbose = True
+        CDP.decode_errors.reset()
+
+    def tearDown(self):
+        CDP.decode_errors.verbose = self.verbose
+        CDP.decode_errors.reset()
+
+    def read_device_data(self, item):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            item.device_data
+        return output.getvalue()
+
+    def test_try_decode_is_quiet(self):
+        status, packet = CDP.try_decode(truncated_device_data_packet())
+        self.assertEqual(status, DECODE_OK)
+        self.assertEqual(self.read_device_data(packet.data_items[0]), '')
+        self.assertEqual(CDP.decode_errors.counts['truncated_device_data'], 1)
+        self.assertTrue(CDP.decode_errors.verbose)
+
+    def test_decode_prints_while_verbose(self):
+        packet = CDP(truncated_device_data_packet())
+        self.assertIn('Expected data size: 20', self.read_device_data(packet.data_items[0]))
+        self.assertEqual(CDP.decode_errors.counts['truncated_device_data'], 1)
+
+    def test_decode_quiet_when_not_verbose(self):
+        CDP.decode_errors.verbose = False
+        packet = CDP(truncated_device_data_packet())
+        self.assertEqual(self.read_device_data(packet.data_items[0]), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import os
+import socket
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from cdp.data_items import PositionV3
+from cdp.pcap import PcapReader
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+def udp_frame(payload, port=7667, group='239.255.76.67', flags=0):
+    udp = struct.pack('>HHHH', 50000, port, 8 + len(payload), 0) + payload
+    ip = struct.pack('>BBHHHBBH4s4s', 0x45, 0, 20 + len(udp), 0, flags, 1, 17, 0,
+                     socket.inet_aton('10.0.0.1'), socket.inet_aton(group))
+    return b'\x01\x00\x5e\x7f\x4c\x43' + b'\x02\x00\x00\x00\x00\x01' + struct.pack('>H', 0x0800) + ip + udp
+
+
+def pcap_file(frames):
+    data = struct.pack('<IHHiIII', 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1)
+    for index, frame in enumerate(frames):
+        data += struct.pack('<IIII', 100 + index, 500000, len(frame), len(frame)) + frame
+    return data
+
+
+class TestPcap(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'capture.pcap')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data):
+        with open(self.path, 'wb') as capture:
+            capture.write(data)
+
+    def test_bad_file(self):
+        # A file that is not a capture raises and does not leave the file open
+        for data in (b'not a capture file', b''):
+            with self.subTest(size=len(data)):
+                self.write(data)
+                files = []
+
+                def recording_open(*args, **kwargs):
+                    files.append(open(*args, **kwargs))
+                    return files[-1]
+
+                with mock.patch('cdp.pcap.open', recording_open, create=True):
+                    with self.assertRaises(ValueError):
+                        PcapReader(self.path)
+                self.assertEqual(len(files), 1)
+                self.assertTrue(files[0].closed)
+
+    def test_packets(self):
+        self.write(pcap_file([udp_frame(position_packet(sequence)) for sequence in (1, 2)]))
+        reader = PcapReader(self.path)
+        try:
+            packets = [(timestamp, packet.sequence, packet.data_items[0].x) for timestamp, packet in reader.packets()]
+        finally:
+            reader.close()
+        self.assertEqual(packets, [(100.5, 1, 10), (101.5, 2, 10)])
+        self.assertEqual(reader.stats['datagrams'], 2)
+
+    def test_filters(self):
+        frames = [udp_frame(position_packet(), port=7668), udp_frame(position_packet(), group='239.255.76.68'),
+                  udp_frame(position_packet(), flags=0x2000), udp_frame(position_packet())]
+        self.write(pcap_file(frames))
+        reader = PcapReader(self.path, ports=[7667], groups=['239.255.76.67'])
+        try:
+            datagrams = list(reader.datagrams())
+            self.assertEqual(len(datagrams), 1)
+            self.assertEqual(datagrams[0].source, ('10.0.0.1', 50000))
+            self.assertEqual(datagrams[0].destination, ('239.255.76.67', 7667))
+            self.assertEqual(bytes(datagrams[0].data), position_packet())
+            del datagrams
+        finally:
+            reader.close()
+        self.assertEqual(reader.stats, dict(frames=4, datagrams=1, other=0, filtered=2, fragments=1, truncated=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import struct
+import unittest
+
+from cdp.data_items import PositionV3
+from cdp.pool import DecodePool, decode_values, header_serial, to_packet
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+class TestPool(unittest.TestCase):
+
+    def test_decode_values(self):
+        result = decode_values(position_packet(5, 0x01000002))
+        self.assertEqual(result, (5, 0x01000002, [(PositionV3.type, (0x010000AA, 1000, 10, -20, 30, 40, 5, 6, 7))]))
+        self.assertIsNone(decode_values(b'invalid'))
+        self.assertEqual(header_serial(position_packet(serial=0x01000003)), 0x01000003)
+        self.assertEqual(header_serial(b'short'), 0)
+
+    def test_to_packet(self):
+        packet = to_packet(decode_values(position_packet(5, 0x01000002)))
+        self.assertEqual(packet.encode(), position_packet(5, 0x01000002))
+
+    def test_order(self):
+        # Results come back in the given order across workers and chunks, invalid packets as None
+        datagrams = [position_packet(sequence, 0x01000000 + sequence % 5) for sequence in range(200)]
+        datagrams[17] = b'invalid'
+        with DecodePool(workers=3) as pool:
+            self.assertEqual(pool.worker_of(datagrams[4]), 0x01000004 % 3)
+            results = list(pool.imap(datagrams, chunk_size=16, max_pending=2))
+            self.assertEqual(pool.queue_depths(), [0, 0, 0])
+        self.assertIsNone(results[17])
+        del results[17]
+        self.assertEqual([result[0] for result in results], [sequence for sequence in range(200) if sequence != 17])
+        self.assertEqual([result[1] for result in results[:5]], [0x01000000, 0x01000001, 0x01000002, 0x01000003, 0x01000004])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import socket
+import struct
+import time
+import unittest
+
+from cdp.batch_reader import BatchReader
+from cdp.data_items import PositionV3
+from cdp.proxy import Proxy, Route, filter_packet
+
+
+def header(sequence=1, serial=0x01000001):
+    return struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+
+
+def item(di_type, payload):
+    return struct.pack('<HH', di_type, len(payload)) + payload
+
+
+class TestProxy(unittest.TestCase):
+
+    def test_filter_packet(self):
+        data = header() + item(1, b'a') + item(2, b'bb') + item(3, b'ccc')
+        self.assertIs(filter_packet(data), data)
+        self.assertEqual(filter_packet(data, include_types=[1, 3]), header() + item(1, b'a') + item(3, b'ccc'))
+        self.assertEqual(filter_packet(data, exclude_types=[1]), header() + item(2, b'bb') + item(3, b'ccc'))
+        self.assertEqual(filter_packet(data, include_types=[1, 2], exclude_types=[2]), header() + item(1, b'a'))
+        self.assertIsNone(filter_packet(data, include_types=[4]))
+        self.assertIsNone(filter_packet(data, serial_numbers=[0x01000002]))
+        with self.assertRaises(ValueError):
+            filter_packet(b'invalid')
+
+    def test_route(self):
+        data = header(serial=0x01000001) + item(1, b'a')
+        route = Route(('127.0.0.1', 7667), include_types=[2], forward_empty=True)
+        self.assertEqual(route.filter(data, 0x01000001, [(1, 24, 1)]), header(serial=0x01000001))
+        route = Route(('127.0.0.1', 7667), serial_numbers=[0x01000002])
+        self.assertIsNone(route.filter(data, 0x01000001, [(1, 24, 1)]))
+        self.assertEqual(route.stats['filtered'], 1)
+
+    def test_forward(self):
+        sockets = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(4)]
+        source, sender, first, second = sockets
+        try:
+            for sock in (source, first, second):
+                sock.bind(('127.0.0.1', 0))
+            for sock in (first, second):
+                sock.settimeout(1)
+            routes = [Route(first.getsockname(), include_types=[PositionV3.type]),
+                      Route(second.getsockname(), exclude_types=[PositionV3.type])]
+            data = header() + item(PositionV3.type, bytes(30)) + item(2, b'bb')
+            with Proxy(BatchReader(source, receive_buffer_size=0), routes) as proxy:
+                sender.sendto(data, source.getsockname())
+                sender.sendto(b'invalid', source.getsockname())
+                time.sleep(0.05)
+                proxy.run(timeout=0.2)
+            self.assertEqual(first.recv(2048), header() + item(PositionV3.type, bytes(30)))
+            self.assertEqual(second.recv(2048), header() + item(2, b'bb'))
+            self.assertEqual(proxy.stats['received'], 2)
+            self.assertEqual(proxy.stats['invalid'], 1)
+            self.assertEqual(proxy.sock.fileno(), -1)
+        finally:
+            for sock in sockets:
+                sock.close()
+
+    def test_given_socket_left_open(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            receiver.bind(('127.0.0.1', 0))
+            with Proxy(BatchReader(receiver, receive_buffer_size=0), [], sock=sock):
+                pass
+            self.assertEqual(receiver.fileno(), -1)
+            self.assertNotEqual(sock.fileno(), -1)
+        finally:
+            sock.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
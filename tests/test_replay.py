@@ -0,0 +1,77 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import socket
+import struct
+import unittest
+
+from cdp.cdp import CDP
+from cdp.data_items import PositionV3
+from cdp.replay import Replayer
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+class TestReplay(unittest.TestCase):
+
+    def test_callback(self):
+        sent = []
+        replayer = Replayer(callback=sent.append, speed=None)
+        stats = replayer.run([position_packet(1), CDP(position_packet(2)), (0.5, position_packet(3))])
+        self.assertEqual(sent, [position_packet(1), position_packet(2), position_packet(3)])
+        self.assertEqual(stats['sent'], 3)
+        self.assertEqual(stats['bytes'], 3 * len(position_packet()))
+
+    def test_limit(self):
+        sent = []
+        Replayer(callback=sent.append).run([position_packet(sequence) for sequence in range(5)], limit=2)
+        self.assertEqual(len(sent), 2)
+
+    def test_timing(self):
+        sent = []
+        stats = Replayer(callback=sent.append, speed=2.0).run([(10.0, position_packet(1)), (10.2, position_packet(2))])
+        self.assertEqual(len(sent), 2)
+        self.assertGreaterEqual(stats['elapsed'], 0.1)
+        self.assertAlmostEqual(stats['target_rate'], 10.0)
+
+    def test_rewrite(self):
+        sent = []
+        replayer = Replayer(callback=sent.append, serial_number={0x01000001: 0x01000005}, sequence_start=100)
+        replayer.run([position_packet(7, 0x01000001), position_packet(9, 0x01000002), position_packet(8, 0x01000001)])
+        headers = [struct.unpack_from('<I', packet, 4) + struct.unpack_from('<I', packet, 16) for packet in sent]
+        self.assertEqual(headers, [(100, 0x01000005), (100, 0x01000002), (101, 0x01000005)])
+
+    def test_target_requires_one(self):
+        with self.assertRaises(ValueError):
+            Replayer()
+        with self.assertRaises(ValueError):
+            Replayer(target=('127.0.0.1', 7667), callback=print)
+
+    def test_send(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(1)
+        try:
+            with Replayer(target=receiver.getsockname(), speed=None) as replayer:
+                replayer.run([position_packet(1)])
+            self.assertEqual(receiver.recv(2048), position_packet(1))
+            self.assertEqual(replayer.sock.fileno(), -1)
+        finally:
+            receiver.close()
+
+    def test_given_socket_left_open(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            with Replayer(target=('127.0.0.1', 7667), sock=sock):
+                pass
+            self.assertNotEqual(sock.fileno(), -1)
+        finally:
+            sock.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import asyncio
+import struct
+import unittest
+
+from cdp.data_items import PositionV3
+from cdp.router import Router
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA, quality=40):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, quality, 5, 6, 7)
+
+
+def other_packet(sequence=1, serial=0x01000001, di_type=0x7F00):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    return data + struct.pack('<HH', di_type, 2) + b'ab'
+
+
+class TestRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = Router()
+
+    def test_type(self):
+        received = []
+        self.router.subscribe(PositionV3, received.append)
+        self.assertEqual(self.router.dispatch(position_packet()), 1)
+        self.assertEqual(self.router.dispatch(other_packet()), 0)
+        self.assertIsNone(self.router.dispatch(b'invalid'))
+        self.assertEqual([item.x for item in received], [10])
+        self.assertEqual(self.router.stats['packets'], 2)
+        self.assertEqual(self.router.stats['invalid'], 1)
+
+    def test_serial_source(self):
+        # Item serial numbers match the tag of a position, header ones the device that sent it
+        by_item, by_header = [], []
+        self.router.subscribe(PositionV3, by_item.append, serial_numbers=[0x010000AA])
+        self.router.subscribe(PositionV3, by_header.append, serial_numbers=[0x010000AA], serial_source='header')
+        self.router.dispatch(position_packet(1, serial=0x01000001, tag=0x010000AA))
+        self.router.dispatch(position_packet(2, serial=0x010000AA, tag=0x010000BB))
+        self.assertEqual([item.serial_number.as_int for item in by_item], [0x010000AA])
+        self.assertEqual([item.serial_number.as_int for item in by_header], [0x010000BB])
+        self.assertEqual([subscription['rejected'] for subscription in self.router.stats['subscriptions']], [1, 1])
+
+    def test_unknown_serial_source(self):
+        with self.assertRaises(ValueError):
+            self.router.subscribe(PositionV3, print, serial_source='packet')
+
+    def test_predicate(self):
+        received = []
+        self.router.subscribe(PositionV3, received.append, predicate=lambda item: item.quality > 10)
+        self.router.dispatch(position_packet(quality=5))
+        self.router.dispatch(position_packet(quality=50))
+        self.assertEqual([item.quality for item in received], [50])
+
+    def test_queue(self):
+        queue = asyncio.Queue(maxsize=1)
+        subscription = self.router.subscribe(PositionV3, queue)
+        self.router.dispatch(position_packet(1))
+        self.router.dispatch(position_packet(2))
+        self.assertEqual(queue.qsize(), 1)
+        self.assertEqual(subscription.stats['delivered'], 1)
+        self.assertEqual(subscription.stats['dropped'], 1)
+
+    def test_cancel(self):
+        received = []
+        subscription = self.router.subscribe(PositionV3, received.append)
+        subscription.cancel()
+        self.assertEqual(self.router.dispatch(position_packet()), 0)
+        self.assertEqual(received, [])
+        self.assertEqual(self.router.types, frozenset())
+
+
+if __name__ == '__main__':
+    unittest.main()
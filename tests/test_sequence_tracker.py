@@ -0,0 +1,82 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import random
+import unittest
+
+from cdp.sequence_tracker import SequenceTracker
+
+
+def track(sequences, **kwargs):
+    tracker = SequenceTracker(**kwargs)
+    for sequence in sequences:
+        tracker.update(1, sequence & 0xFFFFFFFF)
+    return tracker.snapshot()[1]
+
+
+class TestSequenceTracker(unittest.TestCase):
+
+    def test_in_order(self):
+        counters = track(range(100))
+        self.assertEqual((counters['received'], counters['lost'], counters['restarts']), (100, 0, 0))
+
+    def test_duplicate_of_highest(self):
+        counters = track([10, 11, 11, 12])
+        self.assertEqual(counters['duplicates'], 1)
+        self.assertEqual(counters['restarts'], 0)
+        self.assertEqual(counters['lost'], 0)
+
+    def test_reordered_within_window(self):
+        counters = track([1, 2, 5, 4, 3, 3, 8])
+        self.assertEqual((counters['lost'], counters['reordered'], counters['duplicates']), (2, 2, 1))
+        self.assertEqual(counters['loss_ratio'], 0.25)
+
+    def test_gap_within_max_gap(self):
+        counters = track([0, 500, 499], max_gap=1000, reorder_window=64)
+        self.assertEqual((counters['lost'], counters['reordered'], counters['restarts']), (498, 1, 0))
+
+    def test_wraparound(self):
+        counters = track([2 ** 32 - 2, 2 ** 32 - 1, 1, 0])
+        self.assertEqual((counters['lost'], counters['reordered'], counters['restarts']), (0, 1, 0))
+        self.assertEqual(counters['highest_sequence'], 1)
+
+    def test_before_first_packet(self):
+        counters = track([10, 9])
+        self.assertEqual((counters['lost'], counters['late'], counters['loss_ratio']), (0, 1, 0.0))
+
+    def test_single_late_packet(self):
+        counters = track(list(range(101)) + [100 - 200, 101])
+        self.assertEqual((counters['lost'], counters['late'], counters['restarts']), (0, 1, 0))
+
+    def test_restart(self):
+        counters = track(list(range(500, 600)) + [0, 1, 3])
+        self.assertEqual((counters['restarts'], counters['lost']), (1, 1))
+        self.assertEqual(counters['highest_sequence'], 3)
+
+    def test_restart_continuing_from_late_packet(self):
+        counters = track(list(range(500, 600)) + [300, 302, 301])
+        self.assertEqual((counters['restarts'], counters['late'], counters['lost'], counters['reordered']),
+                         (1, 0, 0, 1))
+
+    def test_loss_duplicates_and_swaps(self):
+        rnd = random.Random(1)
+        for _ in range(200):
+            sequences = [sequence for sequence in range(1, 300) if rnd.random() > 0.1]
+            lost = 299 - len(sequences)
+            for index in range(len(sequences) - 1):
+                if rnd.random() < 0.1:
+                    sequences[index], sequences[index + 1] = sequences[index + 1], sequences[index]
+            received = []
+            for sequence in sequences:
+                received.append(sequence)
+                if rnd.random() < 0.05:
+                    received.append(sequence)
+            counters = track([0] + received + [300])
+            self.assertEqual(counters['restarts'], 0)
+            self.assertEqual(counters['late'], 0)
+            self.assertEqual(counters['lost'], lost)
+            self.assertEqual(counters['duplicates'], len(received) - len(sequences))
+
+
+if __name__ == '__main__':
+    unittest.main()
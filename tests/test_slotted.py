@@ -0,0 +1,71 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import copy
+import pickle
+import struct
+import unittest
+
+from cdp.cdp import CDP, CDPDataItem
+from cdp.data_items import PositionV3
+from cdp.data_items.data_items import DeviceData
+from cdp.slotted import make_slotted_class, use_slotted_data_items
+
+
+def position_packet(sequence=1, serial=0x01000001, tag=0x010000AA):
+    data = struct.pack('<II8sI', 0x3230434C, sequence, b'CDP0002\x00', serial)
+    data += struct.pack('<HH', PositionV3.type, 30)
+    return data + struct.pack('<IqiiiHBBH', tag, 1000, 10, -20, 30, 40, 5, 6, 7)
+
+
+class TestSlotted(unittest.TestCase):
+
+    def setUp(self):
+        self.data_item_classes = dict(CDP.data_item_classes)
+        self.dd_classes = dict(DeviceData.dd_classes)
+
+    def tearDown(self):
+        CDP.data_item_classes.update(self.data_item_classes)
+        DeviceData.dd_classes.update(self.dd_classes)
+
+    def test_decode(self):
+        slotted_class = make_slotted_class(PositionV3)
+        item = slotted_class(position_packet(), CDP.cdp_header_size + CDP.di_header_size, 30)
+        self.assertFalse(hasattr(item, '__dict__'))
+        self.assertEqual((item.x, item.y, item.z, item.quality), (10, -20, 30, 40))
+        self.assertEqual(item.serial_number.as_int, 0x010000AA)
+        self.assertEqual(item.get_xyz(), [10, -20, 30])
+        self.assertIsInstance(item, PositionV3)
+        self.assertIsInstance(item, CDPDataItem)
+        self.assertEqual(item.di_name, 'PositionV3')
+
+    def test_defaults(self):
+        item = make_slotted_class(PositionV3)(x=5)
+        self.assertFalse(hasattr(item, '__dict__'))
+        self.assertEqual((item.x, item.y, item.network_time), (5, 0, 0))
+        self.assertEqual(item.cdp_header_sequence, 0)
+        item.cdp_header_sequence = 3
+        self.assertEqual(item.cdp_header_sequence, 3)
+
+    def test_pickle(self):
+        slotted_class = make_slotted_class(PositionV3)
+        item = slotted_class(position_packet(), CDP.cdp_header_size + CDP.di_header_size, 30)
+        item.x
+        for restored in (pickle.loads(pickle.dumps(item)), copy.copy(item)):
+            self.assertIs(type(restored), slotted_class)
+            self.assertFalse(hasattr(restored, '__dict__'))
+            self.assertEqual((restored.x, restored.z), (10, 30))
+
+    def test_use_slotted_data_items(self):
+        use_slotted_data_items()
+        data = position_packet(sequence=9)
+        packet = CDP(data)
+        item = packet.data_items[0]
+        self.assertIs(type(item), make_slotted_class(PositionV3))
+        self.assertFalse(hasattr(item, '__dict__'))
+        self.assertEqual((item.cdp_header_sequence, item.x), (9, 10))
+        self.assertEqual(packet.encode(), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# Ciholas, Inc. - www.ciholas.com
+# Licensed under: creativecommons.org/licenses/by/4.0
+
+import struct
+import unittest
+
+from cdp.cdp import CDP, UNKNOWN_DROP, UNKNOWN_KEEP
+from cdp.data_items.data_items import DeviceData
+
+
+def device_data_packet(dd_type=0x3FE, payload=b'abcd'):
+    data = struct.pack('<QIIIBBBI', 1, 2, 3, 4, 5, 6, 7, 0x010000AA)
+    data += struct.pack('<BH', 9, (dd_type << 6) | len(payload)) + payload
+    header = struct.pack('<II8sI', 0x3230434C, 1, b'CDP0002\x00', 0x01000001)
+    return header + struct.pack('<HH', DeviceData.type, len(data)) + data
+
+
+class TestUnknownDeviceDataTypes(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = DeviceData.unknown_types.policy
+
+    def tearDown(self):
+        DeviceData.unknown_types.policy = self.policy
+
+    def test_keep_round_trip(self):
+        DeviceData.unknown_types.policy = UNKNOWN_KEEP
+        data = device_data_packet()
+        packet = CDP(data)
+        self.assertEqual(packet.data_items[0].device_data.ddi_name, 'Unknown0x3FE')
+        self.assertEqual(packet.encode(), data)
+
+    def test_drop_round_trip(self):
+        DeviceData.unknown_types.policy = UNKNOWN_DROP
+        data = device_data_packet()
+        packet = CDP(data)
+        item = packet.data_items[0]
+        self.assertIsNone(item.device_data)
+        self.assertEqual(item.nt64, 1)
+        self.assertEqual(packet.encode(), data)
+
+
+if __name__ == '__main__':
+    unittest.main()